@@ -15,8 +15,50 @@
 
 """
 package init file
+
+submodules are imported on first attribute access so that importing the
+package does not pull in pyvisa, numpy or scipy.
 """
 
-from . import instrument
-from . import multimeter
-from . import power_supply
+import importlib
+
+from .registry import (register_model, get_model_class, supported_models)
+
+_submodules = {
+    'aggregation',
+    'analysis',
+    'buffers',
+    'daq',
+    'derived',
+    'discovery',
+    'errors',
+    'frequency_response',
+    'function_generator',
+    'instrument',
+    'metrics',
+    'multi_function',
+    'multimeter',
+    'orchestrator',
+    'oscilloscope',
+    'plan',
+    'playback',
+    'power_supply',
+    'records',
+    'recording',
+    'regulation',
+    'registry',
+    'settling',
+    'snapshot',
+    'station',
+    'store',
+}
+
+
+def __getattr__(name):
+    if name in _submodules:
+        return importlib.import_module(f'.{name}', __name__)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def __dir__():
+    return sorted(set(globals()) | _submodules)
@@ -0,0 +1,297 @@
+#!/usr/bin/env python
+# python 3
+##    @file:    aggregation.py
+#     @name:    Luke Gary
+#  @company:    RyeEffectsResearch
+#     @date:    2026/10/19
+################################################################################
+# @copyright
+#   Copyright 2020 RyeEffectsResearch as an  unpublished work.
+#   All Rights Reserved.
+#
+# @license The information contained herein is confidential
+#   property of RyeEffectsResearch. The user, copying, transfer or
+#   disclosure of such information is prohibited except
+#   by express written agreement with RyeEffectsResearch.
+################################################################################
+
+"""
+online decimation for long running measurements
+
+a Rollup keeps min/max/mean/count buckets at several resolutions. samples
+only touch the finest level, each closed bucket is merged into the next
+coarser one, so the work per sample is O(1) and memory is bounded by the
+history kept per level. raw samples are only kept around flagged events.
+"""
+
+import math
+import time
+from collections import deque
+
+
+class Bucket:
+    """
+    This class describes the aggregate of one time bucket.
+    """
+    __slots__ = ('start', 'minimum', 'maximum', 'total', 'count')
+
+    def __init__(self, start: float):
+        self.start = start
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self.total = 0.0
+        self.count = 0
+
+    @property
+    def mean(self) -> float:
+        """ bucket mean """
+        return self.total / self.count if self.count else None
+
+    def add(self, value: float):
+        """ add a sample """
+        if value < self.minimum:
+            self.minimum = value
+        if value > self.maximum:
+            self.maximum = value
+        self.total += value
+        self.count += 1
+
+    def merge(self, other):
+        """ fold a finer bucket into this one """
+        if other.minimum < self.minimum:
+            self.minimum = other.minimum
+        if other.maximum > self.maximum:
+            self.maximum = other.maximum
+        self.total += other.total
+        self.count += other.count
+
+    def as_tuple(self) -> tuple:
+        """ (start, min, max, mean, count) """
+        return (self.start, self.minimum, self.maximum, self.mean, self.count)
+
+    def __repr__(self):
+        return (
+            f'Bucket(start={self.start}, min={self.minimum}, max={self.maximum}, '
+            f'mean={self.mean}, count={self.count})'
+        )
+
+
+class Event:
+    """
+    This class describes raw samples captured around a flagged event.
+    """
+    __slots__ = ('time', 'reason', 'samples', 'remaining')
+
+    def __init__(self, timestamp: float, reason, samples: list, post: int):
+        self.time = timestamp
+        self.reason = reason
+        self.samples = samples
+        self.remaining = post
+
+    @property
+    def complete(self) -> bool:
+        """ all post-trigger samples are in """
+        return self.remaining <= 0
+
+    def __repr__(self):
+        return f'Event(time={self.time}, reason={self.reason!r}, samples={len(self.samples)})'
+
+
+class _Level:
+    __slots__ = ('resolution', 'current', 'history')
+
+    def __init__(self, resolution: float, history: int):
+        self.resolution = resolution
+        self.current = None
+        self.history = deque(maxlen=history)
+
+
+class Rollup:
+    """
+    This class describes a multi-resolution min/max/mean aggregator.
+    """
+    def __init__(self, resolutions=(1.0, 60.0, 3600.0), history=(3600, 1440, 720), **kwargs):
+        """
+        constructor
+
+        :param      resolutions:  bucket length in seconds per level, finest
+                                  first, each a multiple of the previous
+        :type       resolutions:  tuple
+        :param      history:      closed buckets kept per level
+        :type       history:      tuple
+        :param      pre:          raw samples kept before an event, default 100
+        :param      post:         raw samples kept after an event, default 100
+        :param      max_events:   events kept, oldest dropped, default 100
+        :param      max_open:     events filling at once, the oldest stops
+                                  filling and stays incomplete, default 8
+        :param      trigger:      callable(value) returning a truthy reason to
+                                  flag an event, e.g. lambda v: v > 1.5 and 'overcurrent'.
+                                  fires on the edge, it re-arms once the
+                                  reason clears
+        :param      holdoff:      samples after a triggered event before the
+                                  trigger can fire again, default `post`, so
+                                  at most one triggered event is filling
+        """
+        if len(resolutions) != len(history):
+            raise AttributeError('resolutions and history differ in length')
+        self._levels = [
+            _Level(resolution, length) for resolution, length in zip(resolutions, history)
+        ]
+        self._pre = deque(maxlen=kwargs.get('pre', 100))
+        self._post = kwargs.get('post', 100)
+        # every event waits for the same `post` samples, they complete in
+        # the order they were flagged
+        self._open_events = deque(maxlen=kwargs.get('max_open', 8))
+        self.events = deque(maxlen=kwargs.get('max_events', 100))
+        self.trigger = kwargs.get('trigger', None)
+        self._holdoff = kwargs.get('holdoff', self._post)
+        self._armed = True
+        self._hold = 0
+        self.count = 0
+
+    @property
+    def resolutions(self) -> tuple:
+        """ bucket length per level """
+        return tuple(level.resolution for level in self._levels)
+
+    def add(self, value: float, timestamp: float = None):
+        """
+        Add a sample.
+
+        :param      value:      The value, None is ignored
+        :type       value:      float
+        :param      timestamp:  unix seconds, now if None
+        :type       timestamp:  float
+        """
+        if value is None:
+            return
+        if timestamp is None:
+            timestamp = time.time()
+        self.count += 1
+
+        level = self._levels[0]
+        start = timestamp - timestamp % level.resolution
+        if level.current is None or level.current.start != start:
+            self._close(0, start)
+        level.current.add(value)
+
+        sample = (timestamp, value)
+        open_events = self._open_events
+        if open_events:
+            for event in open_events:
+                event.samples.append(sample)
+                event.remaining -= 1
+            while open_events and open_events[0].complete:
+                open_events.popleft()
+        self._pre.append(sample)
+
+        if self.trigger is not None:
+            reason = self.trigger(value)
+            if self._hold:
+                self._hold -= 1
+            if not reason:
+                self._armed = True
+            elif self._armed and not self._hold:
+                self._armed = False
+                self._hold = self._holdoff
+                self.flag(reason, timestamp)
+
+    def _close(self, index: int, start: float):
+        # close the current bucket of a level, merge it upward, open a new one
+        level = self._levels[index]
+        closed = level.current
+        level.current = Bucket(start)
+        if closed is None:
+            return
+        level.history.append(closed)
+        if index + 1 < len(self._levels):
+            upper = self._levels[index + 1]
+            upper_start = closed.start - closed.start % upper.resolution
+            if upper.current is None or upper.current.start != upper_start:
+                self._close(index + 1, upper_start)
+            upper.current.merge(closed)
+
+    def flag(self, reason=None, timestamp: float = None) -> Event:
+        """
+        keep the raw samples around now, the last `pre` and the next `post`
+
+        :param      reason:     anything describing the event
+        :param      timestamp:  unix seconds, now if None
+        :type       timestamp:  float
+
+        :returns:   the event, filled as samples arrive
+        :rtype:     Event
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        event = Event(timestamp, reason, list(self._pre), self._post)
+        self.events.append(event)
+        if not event.complete:
+            self._open_events.append(event)
+        return event
+
+    def attach(self, source):
+        """
+        wrap a measurement so every reading it returns is aggregated, e.g.
+        measure = rollup.attach(lambda: dp832.measure_source_current(2))
+
+        :param      source:  callable returning a float
+        :type       source:  callable
+
+        :returns:   wrapped callable returning the same readings
+        :rtype:     callable
+        """
+        def _measure(*args, **kwargs):
+            value = source(*args, **kwargs)
+            self.add(value)
+            return value
+        return _measure
+
+    def buckets(self, resolution: float = None, include_current: bool = False) -> list:
+        """
+        closed buckets of a level, oldest first
+
+        :param      resolution:       bucket length, the finest if None
+        :type       resolution:       float
+        :param      include_current:  include the bucket still filling, on
+                                  coarser levels it only holds closed finer
+                                  buckets
+        :type       include_current:  bool
+
+        :returns:   buckets
+        :rtype:     list
+        """
+        level = self._level(resolution)
+        buckets = list(level.history)
+        if include_current and level.current is not None and level.current.count:
+            buckets.append(level.current)
+        return buckets
+
+    def to_array(self, resolution: float = None, include_current: bool = False):
+        """
+        buckets of a level as a numpy structured array
+
+        :param      resolution:       bucket length, the finest if None
+        :type       resolution:       float
+        :param      include_current:  include the bucket still filling
+        :type       include_current:  bool
+
+        :returns:   array with start, min, max, mean, count fields
+        :rtype:     numpy.ndarray
+        """
+        import numpy as np  # pylint: disable=import-outside-toplevel
+        dtype = np.dtype([
+            ('start', 'f8'), ('min', 'f8'), ('max', 'f8'), ('mean', 'f8'), ('count', 'u4')
+        ])
+        return np.array(
+            [bucket.as_tuple() for bucket in self.buckets(resolution, include_current)],
+            dtype=dtype
+        )
+
+    def _level(self, resolution: float) -> _Level:
+        if resolution is None:
+            return self._levels[0]
+        for level in self._levels:
+            if level.resolution == resolution:
+                return level
+        raise AttributeError(f'no level with resolution {resolution}, have {self.resolutions}')
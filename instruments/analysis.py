@@ -0,0 +1,211 @@
+#!/usr/bin/env python
+# python 3
+#pylint: disable=import-error
+##    @file:    analysis.py
+#     @name:    Luke Gary
+#  @company:    RyeEffectsResearch
+#     @date:    2026/10/19
+################################################################################
+# @copyright
+#   Copyright 2020 RyeEffectsResearch as an  unpublished work.
+#   All Rights Reserved.
+#
+# @license The information contained herein is confidential
+#   property of RyeEffectsResearch. The user, copying, transfer or
+#   disclosure of such information is prohibited except
+#   by express written agreement with RyeEffectsResearch.
+################################################################################
+
+"""
+vectorized spectral analysis of captured waveforms
+
+everything works on 2-D batches, one capture per row (captures x samples),
+e.g. segmented DS1074Z captures stacked with numpy.vstack. windows are cached
+per (name, length); scipy.fft keeps its own plan cache for repeated lengths.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+from scipy import fft as sp_fft
+from scipy import signal as sp_signal
+
+ANALYSIS_DTYPE = np.dtype([
+    ('frequency', np.float64),
+    ('amplitude', np.float64),
+    ('dc', np.float64),
+    ('rms', np.float64),
+    ('ripple_pp', np.float64),
+    ('ripple_rms', np.float64),
+    ('thd', np.float64),
+    ('thd_db', np.float64),
+    ('snr_db', np.float64),
+    ('sinad_db', np.float64),
+])
+
+# half width of the main lobe in bins, tone power is summed over it
+MAINLOBE_BINS = {
+    'boxcar': 1,
+    'hann': 2,
+    'hamming': 2,
+    'blackman': 3,
+    'blackmanharris': 4,
+    'flattop': 5,
+}
+
+# batches larger than this (samples) are split across processes
+PROCESS_THRESHOLD = 1 << 24
+
+
+@lru_cache(maxsize=64)
+def get_window(name: str, length: int):
+    """
+    cached, read-only analysis window
+
+    :param      name:    scipy.signal window name
+    :type       name:    str
+    :param      length:  samples
+    :type       length:  int
+
+    :returns:   window
+    :rtype:     numpy.ndarray
+    """
+    window = sp_signal.get_window(name, length, fftbins=True).astype(np.float64)
+    window.setflags(write=False)
+    return window
+
+
+@lru_cache(maxsize=64)
+def _window_power(name: str, length: int) -> float:
+    window = get_window(name, length)
+    return float(np.dot(window, window))
+
+
+def _as_batch(batch):
+    batch = np.asarray(batch, dtype=np.float64)
+    if batch.ndim == 1:
+        batch = batch[np.newaxis, :]
+    if batch.ndim != 2:
+        raise AttributeError(f'batch must be (captures, samples), not {batch.shape}')
+    return batch
+
+
+def power_spectrum(batch, sample_rate: float, window: str = 'hann', workers: int = None):
+    """
+    one-sided windowed power spectrum of every capture, DC removed
+
+    :param      batch:        (captures, samples)
+    :type       batch:        numpy.ndarray
+    :param      sample_rate:  hertz
+    :type       sample_rate:  float
+    :param      window:       scipy.signal window name
+    :type       window:       str
+    :param      workers:      threads for the fft, scipy default if None
+    :type       workers:      int
+
+    :returns:   (frequencies, power) with power shaped (captures, samples//2+1)
+    :rtype:     tuple
+    """
+    batch = _as_batch(batch)
+    length = batch.shape[1]
+    ac = batch - batch.mean(axis=1, keepdims=True)
+    spectrum = sp_fft.rfft(ac * get_window(window, length), axis=1, workers=workers)
+    power = spectrum.real ** 2 + spectrum.imag ** 2
+    return sp_fft.rfftfreq(length, 1.0 / sample_rate), power
+
+
+def _band_power(power, centers, span):
+    # sum of power over [center - span, center + span] per row
+    bins = power.shape[1]
+    offsets = np.arange(-span, span + 1)
+    index = np.clip(centers[:, np.newaxis] + offsets, 0, bins - 1)
+    return np.take_along_axis(power, index, axis=1).sum(axis=1)
+
+
+def _analyze(batch, sample_rate, fundamental, harmonics, window, workers):
+    length = batch.shape[1]
+    rows = batch.shape[0]
+    span = MAINLOBE_BINS.get(window, 3)
+    _, power = power_spectrum(batch, sample_rate, window, workers)
+    bins = power.shape[1]
+
+    if fundamental is None:
+        # strongest bin above the DC main lobe
+        centers = np.argmax(power[:, span + 1:], axis=1) + span + 1
+    else:
+        centers = np.full(rows, int(round(fundamental * length / sample_rate)))
+    centers = np.clip(centers, 0, bins - 1)
+
+    offsets = np.arange(-span, span + 1)
+    index = np.clip(centers[:, np.newaxis] + offsets, 0, bins - 1)
+    lobe = np.take_along_axis(power, index, axis=1)
+    fundamental_power = lobe.sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        centroid = (lobe * index).sum(axis=1) / fundamental_power
+
+    harmonic_power = np.zeros(rows)
+    for order in range(2, harmonics + 2):
+        # harmonics above nyquist alias back into the band
+        folded = (centers * order) % length
+        folded = np.where(folded >= bins, length - folded, folded)
+        harmonic_power += _band_power(power, folded, span)
+
+    total = power[:, span + 1:].sum(axis=1)
+    noise_power = np.maximum(total - fundamental_power - harmonic_power, 0.0)
+    scale = 4.0 / (length * _window_power(window, length))
+
+    result = np.empty(rows, dtype=ANALYSIS_DTYPE)
+    result['frequency'] = centroid * sample_rate / length
+    result['amplitude'] = np.sqrt(fundamental_power * scale)
+    result['dc'] = batch.mean(axis=1)
+    result['rms'] = np.sqrt(np.mean(batch * batch, axis=1))
+    result['ripple_pp'] = np.ptp(batch, axis=1)
+    result['ripple_rms'] = batch.std(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        result['thd'] = np.sqrt(harmonic_power / fundamental_power)
+        result['thd_db'] = 10.0 * np.log10(harmonic_power / fundamental_power)
+        result['snr_db'] = 10.0 * np.log10(fundamental_power / noise_power)
+        result['sinad_db'] = 10.0 * np.log10(
+            fundamental_power / (noise_power + harmonic_power)
+        )
+    return result
+
+
+def analyze(batch, sample_rate: float, **kwargs):
+    """
+    Fundamental, THD, SNR, SINAD and ripple of every capture in a batch.
+
+    :param      batch:        (captures, samples), or one capture
+    :type       batch:        numpy.ndarray
+    :param      sample_rate:  hertz
+    :type       sample_rate:  float
+    :param      fundamental:  hertz, strongest tone per capture if None
+    :param      harmonics:    harmonics included in THD, default 5
+    :param      window:       scipy.signal window name, default blackmanharris
+    :param      workers:      fft threads per process
+    :param      processes:    split batches larger than PROCESS_THRESHOLD
+                              samples across this many processes, default 0
+    :param      chunk_rows:   captures per process task, default an even split
+
+    :returns:   one ANALYSIS_DTYPE record per capture
+    :rtype:     numpy.ndarray
+    """
+    batch = _as_batch(batch)
+    fundamental = kwargs.get('fundamental', None)
+    harmonics = kwargs.get('harmonics', 5)
+    window = kwargs.get('window', 'blackmanharris')
+    workers = kwargs.get('workers', None)
+    processes = kwargs.get('processes', 0)
+
+    if not processes or batch.size < PROCESS_THRESHOLD or batch.shape[0] < 2:
+        return _analyze(batch, sample_rate, fundamental, harmonics, window, workers)
+
+    chunk_rows = kwargs.get('chunk_rows', None) or -(-batch.shape[0] // processes)
+    chunks = [batch[row:row + chunk_rows] for row in range(0, batch.shape[0], chunk_rows)]
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        parts = pool.map(
+            _analyze, chunks,
+            *zip(*[(sample_rate, fundamental, harmonics, window, workers)] * len(chunks))
+        )
+        return np.concatenate(list(parts))
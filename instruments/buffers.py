@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+# python 3
+#pylint: disable=import-error
+##    @file:    buffers.py
+#     @name:    Luke Gary
+#  @company:    RyeEffectsResearch
+#     @date:    2026/10/19
+################################################################################
+# @copyright
+#   Copyright 2020 RyeEffectsResearch as an  unpublished work.
+#   All Rights Reserved.
+#
+# @license The information contained herein is confidential
+#   property of RyeEffectsResearch. The user, copying, transfer or
+#   disclosure of such information is prohibited except
+#   by express written agreement with RyeEffectsResearch.
+################################################################################
+
+"""
+reusable buffers for bulk reads
+
+a BufferPool hands out preallocated byte arrays. Instrument.readinto() reads
+binary blocks straight into them, so a monitor fetching the same size of
+block over and over allocates nothing once the pool is warm. stats() tells
+whether it is: misses counts the leases the pool had to allocate for.
+"""
+
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+
+
+class BufferPool:
+    """
+    This class describes a pool of preallocated byte buffers.
+    """
+    def __init__(self, size: int, count: int = 4, max_free: int = None):
+        """
+        constructor
+
+        :param      size:      bytes per buffer, the largest expected block
+        :type       size:      int
+        :param      count:     buffers allocated up front
+        :type       count:     int
+        :param      max_free:  free buffers kept, extra ones are dropped on
+                               release, unbounded if None
+        :type       max_free:  int
+        """
+        self.size = size
+        self.max_free = max_free
+        self._lock = threading.Lock()
+        self._free = [np.empty(size, dtype='u1') for _ in range(count)]
+        self._leased = {}
+        self.leases = 0
+        self.releases = 0
+        self.misses = 0
+        self.peak_in_use = 0
+        self.allocated_bytes = size * count
+
+    @property
+    def in_use(self) -> int:
+        """ buffers leased and not released """
+        return len(self._leased)
+
+    def lease(self, nbytes: int = None):
+        """
+        take a buffer of at least nbytes, allocated only if none is free
+
+        :param      nbytes:  bytes needed, the pool's size if None
+        :type       nbytes:  int
+
+        :returns:   uint8 buffer, possibly longer than nbytes
+        :rtype:     numpy.ndarray
+        """
+        nbytes = self.size if nbytes is None else nbytes
+        with self._lock:
+            buffer = None
+            for index, candidate in enumerate(self._free):
+                if len(candidate) >= nbytes:
+                    buffer = self._free.pop(index)
+                    break
+            if buffer is None:
+                buffer = np.empty(max(nbytes, self.size), dtype='u1')
+                self.misses += 1
+                self.allocated_bytes += len(buffer)
+            self._leased[id(buffer)] = buffer
+            self.leases += 1
+            self.peak_in_use = max(self.peak_in_use, len(self._leased))
+        return buffer
+
+    def release(self, buffer):
+        """
+        return a leased buffer, or any numpy view of it
+
+        :param      buffer:  the buffer
+        :type       buffer:  numpy.ndarray
+        """
+        with self._lock:
+            candidate = buffer
+            while candidate is not None and id(candidate) not in self._leased:
+                candidate = getattr(candidate, 'base', None)
+            if candidate is None:
+                raise AttributeError('buffer was not leased from this pool')
+            del self._leased[id(candidate)]
+            self.releases += 1
+            if self.max_free is None or len(self._free) < self.max_free:
+                self._free.append(candidate)
+
+    @contextmanager
+    def leased(self, nbytes: int = None):
+        """
+        with pool.leased(4096) as buffer: ...
+
+        :param      nbytes:  bytes needed
+        :type       nbytes:  int
+        """
+        buffer = self.lease(nbytes)
+        try:
+            yield buffer
+        finally:
+            self.release(buffer)
+
+    def stats(self) -> dict:
+        """
+        usage counters
+
+        :returns:   buffers, free, in_use, peak_in_use, leases, releases,
+                    misses and allocated_bytes
+        :rtype:     dict
+        """
+        with self._lock:
+            return {
+                'buffers': len(self._free) + len(self._leased),
+                'free': len(self._free),
+                'in_use': len(self._leased),
+                'peak_in_use': self.peak_in_use,
+                'leases': self.leases,
+                'releases': self.releases,
+                'misses': self.misses,
+                'allocated_bytes': self.allocated_bytes,
+            }
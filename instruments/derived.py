@@ -0,0 +1,298 @@
+#!/usr/bin/env python
+# python 3
+##    @file:    derived.py
+#     @name:    Luke Gary
+#  @company:    RyeEffectsResearch
+#     @date:    2026/10/19
+################################################################################
+# @copyright
+#   Copyright 2020 RyeEffectsResearch as an  unpublished work.
+#   All Rights Reserved.
+#
+# @license The information contained herein is confidential
+#   property of RyeEffectsResearch. The user, copying, transfer or
+#   disclosure of such information is prohibited except
+#   by express written agreement with RyeEffectsResearch.
+################################################################################
+
+"""
+derived measurements
+
+a derived quantity (power, resistance, efficiency) is a function of
+primitive readings. every instrument class maps the primitives it can
+measure to a query in PRIMITIVES, e.g. DP832 reads volts, amps and watts from
+one meas:all query. read_primitives() fetches all primitives an instrument
+needs in one compound query, so they are sampled back to back instead of one
+round trip apart. a quantity that spans instruments, like the efficiency of
+a converter between a supply and a meter, is read with read_many(), which
+queries all instruments at once so their readings are one round trip apart
+rather than one per instrument. derive() evaluates a quantity over whole
+batches with numpy.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Quantity:
+    """
+    This class describes a quantity derived from primitive readings.
+    """
+    __slots__ = ('name', 'inputs', 'function')
+
+    def __init__(self, name: str, inputs: tuple, function):
+        """
+        constructor
+
+        :param      name:      quantity name
+        :type       name:      str
+        :param      inputs:    primitive names, in argument order
+        :type       inputs:    tuple
+        :param      function:  callable(*inputs), must work on floats and on
+                               numpy arrays alike
+        :type       function:  callable
+        """
+        self.name = name
+        self.inputs = tuple(inputs)
+        self.function = function
+
+    def __repr__(self):
+        return f'Quantity({self.name}={self.function.__name__}{self.inputs})'
+
+
+def _power(volts, amps):
+    return volts * amps
+
+
+def _resistance(volts, amps):
+    return volts / amps
+
+
+def _conductance(volts, amps):
+    return amps / volts
+
+
+def _efficiency(power_in, power_out):
+    return power_out / power_in
+
+
+QUANTITIES = {
+    'power': Quantity('power', ('volts', 'amps'), _power),
+    'resistance': Quantity('resistance', ('volts', 'amps'), _resistance),
+    'conductance': Quantity('conductance', ('volts', 'amps'), _conductance),
+    'efficiency': Quantity('efficiency', ('power_in', 'power_out'), _efficiency),
+}
+
+
+def register_quantity(name: str, inputs: tuple, function) -> Quantity:
+    """
+    add a derived quantity
+
+    :param      name:      quantity name
+    :type       name:      str
+    :param      inputs:    primitive names
+    :type       inputs:    tuple
+    :param      function:  callable(*inputs) working on floats and arrays
+    :type       function:  callable
+
+    :returns:   the quantity
+    :rtype:     Quantity
+    """
+    quantity = Quantity(name, inputs, function)
+    QUANTITIES[name] = quantity
+    return quantity
+
+
+def _quantity(name: str) -> Quantity:
+    try:
+        return QUANTITIES[name]
+    except KeyError:
+        raise AttributeError(f'unknown quantity {name!r}, have {sorted(QUANTITIES)}') from None
+
+
+def read_primitives(instrument, primitives, channel: int = 1) -> dict:
+    """
+    read primitives in one compound query, each distinct query sent once
+
+    :param      instrument:  instrument with a PRIMITIVES map
+    :type       instrument:  Instrument
+    :param      primitives:  primitive names, e.g. ('volts', 'amps')
+    :type       primitives:  iterable
+    :param      channel:     The channel
+    :type       channel:     int
+
+    :returns:   value per primitive plus 'time', None on error
+    :rtype:     dict
+    """
+    table = instrument.PRIMITIVES
+    queries = []
+    slots = {}
+    for name in primitives:
+        if name in slots:
+            continue
+        try:
+            template, field = table[name]
+        except KeyError:
+            raise AttributeError(
+                f'{type(instrument).__name__} cannot measure {name!r}, has {sorted(table)}'
+            ) from None
+        cmd = template.format(channel=channel)
+        if cmd not in queries:
+            queries.append(cmd)
+        slots[name] = (queries.index(cmd), field)
+
+    start = time.time()
+    responses = instrument.query_pipelined(queries)
+    if responses is None:
+        return None
+    values = {'time': (start + time.time()) / 2}
+    try:
+        for name, (index, field) in slots.items():
+            values[name] = float(responses[index].split(',')[field])
+    except (ValueError, IndexError):
+        instrument.debug(f'Measurement Error: {responses}')
+        return None
+    return values
+
+
+def read_many(requests) -> list:
+    """
+    read primitives from several instruments concurrently, one thread per
+    instrument, requests to the same instrument run in order
+
+    :param      requests:  (instrument, primitives, channel) tuples
+    :type       requests:  iterable
+
+    :returns:   read_primitives() result per request, in request order,
+                None for a request that failed
+    :rtype:     list
+    """
+    requests = list(requests)
+    groups = {}
+    for index, (instrument, _, _) in enumerate(requests):
+        groups.setdefault(id(instrument), []).append(index)
+    results = [None] * len(requests)
+
+    def _read(indexes):
+        for index in indexes:
+            instrument, primitives, channel = requests[index]
+            results[index] = read_primitives(instrument, primitives, channel)
+
+    if len(groups) == 1:
+        _read(next(iter(groups.values())))
+        return results
+    with ThreadPoolExecutor(max_workers=len(groups)) as pool:
+        for future in [pool.submit(_read, indexes) for indexes in groups.values()]:
+            future.result()
+    return results
+
+
+def measure_efficiency(source, load, source_channel: int = 1, load_channel: int = 1) -> dict:
+    """
+    efficiency of a converter between two instruments, e.g. a DP832
+    channel feeding it and a U3606B loading its output, both read at once
+
+    :param      source:          instrument measuring volts and amps of the input
+    :type       source:          Instrument
+    :param      load:            instrument measuring volts and amps of the output
+    :type       load:            Instrument
+    :param      source_channel:  The source channel
+    :type       source_channel:  int
+    :param      load_channel:    The load channel
+    :type       load_channel:    int
+
+    :returns:   time, skew (seconds between the two readings), power_in,
+                power_out and efficiency, None if undefined. None on error
+    :rtype:     dict
+    """
+    readings = read_many((
+        (source, ('volts', 'amps'), source_channel),
+        (load, ('volts', 'amps'), load_channel),
+    ))
+    if None in readings:
+        return None
+    source_reading, load_reading = readings
+    values = {
+        'time': (source_reading['time'] + load_reading['time']) / 2,
+        'skew': abs(source_reading['time'] - load_reading['time']),
+        'power_in': _power(source_reading['volts'], source_reading['amps']),
+        'power_out': _power(load_reading['volts'], load_reading['amps']),
+    }
+    try:
+        values['efficiency'] = _efficiency(values['power_in'], values['power_out'])
+    except ZeroDivisionError:
+        values['efficiency'] = None
+    return values
+
+
+def measure_derived(instrument, quantities, channel: int = 1) -> dict:
+    """
+    measure derived quantities from a single compound query
+
+    :param      instrument:  instrument with a PRIMITIVES map
+    :type       instrument:  Instrument
+    :param      quantities:  quantity names, e.g. ('power', 'resistance')
+    :type       quantities:  iterable
+    :param      channel:     The channel
+    :type       channel:     int
+
+    :returns:   the primitives read and the derived values, a quantity is
+                None if undefined (e.g. resistance at 0 A). None on error
+    :rtype:     dict
+    """
+    if isinstance(quantities, str):
+        quantities = (quantities,)
+    quantities = [_quantity(name) for name in quantities]
+    primitives = [name for quantity in quantities for name in quantity.inputs]
+    values = read_primitives(instrument, primitives, channel)
+    if values is None:
+        return None
+    for quantity in quantities:
+        try:
+            values[quantity.name] = quantity.function(
+                *(values[name] for name in quantity.inputs)
+            )
+        except ZeroDivisionError:
+            values[quantity.name] = None
+    return values
+
+
+def derive(quantity: str, readings):
+    """
+    evaluate a quantity over a batch, e.g. derive('power', buffer.view())
+
+    :param      quantity:  quantity name
+    :type       quantity:  str
+    :param      readings:  structured array, ReadingBuffer or dict of arrays
+                           with a field per input
+    :type       readings:  numpy.ndarray
+
+    :returns:   values, nan/inf where undefined
+    :rtype:     numpy.ndarray
+    """
+    import numpy as np  # pylint: disable=import-outside-toplevel
+    quantity = _quantity(quantity)
+    if hasattr(readings, 'view') and not isinstance(readings, np.ndarray):
+        readings = readings.view()
+    columns = [np.asarray(readings[name], dtype='f8') for name in quantity.inputs]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return quantity.function(*columns)
+
+
+def efficiency(source_readings, load_readings):
+    """
+    power_out / power_in over batches of V/I readings of the input and the
+    output side, e.g. the DP832 feeding a converter and a U3606B on its output
+
+    :param      source_readings:  readings with volts and amps of the input
+    :type       source_readings:  numpy.ndarray
+    :param      load_readings:    readings with volts and amps of the output
+    :type       load_readings:    numpy.ndarray
+
+    :returns:   efficiency per row
+    :rtype:     numpy.ndarray
+    """
+    return derive('efficiency', {
+        'power_in': derive('power', source_readings),
+        'power_out': derive('power', load_readings),
+    })
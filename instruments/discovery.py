@@ -0,0 +1,208 @@
+#!/usr/bin/env python
+# python 3
+#pylint: disable=import-error
+##    @file:    discovery.py
+#     @name:    Luke Gary
+#  @company:    RyeEffectsResearch
+#     @date:    2026/10/19
+################################################################################
+# @copyright
+#   Copyright 2020 RyeEffectsResearch as an  unpublished work.
+#   All Rights Reserved.
+#
+# @license The information contained herein is confidential
+#   property of RyeEffectsResearch. The user, copying, transfer or
+#   disclosure of such information is prohibited except
+#   by express written agreement with RyeEffectsResearch.
+################################################################################
+
+"""
+incremental hot-plug discovery
+
+DeviceWatcher diffs list_resources() on an interval and only identifies
+resources that are new, so replugging one meter doesn't re-open every
+instrument on the bench. the live registry it keeps lets
+Instrument.connect(serial, watcher=...) skip the discovery sweep.
+"""
+
+import threading
+import weakref
+
+from instruments.instrument import Instrument
+from pyvisa import (VisaIOError, VisaIOWarning, InvalidSession)
+
+
+class DeviceWatcher:
+    """
+    This class describes a background watcher of connected VISA resources.
+    """
+    def __init__(self, include_tcpip: bool = False, interval: float = 1.0, **kwargs):
+        """
+        constructor
+
+        :param      include_tcpip:  also watch tcpip resources
+        :type       include_tcpip:  bool
+        :param      interval:       seconds between polls
+        :type       interval:       float
+        :param      manager:        ResourceManager to share
+        :param      backend:        pyvisa backend
+        :param      debug:          debug output
+        """
+        self.include_tcpip = include_tcpip
+        self.interval = interval
+        self._scanner = Instrument(
+            debug=kwargs.get('debug', False),
+            backend=kwargs.get('backend', None),
+            manager=kwargs.get('manager', None)
+        )
+        self._lock = threading.Lock()
+        self._poll_lock = threading.Lock()
+        self._devices = {}
+        # present, but could not be identified, retried after a replug
+        self._unidentified = set()
+        self._instruments = weakref.WeakSet()
+        self.on_added = []
+        self.on_removed = []
+        self._thread = None
+        self._stop = threading.Event()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    @property
+    def manager(self):
+        """ the ResourceManager used for discovery """
+        return self._scanner.manager
+
+    @property
+    def devices(self) -> dict:
+        """
+        identified devices by resource name
+
+        :returns:   copy of the registry
+        :rtype:     dict
+        """
+        with self._lock:
+            return dict(self._devices)
+
+    def _list_resources(self) -> set:
+        resources = set(self.manager.list_resources(query='USB?*'))
+        if self.include_tcpip:
+            resources |= set(self.manager.list_resources(query='TCPIP?*'))
+        return resources
+
+    def poll(self) -> tuple:
+        """
+        diff the connected resources against the registry once
+
+        :returns:   (added, removed) device records
+        :rtype:     tuple
+        """
+        # one scan at a time: the daemon thread and a manual poll() share the
+        # scanner, and both would probe and announce the same new device.
+        # callbacks run after the lock is released, they may poll() again
+        with self._poll_lock:
+            try:
+                present = self._list_resources()
+            except (VisaIOError, VisaIOWarning, InvalidSession) as _e:
+                self._scanner.debug(f'list_resources failed: {_e}')
+                return [], []
+
+            with self._lock:
+                known = set(self._devices) | self._unidentified
+            added = []
+            for resource_name in sorted(present - known):
+                info = self._scanner.open_resource(resource_name)
+                if info is None:
+                    with self._lock:
+                        self._unidentified.add(resource_name)
+                    continue
+                # keep the record, not the session, connect() reopens it
+                info.device.close()
+                info.device = None
+                added.append(info)
+
+            removed = []
+            with self._lock:
+                for info in added:
+                    self._devices[info.resource_name] = info
+                for resource_name in known - present:
+                    self._unidentified.discard(resource_name)
+                    info = self._devices.pop(resource_name, None)
+                    if info is not None:
+                        removed.append(info)
+
+        if removed:
+            gone = {info.resource_name for info in removed}
+            for instrument in list(self._instruments):
+                if instrument.resource_name in gone:
+                    instrument.session_lost()
+        for info in added:
+            for callback in self.on_added:
+                callback(info)
+        for info in removed:
+            for callback in self.on_removed:
+                callback(info)
+        return added, removed
+
+    def watch(self, instrument: Instrument):
+        """
+        notify an open instrument through session_lost() when its resource
+        disappears. only a weak reference is kept.
+
+        :param      instrument:  The instrument
+        :type       instrument:  Instrument
+        """
+        self._instruments.add(instrument)
+
+    def find(self, serial_number: str = None, model: str = None):
+        """
+        look up a device in the registry without probing
+
+        :param      serial_number:  The serial number, case insensitive
+        :type       serial_number:  str
+        :param      model:          The model
+        :type       model:          str
+
+        :returns:   first matching device record, None if not found
+        :rtype:     DeviceInfo
+        """
+        with self._lock:
+            devices = list(self._devices.values())
+        for info in devices:
+            if serial_number is not None and info.serial_number.lower() != serial_number.lower():
+                continue
+            if model is not None and info.model != model:
+                continue
+            return info
+        return None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.poll()
+
+    def start(self):
+        """
+        poll once, then keep polling on a daemon thread
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self.poll()
+        self._thread = threading.Thread(
+            target=self._run, name='DeviceWatcher', daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """
+        stop the polling thread
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
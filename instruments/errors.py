@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+# python 3
+##    @file:    errors.py
+#     @name:    Luke Gary
+#  @company:    RyeEffectsResearch
+#     @date:    2026/10/19
+################################################################################
+# @copyright
+#   Copyright 2020 RyeEffectsResearch as an  unpublished work.
+#   All Rights Reserved.
+#
+# @license The information contained herein is confidential
+#   property of RyeEffectsResearch. The user, copying, transfer or
+#   disclosure of such information is prohibited except
+#   by express written agreement with RyeEffectsResearch.
+################################################################################
+
+"""
+SCPI error queue records
+
+Instrument.check_errors() drains SYST:ERR? and returns ScpiError records.
+instruments differ in how much they report: some append the failing header
+to the message ('-113,"Undefined header;VOLT:FOO"'), most don't. an error is
+tied to a command when the message names its header, or when only one
+command was sent since the last check.
+
+otherwise the error only narrows it down to its candidates, the commands
+sent since the last check. to narrow it further, check more often: a
+smaller batch in Instrument.set_error_policy(), or checkpoint() blocks
+around the commands in question.
+"""
+
+import time
+
+from instruments.metrics import normalize_header
+
+# error checking policies, see Instrument.set_error_policy()
+POLICY_OFF = None
+POLICY_BATCH = 'batch'
+POLICY_CHECKPOINT = 'checkpoint'
+POLICIES = (POLICY_OFF, POLICY_BATCH, POLICY_CHECKPOINT)
+
+
+class ScpiError:
+    """
+    This class describes one entry of an instrument's error queue.
+
+    command is the command that caused it, None if it can't be told apart
+    from the other candidates, the commands sent since the last check.
+    """
+    __slots__ = ('code', 'message', 'command', 'candidates', 'time')
+
+    def __init__(self, code: int, message: str, command: str = None,
+                 candidates: tuple = (), time: float = 0.0):  # pylint: disable=redefined-outer-name
+        self.code = code
+        self.message = message
+        self.command = command
+        self.candidates = candidates
+        self.time = time
+
+    def as_dict(self) -> dict:
+        """ plain dictionary copy """
+        return {key: getattr(self, key) for key in self.__slots__}
+
+    def __repr__(self):
+        return (
+            f'ScpiError({self.code}, {self.message!r}, command={self.command!r}, '
+            f'candidates={len(self.candidates)})'
+        )
+
+    def __str__(self):
+        if self.command is not None:
+            where = f' ({self.command})'
+        elif self.candidates:
+            where = f' (one of {len(self.candidates)}: {self.candidates[0]} .. {self.candidates[-1]})'
+        else:
+            where = ''
+        return f'{self.code},"{self.message}"{where}'
+
+
+def parse_error(response: str) -> tuple:
+    """
+    parse a SYST:ERR? response, e.g. '-113,"Undefined header"'
+
+    :param      response:  The response
+    :type       response:  str
+
+    :returns:   (code, message), code 0 means the queue is empty, None if
+                the response is malformed
+    :rtype:     tuple
+    """
+    if response is None:
+        return None
+    code, _, message = response.strip().partition(',')
+    try:
+        code = int(code)
+    except ValueError:
+        return None
+    return code, message.strip().strip('"')
+
+
+def attribute_errors(responses, pending) -> list:
+    """
+    turn drained SYST:ERR? responses into ScpiError records tied to the
+    commands sent since the last check
+
+    :param      responses:  SYST:ERR? responses, in queue order
+    :type       responses:  list
+    :param      pending:    commands sent since the last check, in order
+    :type       pending:    list
+
+    :returns:   errors, empty if the queue was empty
+    :rtype:     list
+    """
+    now = time.time()
+    candidates = tuple(pending)
+    headers = None
+    errors = []
+    for response in responses:
+        parsed = parse_error(response)
+        if parsed is None or parsed[0] == 0:
+            continue
+        code, message = parsed
+        command = None
+        if len(pending) == 1:
+            command = pending[0]
+        elif ';' in message:
+            # '<description>;<offending header>', match it to the newest
+            # pending command with the same header
+            if headers is None:
+                headers = [normalize_header(cmd) for cmd in pending]
+            header = normalize_header(message.rsplit(';', 1)[1])
+            for index in range(len(pending) - 1, -1, -1):
+                if headers[index] == header:
+                    command = pending[index]
+                    break
+        errors.append(ScpiError(code, message, command, candidates, now))
+    return errors
@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+# python 3
+##    @file:    frequency_response.py
+#     @name:    Luke Gary
+#  @company:    RyeEffectsResearch
+#     @date:    2026/10/19
+################################################################################
+# @copyright
+#   Copyright 2020 RyeEffectsResearch as an  unpublished work.
+#   All Rights Reserved.
+#
+# @license The information contained herein is confidential
+#   property of RyeEffectsResearch. The user, copying, transfer or
+#   disclosure of such information is prohibited except
+#   by express written agreement with RyeEffectsResearch.
+################################################################################
+
+"""
+frequency response (bode) sweeps with a function generator and a scope
+
+the generator drives the DUT input, scope channel 1 (by default) probes the
+input and channel 2 the output. gain and phase come from a least squares fit
+of a sine at the known frequency to both channels at once. the sweep is
+pipelined: once a capture is complete the generator is moved to the next
+frequency while the waveforms are fetched, and the fit runs on a worker
+thread while the next capture is taken.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+def fit_sines(seconds, waveforms, frequency: float):
+    """
+    Least squares fit of a*sin(wt) + b*cos(wt) + c to every row of waveforms.
+
+    :param      seconds:    sample times, shape (n,)
+    :type       seconds:    numpy.ndarray
+    :param      waveforms:  samples, shape (k, n) or (n,)
+    :type       waveforms:  numpy.ndarray
+    :param      frequency:  hertz
+    :type       frequency:  float
+
+    :returns:   (amplitude, phase in radians, offset), each shape (k,)
+    :rtype:     tuple
+    """
+    import numpy as np  # pylint: disable=import-outside-toplevel
+    waveforms = np.atleast_2d(np.asarray(waveforms, dtype=float))
+    omega_t = 2.0 * np.pi * frequency * np.asarray(seconds, dtype=float)
+    design = np.column_stack((np.sin(omega_t), np.cos(omega_t), np.ones_like(omega_t)))
+    coefficients = np.linalg.lstsq(design, waveforms.T, rcond=None)[0]
+    amplitude = np.hypot(coefficients[0], coefficients[1])
+    phase = np.arctan2(coefficients[1], coefficients[0])
+    return amplitude, phase, coefficients[2]
+
+
+def log_frequencies(start: float, stop: float, points: int):
+    """
+    log spaced frequency array
+
+    :param      start:   hertz
+    :type       start:   float
+    :param      stop:    hertz
+    :type       stop:    float
+    :param      points:  The points
+    :type       points:  int
+
+    :returns:   frequencies
+    :rtype:     numpy.ndarray
+    """
+    import numpy as np  # pylint: disable=import-outside-toplevel
+    return np.logspace(np.log10(start), np.log10(stop), points)
+
+
+class BodeResult:
+    """
+    This class describes a measured frequency response.
+    """
+    __slots__ = (
+        'frequency', 'gain', 'phase', 'input_amplitude', 'output_amplitude', 'elapsed'
+    )
+
+    def __init__(self, frequency, gain, phase, input_amplitude, output_amplitude, elapsed):
+        self.frequency = frequency
+        self.gain = gain
+        self.phase = phase
+        self.input_amplitude = input_amplitude
+        self.output_amplitude = output_amplitude
+        self.elapsed = elapsed
+
+    @property
+    def gain_db(self):
+        """ gain in dB """
+        import numpy as np  # pylint: disable=import-outside-toplevel
+        return 20.0 * np.log10(self.gain)
+
+    def __repr__(self):
+        return f'BodeResult(points={len(self.frequency)}, elapsed={self.elapsed:0.2f}s)'
+
+
+def _analyze(frequency, input_wave, output_wave):
+    import numpy as np  # pylint: disable=import-outside-toplevel
+    if input_wave is None or output_wave is None:
+        return np.nan, np.nan, np.nan, np.nan
+    seconds = input_wave[0]
+    amplitude, phase, _ = fit_sines(
+        seconds, np.vstack((input_wave[1], output_wave[1])), frequency
+    )
+    phase_deg = np.degrees(np.angle(np.exp(1j * (phase[1] - phase[0]))))
+    return amplitude[1] / amplitude[0], phase_deg, amplitude[0], amplitude[1]
+
+
+def frequency_response(generator, scope, frequencies, **kwargs) -> BodeResult:
+    """
+    Sweep the generator over frequencies and measure gain and phase.
+
+    :param      generator:       function generator, e.g. AG2062F
+    :param      scope:           oscilloscope, e.g. DS1074Z
+    :param      frequencies:     hertz, see log_frequencies()
+    :param      amplitude:       generator amplitude in Vpp, unchanged if None
+    :param      source_channel:  generator channel, default 1
+    :param      input_channel:   scope channel probing the DUT input, default 1
+    :param      output_channel:  scope channel probing the DUT output, default 2
+    :param      cycles:          signal periods across the screen, default 4
+    :param      settle_cycles:   periods to wait after a frequency change,
+                                 default 2
+    :param      min_settle:      minimum seconds after a frequency change,
+                                 default 0.01
+    :param      timeout:         seconds to wait for each capture, default 5
+
+    :returns:   gain, phase (degrees) and fitted amplitudes per frequency
+    :rtype:     BodeResult
+    """
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    source = kwargs.get('source_channel', 1)
+    input_channel = kwargs.get('input_channel', 1)
+    output_channel = kwargs.get('output_channel', 2)
+    cycles = kwargs.get('cycles', 4)
+    settle_cycles = kwargs.get('settle_cycles', 2)
+    min_settle = kwargs.get('min_settle', 0.01)
+    timeout = kwargs.get('timeout', 5.0)
+    frequencies = np.asarray(frequencies, dtype=float)
+    divisions = getattr(scope, 'DIVISIONS', 12)
+
+    start = time.perf_counter()
+    generator.set_function('SINE', channel=source)
+    if kwargs.get('amplitude', None) is not None:
+        generator.set_amplitude(kwargs['amplitude'], channel=source)
+    generator.enable_output(channel=source)
+    scope.enable_channel(input_channel)
+    scope.enable_channel(output_channel)
+
+    futures = []
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        if len(frequencies):
+            generator.set_frequency(frequencies[0], channel=source)
+        changed = time.monotonic()
+        for index, frequency in enumerate(frequencies.tolist()):
+            scope.set_timebase(cycles / frequency / divisions)
+            settle = max(settle_cycles / frequency, min_settle)
+            remaining = changed + settle - time.monotonic()
+            if remaining > 0:
+                time.sleep(remaining)
+            captured = scope.single() and scope.wait_for_stop(timeout=timeout)
+            # the scope holds the capture, the generator can move on already
+            if index + 1 < len(frequencies):
+                generator.set_frequency(frequencies[index + 1], channel=source)
+                changed = time.monotonic()
+            if captured:
+                input_wave = scope.fetch_waveform(input_channel)
+                output_wave = scope.fetch_waveform(output_channel)
+            else:
+                input_wave = output_wave = None
+            futures.append(pool.submit(_analyze, frequency, input_wave, output_wave))
+        results = np.array([future.result() for future in futures], dtype=float).reshape(-1, 4)
+
+    return BodeResult(
+        frequencies, results[:, 0], results[:, 1], results[:, 2], results[:, 3],
+        time.perf_counter() - start
+    )
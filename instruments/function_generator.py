@@ -1,5 +1,6 @@
 #!/usr/bin/env python
 # python 3
+#pylint: disable=import-error
 ##    @file:    function_generator.py
 #     @name:    Luke Gary
 #  @company:    RyeEffectsResearch
@@ -20,6 +21,7 @@ function and arbitrary waveform generators
 """
 
 from instruments.instrument import Instrument
+from pyvisa import (InvalidSession)
 
 
 class AG2062F(Instrument):
@@ -28,5 +30,137 @@ class AG2062F(Instrument):
     """
 
     def __init__(self, **kwargs):
-        super().__init__()
-        pass
+        serial_number = kwargs.get('serial_number', None)
+        tcpip = kwargs.get('include_tcpip', True)
+        resource = kwargs.pop('resource', None)
+        watcher = kwargs.pop('watcher', None)
+        try:
+            kwargs.pop('serial_number')
+            kwargs.pop('include_tcpip')
+        except KeyError:
+            pass
+        super().__init__(**kwargs)
+        # commands apply to the selected channel and the active waveform
+        self._channel = None
+        self._function = {1: 'SINE', 2: 'SINE'}
+        if resource:
+            self.attach(resource)
+            if watcher is not None:
+                watcher.watch(self)
+        elif serial_number:
+            self.debug(f'Attempting Connect to {serial_number}', enable=True)
+            self.connect(
+                serial_number=serial_number,
+                include_tcpip=tcpip,
+                watcher=watcher
+            )
+        elif watcher is not None and self.attach_watched(watcher, model='AG2062F'):
+            self.debug('No Serial Given, attached first AG2062F of the watcher', enable=True)
+        else:
+            # connect to the first AG2062F
+            self.debug('No Serial Given, connecting to first AG2062F', enable=True)
+            devices = self.list_devices()
+            connected = False
+            for device in devices:
+                if device.get('model') == 'AG2062F':
+                    self.attach(device)
+                    connected = True
+                    break
+            if connected is False:
+                raise InvalidSession(f'Could not connect to {serial_number}')
+
+    @staticmethod
+    def check_channel(channel: int):
+        """
+        make sure channel is ok for ag2062f
+
+        :param      channel:  The channel
+        :type       channel:  int
+        """
+        if 0 < channel < 3:
+            return True
+        raise AttributeError(
+            f'channel must be [1,2] not {channel}'
+        )
+
+    def select_channel(self, channel: int = 1):
+        """
+        select the channel the following commands apply to, only sent when
+        the selection changes
+
+        :param      channel:  The channel
+        :type       channel:  int
+        """
+        self.check_channel(channel)
+        if channel != self._channel:
+            self.write(f':chan ch{channel}')
+            self._channel = channel
+
+    def set_function(self, function: str, channel: int = 1):
+        """
+        Sets the waveform, e.g. SINE, SQUare, RAMP, PULSe
+
+        :param      function:  The function
+        :type       function:  str
+        :param      channel:   The channel
+        :type       channel:   int
+        """
+        self.select_channel(channel)
+        self.write(f':func {function}')
+        self._function[channel] = function.upper()
+
+    def set_frequency(self, frequency: float, channel: int = 1):
+        """
+        Sets the frequency of the active waveform.
+
+        :param      frequency:  hertz
+        :type       frequency:  float
+        :param      channel:    The channel
+        :type       channel:    int
+        """
+        self.select_channel(channel)
+        self.write(f':func:{self._function[channel]}:freq {frequency:.6e}')
+
+    def set_amplitude(self, amplitude: float, channel: int = 1):
+        """
+        Sets the amplitude of the active waveform.
+
+        :param      amplitude:  volts peak to peak
+        :type       amplitude:  float
+        :param      channel:    The channel
+        :type       channel:    int
+        """
+        self.select_channel(channel)
+        self.write(f':func:{self._function[channel]}:ampl {amplitude:.6e}')
+
+    def set_offset(self, offset: float, channel: int = 1):
+        """
+        Sets the dc offset of the active waveform.
+
+        :param      offset:   volts
+        :type       offset:   float
+        :param      channel:  The channel
+        :type       channel:  int
+        """
+        self.select_channel(channel)
+        self.write(f':func:{self._function[channel]}:offs {offset:.6e}')
+
+    def enable_output(self, channel: int = 1):
+        """
+        Enables the output.
+
+        :param      channel:  The channel
+        :type       channel:  int
+        """
+        self.check_channel(channel)
+        self.write(f':chan:ch{channel} on')
+
+    def disable_output(self, channel: int = 1):
+        """
+        Disables the output.
+
+        :param      channel:  The channel
+        :type       channel:  int
+        """
+        self.check_channel(channel)
+        self.write(f':chan:ch{channel} off')
@@ -20,11 +20,15 @@
 Generic VISA Intrument interface
 """
 
+import struct
 import time
+from collections import deque
+from contextlib import contextmanager
 
 from typing import List
-import pprint as pp
 from pyvisa import (VisaIOError, InvalidSession, VisaIOWarning, log_to_screen, ResourceManager)
+from instruments.errors import (POLICIES, POLICY_BATCH, POLICY_OFF, attribute_errors, parse_error)
+from instruments.records import DeviceInfo
 
 
 def instruments_verbose_log():
@@ -35,14 +39,30 @@ class Instrument: #pylint: disable=too-many-instance-attributes
     """
     an instrument convenience class.
     """
-    def __init__(self, debug: bool = False, timeout: int = 1000, backend=None):
+    # SYST:ERR? entries drained per check at most
+    ERROR_QUEUE_DEPTH = 32
+    # primitive name -> (query, field of the comma separated response),
+    # '{channel}' is filled in. see instruments.derived
+    PRIMITIVES = {}
+    # configuration snapshots, see instruments.snapshot. LEARN instruments
+    # answer *LRN?, the others list (name, query, command template) SETTINGS
+    LEARN = False
+    SETTINGS = ()
+    # plan operation -> command template, see instruments.plan
+    PLAN_TEMPLATES = {}
+
+    def __init__(self, debug: bool = False, timeout: int = 1000, backend=None, manager=None):
         """
         constructor
+
+        :param      manager:  share an existing ResourceManager, sessions opened
+                              during a scan belong to the manager that opened them
+        :type       manager:  ResourceManager
         """
-        if backend is not None:
-            self._manager = ResourceManager(backend)
-        else:
-            self._manager = ResourceManager()
+        # the ResourceManager is opened on first use, replayed sessions and
+        # instruments attached to a shared manager never need their own
+        self._manager = manager
+        self._backend = backend
 
         self.device = None
 
@@ -51,12 +71,30 @@ class Instrument: #pylint: disable=too-many-instance-attributes
         self._serial_number = ''
         self._version = ''
         self._interface = ''
+        self._resource_name = ''
 
         self._debug_enable = debug
+        self._metrics = None
+        self._error_policy = POLICY_OFF
+        self._error_batch = 32
+        self._pending = []
+        self._errors = deque(maxlen=1000)
+        # settings as of the last snapshot capture or restore
+        self.known_settings = None
         self._timeout = timeout
         self._start_time_seconds = round(time.time() * 1000)
         self._start_time_seconds /= 1000.0
 
+    @property
+    def manager(self) -> ResourceManager:
+        ''' VISA resource manager, opened on first use '''
+        if self._manager is None:
+            if self._backend is not None:
+                self._manager = ResourceManager(self._backend)
+            else:
+                self._manager = ResourceManager()
+        return self._manager
+
     @property
     def debug_enable(self) -> bool:
         ''' accessor '''
@@ -67,6 +105,116 @@ class Instrument: #pylint: disable=too-many-instance-attributes
         ''' set debug mode '''
         self._debug_enable = value
 
+    @property
+    def metrics(self):
+        ''' attached CommandMetrics, None when disabled '''
+        return self._metrics
+
+    def enable_metrics(self, metrics=None):
+        """
+        record per-command latency, byte counts and errors. share one
+        collector between instruments to get a single station-wide trace.
+
+        :param      metrics:  collector, a new one if None
+        :type       metrics:  instruments.metrics.CommandMetrics
+
+        :returns:   the attached collector
+        :rtype:     instruments.metrics.CommandMetrics
+        """
+        if metrics is None:
+            from instruments.metrics import CommandMetrics  # pylint: disable=import-outside-toplevel
+            metrics = CommandMetrics()
+        self._metrics = metrics
+        return metrics
+
+    def disable_metrics(self):
+        """
+        stop recording metrics, the collector keeps what it has
+        """
+        self._metrics = None
+
+    @property
+    def error_policy(self) -> str:
+        ''' 'batch', 'checkpoint' or None when the error queue isn't read '''
+        return self._error_policy
+
+    @property
+    def errors(self) -> list:
+        ''' ScpiErrors found so far, the last 1000 '''
+        return list(self._errors)
+
+    def set_error_policy(self, policy: str = POLICY_BATCH, batch: int = 32):
+        """
+        read the instrument's error queue (SYST:ERR?) instead of reading
+        every setpoint back. commands are remembered until the next check
+        so errors can be tied to the command that caused them.
+
+        'batch' checks after every `batch` commands, 'checkpoint' only when
+        check_errors() is called or a checkpoint() block exits, None turns
+        checking off. set_output_* skip their read back unless a policy is off.
+        an error that can't be tied to one command lists the commands since
+        the last check as candidates, a smaller batch narrows them down.
+
+        :param      policy:  'batch', 'checkpoint' or None
+        :type       policy:  str
+        :param      batch:   commands per check for the 'batch' policy
+        :type       batch:   int
+        """
+        if policy not in POLICIES:
+            raise AttributeError(f'unknown error policy {policy!r}')
+        if batch < 1:
+            raise AttributeError(f'batch must be at least 1, got {batch}')
+        self._error_policy = policy
+        self._error_batch = batch
+        self._pending = []
+
+    def _track(self, cmd: str):
+        pending = self._pending
+        pending.append(cmd)
+        if self._error_policy == POLICY_BATCH and len(pending) >= self._error_batch:
+            self.check_errors()
+
+    def check_errors(self) -> list:
+        """
+        drain the error queue, normally in one compound query
+
+        :returns:   ScpiErrors since the last check, empty if none
+        :rtype:     list
+        """
+        pending, self._pending = self._pending, []
+        if self.device is None:
+            return []
+        # one entry per command plus the terminating 0 covers the usual case
+        # in a single round trip, keep going if the queue was deeper
+        depth = min(len(pending) + 1, self.ERROR_QUEUE_DEPTH)
+        responses = []
+        while len(responses) < self.ERROR_QUEUE_DEPTH:
+            drained = self._pipeline(['syst:err?'] * depth)
+            if drained is None:
+                break
+            responses += drained
+            last = parse_error(drained[-1])
+            if last is None or last[0] == 0:
+                break
+            depth = min(depth * 2, self.ERROR_QUEUE_DEPTH - len(responses)) or 1
+        errors = attribute_errors(responses, pending)
+        for error in errors:
+            self.debug(f'SCPI Error: {error}', enable=True)
+        self._errors.extend(errors)
+        return errors
+
+    @contextmanager
+    def checkpoint(self):
+        """
+        with dp832.checkpoint(): ... checks the error queue once on exit.
+        yields a list that holds the errors afterwards.
+        """
+        errors = []
+        try:
+            yield errors
+        finally:
+            errors += self.check_errors()
+
     @staticmethod
     def decode_idn(idn: str) -> dict:
         """
@@ -97,29 +245,32 @@ class Instrument: #pylint: disable=too-many-instance-attributes
         self.debug('IDN Error')
         return None
 
-    def list_devices(self, include_tcpip: bool = False) -> List[dict]:
+    def list_devices(self, include_tcpip: bool = False, keep_open: bool = False) -> List[DeviceInfo]:
         """
         get list of connected instrument serial numbers
 
         :param      include_tcpip: flag to include tcpip connected instruments
         :type       include_tcpip: bool
+        :param      keep_open:     keep the sessions open in each record's
+                                   device, closed after identification if False
+        :type       keep_open:     bool
 
-        :returns:   List of idn dictionaries
-        :rtype:     List[dict]
+        :returns:   List of device records
+        :rtype:     List[DeviceInfo]
         """
         results = []
 
         self.debug('Looking for USB Connected instruments ...')
-        device_list = self._manager.list_resources(query='USB?*')
+        device_list = self.manager.list_resources(query='USB?*')
         if include_tcpip:
             self.debug('Looking for TCPIP Connected instruments ...')
-            device_list += self._manager.list_resources(query='TCPIP?*')
+            device_list += self.manager.list_resources(query='TCPIP?*')
 
         _shadow = self.device
         for device in device_list:
             _dev = None
             try:
-                _dev = self._manager.open_resource(device)
+                _dev = self._open(device)
                 self.debug(_dev)
                 if _dev is None:
                     continue
@@ -131,20 +282,82 @@ class Instrument: #pylint: disable=too-many-instance-attributes
                 identify = self.identify()
                 if identify is None:
                     self.debug(f'Could not Identify {_dev}')
+                    _dev.close()
                     continue
                 results.append(
-                    {
-                        **identify,
-                        **{
-                            'interface': str(_dev).split('::')[0].split(' at ')[1],
-                            'device': _dev
-                        }
-                    }
+                    DeviceInfo(
+                        interface=self._interface_name(_dev),
+                        resource_name=device,
+                        device=_dev if keep_open else None,
+                        **identify
+                    )
                 )
+                if not keep_open:
+                    _dev.close()
         self.device = _shadow
         return results
 
-    def connect(self, serial_number: str, include_tcpip: bool = False) -> bool:
+    @staticmethod
+    def _interface_name(device) -> str:
+        return str(device).split('::')[0].split(' at ')[1]
+
+    def _open(self, resource_name: str):
+        """
+        open a resource, raw SCPI sockets (TCPIP::host::5025::SOCKET) have no
+        END indicator so both directions are terminated with a newline
+
+        :param      resource_name:  VISA resource name
+        :type       resource_name:  str
+        """
+        device = self.manager.open_resource(resource_name)
+        if device is not None and resource_name.upper().endswith('::SOCKET'):
+            device.read_termination = '\n'
+            device.write_termination = '\n'
+        return device
+
+    def open_resource(self, resource_name: str, timings: dict = None) -> dict:
+        """
+        open and identify a resource by name, without a discovery sweep.
+        use for resources list_resources() does not report, such as raw
+        sockets, e.g. 'TCPIP::192.168.1.20::5025::SOCKET'
+
+        :param      resource_name:  VISA resource name
+        :type       resource_name:  str
+        :param      timings:        filled with the seconds spent in 'open'
+                                    and 'idn' if given
+        :type       timings:        dict
+
+        :returns:   device record for attach(), None on error
+        :rtype:     DeviceInfo
+        """
+        _shadow = self.device
+        start = time.perf_counter()
+        try:
+            _dev = self._open(resource_name)
+        except (InvalidSession, VisaIOError, VisaIOWarning) as _e:
+            self.debug(f'Could not open {resource_name}: {_e}')
+            return None
+        finally:
+            if timings is not None:
+                timings['open'] = time.perf_counter() - start
+        start = time.perf_counter()
+        self.device = _dev
+        identify = self.identify()
+        self.device = _shadow
+        if timings is not None:
+            timings['idn'] = time.perf_counter() - start
+        if identify is None:
+            self.debug(f'Could not Identify {_dev}')
+            _dev.close()
+            return None
+        return DeviceInfo(
+            interface=self._interface_name(_dev),
+            resource_name=resource_name,
+            device=_dev,
+            **identify
+        )
+
+    def connect(self, serial_number: str, include_tcpip: bool = False, watcher=None) -> bool:
         """
         connect to a device
 
@@ -152,6 +365,9 @@ class Instrument: #pylint: disable=too-many-instance-attributes
         :type       serial_number:  str
         :param      include_tcpip:  Indicates if the tcpip is included
         :type       include_tcpip:  bool
+        :param      watcher:        look the device up in this watcher's
+                                    registry instead of probing every device
+        :type       watcher:        instruments.discovery.DeviceWatcher
 
         :returns:   True if successful, False if not
         :rtype:     bool
@@ -163,27 +379,208 @@ class Instrument: #pylint: disable=too-many-instance-attributes
         self._start_time_seconds = round(time.time() * 1000)
         self._start_time_seconds /= 1000.0
 
+        if watcher is not None and self.attach_watched(watcher, serial_number=serial_number):
+            return True
+
         idn_list = self.list_devices(include_tcpip=include_tcpip)
         target = None
         for _idn in idn_list:
             if serial_number.lower() == _idn.get('serial_number').lower():
                 target = _idn
-                pp.pprint(_idn)
-                self.device = _idn.get('device')
+                self.debug(f'Found {_idn}')
                 break
 
-        if self.device is None:
+        if target is None:
             self.debug(f'Could not connect to \'{serial_number}\'')
             return False
 
-        self._manufacturer = target.get('manufacturer')
-        self._model = target.get('model')
-        self._serial_number = target.get('serial_number')
-        self._version = target.get('version')
-        self._interface = target.get('interface')
+        return self.attach(target)
+
+    def attach(self, idn: dict) -> bool:
+        """
+        take over a device that was already opened and identified, e.g. an
+        entry of list_devices(), without running another discovery sweep
+
+        :param      idn:  device record, opened again by resource_name if
+                          its device is closed, or a resource name to
+                          open_resource()
+        :type       idn:  DeviceInfo, dict or str
+
+        :returns:   True if successful, False if not
+        :rtype:     bool
+        """
+        if isinstance(idn, str):
+            idn = self.open_resource(idn)
+        if idn is None:
+            return False
+        device = idn.get('device')
+        if device is None and idn.get('resource_name'):
+            try:
+                device = self._open(idn.get('resource_name'))
+            except (InvalidSession, VisaIOError, VisaIOWarning) as _e:
+                self.debug(f'Could not open {idn.get("resource_name")}: {_e}')
+                return False
+        if device is None:
+            return False
+        if self.device is not None and self.device is not device:
+            self.close()
+
+        self._start_time_seconds = round(time.time() * 1000)
+        self._start_time_seconds /= 1000.0
+
+        self.device = device
+        self._manufacturer = idn.get('manufacturer')
+        self._model = idn.get('model')
+        self._serial_number = idn.get('serial_number')
+        self._version = idn.get('version')
+        self._interface = idn.get('interface')
+        self._resource_name = idn.get('resource_name') or ''
+
+        return True
+
+    def attach_watched(self, watcher, serial_number: str = None, model: str = None) -> bool:
+        """
+        take over a device from a watcher's registry without probing, the
+        watcher then reports its loss through session_lost()
+
+        :param      watcher:        The watcher
+        :type       watcher:        instruments.discovery.DeviceWatcher
+        :param      serial_number:  The serial number
+        :type       serial_number:  str
+        :param      model:          The model
+        :type       model:          str
+
+        :returns:   True if successful, False if the watcher doesn't know
+                    a matching device or it can't be opened
+        :rtype:     bool
+        """
+        known = watcher.find(serial_number=serial_number, model=model)
+        if known is None or not self.attach(known):
+            return False
+        watcher.watch(self)
+        return True
+
+    def start_recording(self, path: str):
+        """
+        record all traffic of the open session to a file, see
+        instruments.recording
+
+        :param      path:  recording file, appended to if it exists
+        :type       path:  str
 
+        :returns:   True if recording, False if not connected
+        :rtype:     bool
+        """
+        from instruments.recording import RecordingSession  # pylint: disable=import-outside-toplevel
+        if self.device is None:
+            return False
+        self.stop_recording()
+        self.device = RecordingSession(
+            self.device,
+            path,
+            idn={
+                'manufacturer': self._manufacturer,
+                'model': self._model,
+                'serial_number': self._serial_number,
+                'version': self._version,
+            }
+        )
         return True
 
+    def stop_recording(self):
+        """
+        stop recording and go back to the bare session
+        """
+        from instruments.recording import RecordingSession  # pylint: disable=import-outside-toplevel
+        if isinstance(self.device, RecordingSession):
+            self.device.stop()
+            self.device = self.device.device
+
+    def measure_settled(self, measure, channel: int = None, window: int = 5, **criteria):
+        """
+        repeat a measurement until it settles, instead of sleeping a fixed
+        time first. see instruments.settling.measure_until_settled for the
+        criteria (tolerance, stdev, slope, timeout, interval, min_time).
+
+        :param      measure:  measure method or its name, e.g. 'measure_voltage'
+        :type       measure:  callable or str
+        :param      channel:  passed to the measure method if given
+        :type       channel:  int
+        :param      window:   readings the criteria are evaluated over
+        :type       window:   int
+
+        :returns:   settled value, statistics and elapsed time
+        :rtype:     instruments.settling.SettledReading
+        """
+        from instruments.settling import measure_until_settled  # pylint: disable=import-outside-toplevel
+        if isinstance(measure, str):
+            measure = getattr(self, measure)
+        if channel is not None:
+            _measure = measure
+            measure = lambda: _measure(channel=channel)
+        return measure_until_settled(measure, window=window, **criteria)
+
+    def measure_derived(self, quantities, channel: int = 1) -> dict:
+        """
+        measure derived quantities, e.g. ('power', 'resistance'), with all
+        the primitive readings they need fetched in one compound query.
+        see instruments.derived.
+
+        :param      quantities:  quantity name or names
+        :type       quantities:  str or iterable
+        :param      channel:     The channel
+        :type       channel:     int
+
+        :returns:   primitives and derived values, None on error
+        :rtype:     dict
+        """
+        from instruments.derived import measure_derived  # pylint: disable=import-outside-toplevel
+        return measure_derived(self, quantities, channel)
+
+    def snapshot(self):
+        """
+        capture the current configuration in one query, see
+        instruments.snapshot
+
+        :returns:   the snapshot, None on error
+        :rtype:     instruments.snapshot.Snapshot
+        """
+        from instruments.snapshot import capture  # pylint: disable=import-outside-toplevel
+        return capture(self)
+
+    def restore(self, snapshot, refresh: bool = True) -> list:
+        """
+        apply a snapshot, sending only the settings that differ from the
+        current ones instead of *rst and a full reconfiguration
+
+        :param      snapshot:  The snapshot
+        :type       snapshot:  instruments.snapshot.Snapshot
+        :param      refresh:   read the current settings first, else trust
+                               the last snapshot or restore
+        :type       refresh:   bool
+
+        :returns:   commands sent, None on error
+        :rtype:     list
+        """
+        from instruments.snapshot import restore  # pylint: disable=import-outside-toplevel
+        return restore(self, snapshot, refresh)
+
+    def run_plan(self, plan) -> list:
+        """
+        run a measurement plan, compiled once per model and plan. see
+        instruments.plan
+
+        :param      plan:  steps, or a Program compiled for this model
+        :type       plan:  iterable or instruments.plan.Program
+
+        :returns:   query responses in plan order, None on error
+        :rtype:     list
+        """
+        from instruments.plan import (Program, compile_plan)  # pylint: disable=import-outside-toplevel
+        if not isinstance(plan, Program):
+            plan = compile_plan(type(self), plan)
+        return plan.run(self)
+
     def seconds(self):
         """
         return the amount of time the connection has been open
@@ -238,6 +635,26 @@ class Instrument: #pylint: disable=too-many-instance-attributes
         """ accessor """
         return self._version
 
+    @property
+    def resource_name(self):
+        """ accessor """
+        return self._resource_name
+
+    def session_lost(self):
+        """
+        the resource disappeared, e.g. the USB cable was pulled. drops the
+        session, connect() again once the device is back.
+        """
+        self.debug('Session lost', enable=True)
+        device = self.device
+        self.device = None
+        if device is None:
+            return
+        try:
+            device.close()
+        except (InvalidSession, VisaIOError, VisaIOWarning):
+            pass
+
     def query(self, cmd: str):
         """
         read/write opoeration to instrument
@@ -247,16 +664,162 @@ class Instrument: #pylint: disable=too-many-instance-attributes
         """
         if self.device is None:
             return None
+        metrics = self._metrics
+        if metrics is not None:
+            start = time.perf_counter()
         try:
-            self.debug(f'query( {cmd} )')
+            if self._debug_enable:
+                self.debug(f'query( {cmd} )')
             response = self.device.query(cmd)
+            if metrics is not None:
+                metrics.record(
+                    type(self).__name__, self._serial_number, cmd, start,
+                    time.perf_counter() - start, len(cmd), len(response)
+                )
             response = response.replace('\r', '').replace('\n', '')
-            self.debug(f'resp( {response} )')
+            if self._debug_enable:
+                self.debug(f'resp( {response} )')
+            if self._error_policy is not POLICY_OFF:
+                self._track(cmd)
             return response
         except (InvalidSession, VisaIOError, VisaIOWarning) as _e:
+            if metrics is not None:
+                metrics.record(
+                    type(self).__name__, self._serial_number, cmd, start,
+                    time.perf_counter() - start, len(cmd), error=True
+                )
             self.debug(f'QUERY Error: {_e}')
             return None
 
+    @staticmethod
+    def split_response(response: str) -> List[str]:
+        """
+        split a compound query response on ';' outside of quoted strings
+
+        :param      response:  The response
+        :type       response:  str
+
+        :returns:   one response per query
+        :rtype:     List[str]
+        """
+        if '"' not in response:
+            return response.split(';')
+        parts = []
+        start = 0
+        quoted = False
+        for index, char in enumerate(response):
+            if char == '"':
+                quoted = not quoted
+            elif char == ';' and not quoted:
+                parts.append(response[start:index])
+                start = index + 1
+        parts.append(response[start:])
+        return parts
+
+    @staticmethod
+    def compound(cmds: List[str]) -> str:
+        """
+        join commands into one SCPI program message, every command but the
+        common (*) ones is rooted with ':' so the header path resets
+
+        :param      cmds:  The commands
+        :type       cmds:  List[str]
+
+        :returns:   program message
+        :rtype:     str
+        """
+        return ';'.join(
+            cmd if cmd[:1] in (':', '*') else f':{cmd}'
+            for cmd in (cmd.strip() for cmd in cmds)
+        )
+
+    def query_pipelined(self, cmds: List[str], compound: bool = True,
+                        batch_size: int = None) -> List[str]:
+        """
+        run several queries for about one round trip per batch
+
+        compound=True joins each batch into a single program message and
+        splits the response, which every SCPI instrument accepts.
+        compound=False writes every query back-to-back and then reads the
+        responses in order, for streaming transports like raw sockets on
+        instruments that buffer responses instead of raising -410 (query
+        interrupted).
+
+        :param      cmds:        queries
+        :type       cmds:        List[str]
+        :param      compound:    send each batch as one program message
+        :type       compound:    bool
+        :param      batch_size:  queries per batch, all at once if None
+        :type       batch_size:  int
+
+        :returns:   responses in query order, None on error
+        :rtype:     List[str]
+        """
+        if self.device is None:
+            return None
+        cmds = list(cmds)
+        if self._error_policy is POLICY_OFF:
+            return self._pipeline(cmds, compound, batch_size)
+        # pending before they are sent, a batch check they trigger runs
+        # once the whole pipeline is out
+        self._pending.extend(cmds)
+        responses = self._pipeline(cmds, compound, batch_size)
+        if self._error_policy == POLICY_BATCH and len(self._pending) >= self._error_batch:
+            self.check_errors()
+        return responses
+
+    def _pipeline(self, cmds: List[str], compound: bool = True, batch_size: int = None) -> List[str]:
+        # query_pipelined() without error tracking, check_errors() drains
+        # the queue through it
+        batch_size = batch_size or len(cmds) or 1
+        responses = []
+        metrics = self._metrics
+        try:
+            for offset in range(0, len(cmds), batch_size):
+                batch = cmds[offset:offset + batch_size]
+                if metrics is not None:
+                    start = time.perf_counter()
+                    received = sum(len(response) for response in responses)
+                if compound:
+                    message = self.compound(batch)
+                    if self._debug_enable:
+                        self.debug(f'query( {message} )')
+                    response = self.device.query(message)
+                    response = response.replace('\r', '').replace('\n', '')
+                    parts = self.split_response(response)
+                    if len(parts) != len(batch):
+                        self.debug(f'PIPELINE Error: {len(batch)} queries, resp( {response} )')
+                        return None
+                    responses += parts
+                else:
+                    for cmd in batch:
+                        if self._debug_enable:
+                            self.debug(f'write( {cmd} )')
+                        self.device.write(cmd)
+                    for _ in batch:
+                        response = self.device.read()
+                        responses.append(response.replace('\r', '').replace('\n', ''))
+                if metrics is not None:
+                    metrics.record(
+                        type(self).__name__, self._serial_number, self.compound(batch),
+                        start, time.perf_counter() - start,
+                        sum(len(cmd) + 1 for cmd in batch),
+                        sum(len(response) for response in responses) - received,
+                        header=f'pipeline[{len(batch)}]'
+                    )
+            if self._debug_enable:
+                self.debug(f'resp( {responses} )')
+            return responses
+        except (InvalidSession, VisaIOError, VisaIOWarning) as _e:
+            if metrics is not None:
+                metrics.record(
+                    type(self).__name__, self._serial_number, self.compound(batch),
+                    start, time.perf_counter() - start, error=True,
+                    header=f'pipeline[{len(batch)}]'
+                )
+            self.debug(f'PIPELINE Error: {_e}')
+            return None
+
     def write(self, cmd: str):
         """
         write data to instrument
@@ -266,10 +829,27 @@ class Instrument: #pylint: disable=too-many-instance-attributes
         """
         if self.device is None:
             return None
+        metrics = self._metrics
+        if metrics is not None:
+            start = time.perf_counter()
         try:
-            self.debug(f'write( {cmd} )')
-            return self.device.write(cmd)
+            if self._debug_enable:
+                self.debug(f'write( {cmd} )')
+            result = self.device.write(cmd)
+            if metrics is not None:
+                metrics.record(
+                    type(self).__name__, self._serial_number, cmd, start,
+                    time.perf_counter() - start, len(cmd)
+                )
+            if self._error_policy is not POLICY_OFF:
+                self._track(cmd)
+            return result
         except (InvalidSession, VisaIOError, VisaIOWarning) as _e:
+            if metrics is not None:
+                metrics.record(
+                    type(self).__name__, self._serial_number, cmd, start,
+                    time.perf_counter() - start, len(cmd), error=True
+                )
             self.debug(f'WRITE Error: {_e}')
             return None
 
@@ -282,19 +862,172 @@ class Instrument: #pylint: disable=too-many-instance-attributes
         """
         if self.device is None:
             return None
+        metrics = self._metrics
+        if metrics is not None:
+            start = time.perf_counter()
         try:
-            self.debug(f'read( {cmd} )')
-            return self.device.read(cmd)
+            if self._debug_enable:
+                self.debug(f'read( {cmd} )')
+            response = self.device.read(cmd)
+            if metrics is not None:
+                metrics.record(
+                    type(self).__name__, self._serial_number, 'read', start,
+                    time.perf_counter() - start, bytes_in=len(response)
+                )
+            return response
         except (InvalidSession, VisaIOError, VisaIOWarning) as _e:
+            if metrics is not None:
+                metrics.record(
+                    type(self).__name__, self._serial_number, 'read', start,
+                    time.perf_counter() - start, error=True
+                )
             self.debug(f'READ Error: {_e}')
             return None
 
+    def query_binary(self, cmd: str, datatype: str = 'B', container=list, **kwargs):
+        """
+        query an IEEE 488.2 definite length binary block
+
+        :param      cmd:        The command
+        :type       cmd:        str
+        :param      datatype:   struct format of one value
+        :type       datatype:   str
+        :param      container:  type of the result, e.g. numpy.array
+        :type       container:  callable
+
+        :returns:   values, None on error
+        :rtype:     container
+        """
+        if self.device is None:
+            return None
+        metrics = self._metrics
+        if metrics is not None:
+            start = time.perf_counter()
+        try:
+            if self._debug_enable:
+                self.debug(f'query_binary( {cmd} )')
+            values = self.device.query_binary_values(
+                cmd, datatype=datatype, container=container, **kwargs
+            )
+            if metrics is not None:
+                metrics.record(
+                    type(self).__name__, self._serial_number, cmd, start,
+                    time.perf_counter() - start, len(cmd),
+                    len(values) * struct.calcsize(datatype)
+                )
+            return values
+        except (InvalidSession, VisaIOError, VisaIOWarning) as _e:
+            if metrics is not None:
+                metrics.record(
+                    type(self).__name__, self._serial_number, cmd, start,
+                    time.perf_counter() - start, len(cmd), error=True
+                )
+            self.debug(f'QUERY Error: {_e}')
+            return None
+
+    def readinto(self, cmd: str, buffer, dtype: str = 'u1'):
+        """
+        query an IEEE 488.2 definite length binary block straight into a
+        preallocated buffer, no bytes object or array per fetch
+
+        :param      cmd:     The command
+        :type       cmd:     str
+        :param      buffer:  numpy array or bytearray to fill, or a
+                             BufferPool to lease a buffer from
+        :type       buffer:  numpy.ndarray or instruments.buffers.BufferPool
+        :param      dtype:   numpy dtype of the values, e.g. '<f4'
+        :type       dtype:   str
+
+        :returns:   view of the filled part of the buffer, None on error. a
+                    view leased from a pool goes back with pool.release()
+        :rtype:     numpy.ndarray
+        """
+        import numpy as np  # pylint: disable=import-outside-toplevel
+        if self.device is None:
+            return None
+        pool = buffer if hasattr(buffer, 'lease') else None
+        array = None
+        metrics = self._metrics
+        start = time.perf_counter()
+        try:
+            if self._debug_enable:
+                self.debug(f'readinto( {cmd} )')
+            self.device.write(cmd)
+            header = self.device.read_bytes(2)
+            if header[:1] != b'#' or not header[1:2].isdigit() or header[1:2] == b'0':
+                raise ValueError(f'no definite length block, got {header!r}')
+            length = int(self.device.read_bytes(int(header[1:2])))
+            if pool is not None:
+                array = pool.lease(length)
+            elif isinstance(buffer, np.ndarray):
+                array = buffer.reshape(-1).view('u1')
+            else:
+                array = np.frombuffer(buffer, dtype='u1')
+            if length > len(array):
+                # drop the block, the next command would read it otherwise
+                self.device.read_raw()
+                raise ValueError(f'{length} byte block does not fit {len(array)} bytes')
+            self._read_block(memoryview(array)[:length])
+            if metrics is not None:
+                metrics.record(
+                    type(self).__name__, self._serial_number, cmd, start,
+                    time.perf_counter() - start, len(cmd), length
+                )
+            return array[:length].view(dtype)
+        except (InvalidSession, VisaIOError, VisaIOWarning, ValueError) as _e:
+            if pool is not None and array is not None:
+                pool.release(array)
+            if metrics is not None:
+                metrics.record(
+                    type(self).__name__, self._serial_number, cmd, start,
+                    time.perf_counter() - start, len(cmd), error=True
+                )
+            self.debug(f'READINTO Error: {_e}')
+            return None
+
+    def _read_block(self, view: memoryview):
+        # with a ctypes VISA library viRead writes into the buffer directly,
+        # other backends and recording proxies go through read_bytes()
+        from pyvisa.constants import StatusCode  # pylint: disable=import-outside-toplevel
+        from pyvisa.resources import MessageBasedResource  # pylint: disable=import-outside-toplevel
+        length = len(view)
+        offset = 0
+        lib = None
+        if isinstance(self.device, MessageBasedResource):
+            lib = getattr(self.device.visalib, 'lib', None)
+        if lib is not None and hasattr(lib, 'viRead'):
+            import ctypes  # pylint: disable=import-outside-toplevel
+            returned = ctypes.c_uint32()
+            while offset < length:
+                target = (ctypes.c_char * (length - offset)).from_buffer(view[offset:])
+                status = lib.viRead(
+                    self.device.session, target, length - offset, ctypes.byref(returned)
+                )
+                if returned.value == 0:
+                    raise ValueError(f'block ended after {offset} of {length} bytes')
+                offset += returned.value
+        else:
+            # read_bytes() chunks by itself, asking for the rest keeps the
+            # call sequence independent of the session's chunk_size, so a
+            # recording replays the same way
+            while offset < length:
+                data = self.device.read_bytes(length - offset)
+                if not data:
+                    raise ValueError(f'block ended after {offset} of {length} bytes')
+                view[offset:offset + len(data)] = data
+                offset += len(data)
+            status = getattr(self.device, 'last_status', None)
+        # the message terminator follows the block unless END came with it
+        if status == StatusCode.success_max_count_read:
+            self.device.read_bytes(1)
+
     def reset(self):
         """
         Resets the instrument.
         """
         if self.device is None:
             return None
+        self.known_settings = None
         try:
             return self.write('*rst')
         except (InvalidSession, VisaIOError, VisaIOWarning):
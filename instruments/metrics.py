@@ -0,0 +1,302 @@
+#!/usr/bin/env python
+# python 3
+##    @file:    metrics.py
+#     @name:    Luke Gary
+#  @company:    RyeEffectsResearch
+#     @date:    2026/10/19
+################################################################################
+# @copyright
+#   Copyright 2020 RyeEffectsResearch as an  unpublished work.
+#   All Rights Reserved.
+#
+# @license The information contained herein is confidential
+#   property of RyeEffectsResearch. The user, copying, transfer or
+#   disclosure of such information is prohibited except
+#   by express written agreement with RyeEffectsResearch.
+################################################################################
+
+"""
+per-command latency metrics and trace export
+
+attach a CommandMetrics to one or more instruments with
+Instrument.enable_metrics(). commands are keyed by instrument class, serial
+number and normalized SCPI header, so 'SOUR1:VOLT 3.3' and 'sour2:volt 5'
+both count as 'sour#:volt'.
+"""
+
+import bisect
+import json
+import re
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+
+# latency histogram bucket upper bounds, 10 us doubling up to ~168 s
+BUCKET_BOUNDS = tuple(10e-6 * 2 ** index for index in range(25))
+
+_DIGITS = re.compile(r'\d+')
+
+
+@lru_cache(maxsize=1024)
+def normalize_header(cmd: str) -> str:
+    """
+    reduce a SCPI command to its header, without parameters, leading ':',
+    case or numeric suffixes
+
+    :param      cmd:  The command
+    :type       cmd:  str
+
+    :returns:   normalized header
+    :rtype:     str
+    """
+    header = cmd.strip().split(None, 1)[0] if cmd.strip() else ''
+    header = header.split(';', 1)[0].lstrip(':').lower()
+    return _DIGITS.sub('#', header)
+
+
+class CommandStats:
+    """
+    This class describes the counters for one command key.
+    """
+    __slots__ = (
+        'count', 'errors', 'bytes_out', 'bytes_in',
+        'total', 'minimum', 'maximum', 'buckets'
+    )
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.bytes_out = 0
+        self.bytes_in = 0
+        self.total = 0.0
+        self.minimum = None
+        self.maximum = 0.0
+        self.buckets = [0] * (len(BUCKET_BOUNDS) + 1)
+
+    def add(self, duration: float, bytes_out: int, bytes_in: int, error: bool):
+        """ account one command """
+        self.count += 1
+        self.errors += bool(error)
+        self.bytes_out += bytes_out
+        self.bytes_in += bytes_in
+        self.total += duration
+        if self.minimum is None or duration < self.minimum:
+            self.minimum = duration
+        if duration > self.maximum:
+            self.maximum = duration
+        self.buckets[bisect.bisect_left(BUCKET_BOUNDS, duration)] += 1
+
+    def percentile(self, fraction: float) -> float:
+        """
+        latency percentile estimated from the histogram, the upper bound of
+        the bucket the percentile falls in
+
+        :param      fraction:  e.g. 0.95
+        :type       fraction:  float
+
+        :returns:   seconds
+        :rtype:     float
+        """
+        if self.count == 0:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank and count:
+                if index < len(BUCKET_BOUNDS):
+                    return min(BUCKET_BOUNDS[index], self.maximum)
+                return self.maximum
+        return self.maximum
+
+    def as_dict(self) -> dict:
+        """ json friendly summary """
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'bytes_out': self.bytes_out,
+            'bytes_in': self.bytes_in,
+            'total_s': self.total,
+            'mean_s': self.total / self.count if self.count else None,
+            'min_s': self.minimum,
+            'max_s': self.maximum,
+            'p50_s': self.percentile(0.50),
+            'p95_s': self.percentile(0.95),
+            'p99_s': self.percentile(0.99),
+            'histogram': {
+                'bounds_s': list(BUCKET_BOUNDS),
+                'counts': list(self.buckets),
+            },
+        }
+
+
+class CommandMetrics:
+    """
+    This class describes a collector of command latencies and trace events.
+    """
+    def __init__(self, trace: bool = True, max_events: int = 100000):
+        """
+        constructor
+
+        :param      trace:       keep individual events for the chrome trace
+        :type       trace:       bool
+        :param      max_events:  trace ring buffer length, oldest are dropped
+        :type       max_events:  int
+        """
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self._stats = {}
+        self._events = deque(maxlen=max_events) if trace else None
+
+    @property
+    def origin(self) -> float:
+        """ perf_counter() value trace timestamps are relative to """
+        return self._origin
+
+    def reset(self):
+        """
+        drop all counters and events
+        """
+        with self._lock:
+            self._origin = time.perf_counter()
+            self._stats = {}
+            if self._events is not None:
+                self._events.clear()
+
+    def record(self, instrument: str, serial: str, cmd: str, start: float,
+               duration: float, bytes_out: int = 0, bytes_in: int = 0,
+               error: bool = False, header: str = None):
+        """
+        account one command
+
+        :param      instrument:  instrument class name
+        :type       instrument:  str
+        :param      serial:      instrument serial number
+        :type       serial:      str
+        :param      cmd:         the command as sent
+        :type       cmd:         str
+        :param      start:       perf_counter() when the command was issued
+        :type       start:       float
+        :param      duration:    seconds until it completed
+        :type       duration:    float
+        :param      bytes_out:   bytes sent
+        :type       bytes_out:   int
+        :param      bytes_in:    bytes received
+        :type       bytes_in:    int
+        :param      error:       the command failed
+        :type       error:       bool
+        :param      header:      key override, normalize_header(cmd) if None
+        :type       header:      str
+        """
+        if header is None:
+            header = normalize_header(cmd)
+        key = (instrument, serial, header)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = CommandStats()
+            stats.add(duration, bytes_out, bytes_in, error)
+            if self._events is not None:
+                self._events.append(
+                    (key, cmd, start, duration, bytes_out, bytes_in, error,
+                     threading.get_ident())
+                )
+
+    def stats(self) -> dict:
+        """
+        counters by (instrument, serial, header)
+
+        :returns:   copy of the stats table
+        :rtype:     dict
+        """
+        with self._lock:
+            return dict(self._stats)
+
+    def slowest(self, count: int = 10) -> list:
+        """
+        command keys with the most total time
+
+        :param      count:  The count
+        :type       count:  int
+
+        :returns:   ((instrument, serial, header), CommandStats) pairs
+        :rtype:     list
+        """
+        return sorted(
+            self.stats().items(), key=lambda item: item[1].total, reverse=True
+        )[:count]
+
+    def summary(self) -> dict:
+        """
+        json friendly summary, nested instrument -> serial -> header
+
+        :returns:   summary
+        :rtype:     dict
+        """
+        result = {}
+        for (instrument, serial, header), stats in self.stats().items():
+            result.setdefault(instrument, {}).setdefault(serial, {})[header] = stats.as_dict()
+        return result
+
+    def to_json(self, path: str = None) -> str:
+        """
+        export the summary as json
+
+        :param      path:  also write it to this file
+        :type       path:  str
+
+        :returns:   json text
+        :rtype:     str
+        """
+        text = json.dumps(self.summary(), indent=2)
+        if path is not None:
+            with open(path, 'w') as _file:
+                _file.write(text)
+        return text
+
+    def chrome_trace(self, path: str = None) -> dict:
+        """
+        export events in the chrome trace event format, load the file in
+        chrome://tracing or https://ui.perfetto.dev. every instrument is a
+        process and every calling thread a track.
+
+        :param      path:  also write it to this file
+        :type       path:  str
+
+        :returns:   trace document
+        :rtype:     dict
+        """
+        with self._lock:
+            events = list(self._events or ())
+        pids = {}
+        trace = []
+        for (instrument, serial, header), cmd, start, duration, bytes_out, bytes_in, error, tid in events:
+            name = f'{instrument}:{serial}'
+            pid = pids.get(name)
+            if pid is None:
+                pid = pids[name] = len(pids) + 1
+                trace.append({
+                    'name': 'process_name', 'ph': 'M', 'pid': pid,
+                    'args': {'name': name},
+                })
+            trace.append({
+                'name': header,
+                'cat': 'error' if error else 'scpi',
+                'ph': 'X',
+                'ts': (start - self._origin) * 1e6,
+                'dur': duration * 1e6,
+                'pid': pid,
+                'tid': tid,
+                'args': {
+                    'cmd': cmd,
+                    'bytes_out': bytes_out,
+                    'bytes_in': bytes_in,
+                    'error': error,
+                },
+            })
+        document = {'traceEvents': trace, 'displayTimeUnit': 'ms'}
+        if path is not None:
+            with open(path, 'w') as _file:
+                json.dump(document, _file)
+        return document
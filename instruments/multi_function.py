@@ -20,28 +20,57 @@
 multi-function bench equipment
 """
 
+import time
+
 from instruments.instrument import Instrument
+from instruments.records import PowerReading
 from pyvisa import (InvalidSession)
 
 class U3606B(Instrument):
     """
     This class describes a Keysight U3606B PSU/Meter.
     """
+    PRIMITIVES = {
+        'volts': ('sens:volt?', 0),
+        'amps': ('sens:curr?', 0),
+    }
+    SETTINGS = (
+        ('volt', 'sour:volt?', 'sour:volt {value}'),
+        ('curr', 'sour:curr?', 'sour:curr {value}'),
+        ('outp', 'outp?', 'outp {value}'),
+    )
+    PLAN_TEMPLATES = {
+        'volt': 'sour:volt {value}',
+        'curr': 'sour:curr {value}',
+        'output': 'outp {value}',
+        'measure_volts': 'sens:volt?',
+        'measure_amps': 'sens:curr?',
+    }
+
     def __init__(self, **kwargs):
         serial_number = kwargs.get('serial_number', None)
         tcpip = kwargs.get('include_tcpip', True)
+        resource = kwargs.pop('resource', None)
+        watcher = kwargs.pop('watcher', None)
         try:
             kwargs.pop('serial_number')
             kwargs.pop('include_tcpip')
         except KeyError:
             pass
         super().__init__(**kwargs)
-        if serial_number:
+        if resource:
+            self.attach(resource)
+            if watcher is not None:
+                watcher.watch(self)
+        elif serial_number:
             self.debug(f'Attempting Connect to {serial_number}', enable=True)
             self.connect(
                 serial_number=serial_number,
-                include_tcpip=tcpip
+                include_tcpip=tcpip,
+                watcher=watcher
             )
+        elif watcher is not None and self.attach_watched(watcher, model='U3606B'):
+            self.debug('No Serial Given, attached first U3606B of the watcher', enable=True)
         else:
             # connect to the first U3606B
             self.debug('No Serial Given, connecting to first U3606B', enable=True)
@@ -49,33 +78,26 @@ class U3606B(Instrument):
             connected = False
             for device in devices:
                 if device.get('model') == 'U3606B':
-                    self.connect(
-                        serial_number=device.get('serial_number'),
-                        include_tcpip=kwargs.get('include_tcpip', True)
-                    )
+                    self.attach(device)
                     connected = True
                     break
             if connected is False:
                 raise InvalidSession(f'Could not connect to {serial_number}')
 
-    def measure_all(self, channel: int = 1) -> dict:
+    def measure_all(self, channel: int = 1) -> PowerReading:
         """
         measure P,I,V from channel
 
         :param      channel:   cahnnel number
         :type       channel:   int
 
-        :returns:   measurement dict
-        :rtype:     dict
+        :returns:   measurement record, reading['volts'] etc. still works
+        :rtype:     PowerReading
         """
         res = self.query(f'meas:all:dc? ch{channel}')
-        res = res.replace('\n', '')
-        res = res.split(',')
-        ret = {}
-        ret['volts'] = res[0]
-        ret['amps'] = res[1]
-        ret['watts'] = res[2]
-        return ret
+        if res is None:
+            return None
+        return PowerReading.parse(res, channel, time.time())
 
     def measure_source_current(self, channel: int = 1) -> float:
         """
@@ -122,11 +144,14 @@ class U3606B(Instrument):
         :rtype:     float
         """
         del channel
-        volts = self.measure_source_voltage()
-        amps = self.measure_source_current()
-        return volts*amps
+        # voltage and current in one compound query, sampled back to back
+        res = self.measure_derived('power')
+        if res is not None:
+            return res['power']
+        self.debug(f'Measurement Error')
+        return res
 
-    def set_output_current(self, current: float, channel: int = 1):
+    def set_output_current(self, current: float, channel: int = 1, verify: bool = None):
         """
         Sets the output current.
 
@@ -134,15 +159,22 @@ class U3606B(Instrument):
         :type       current:  float
         :param      channel:  The channel
         :type       channel:  int
+        :param      verify:   read the setpoint back, costs a round trip. None
+                              verifies unless an error policy is set
+        :type       verify:   bool
         """
         del channel
         # sour:curry
         self.write(f'sour:curr {current}')
+        if verify is None:
+            verify = self.error_policy is None
+        if not verify:
+            return
         res = self.query(f'sour:curr?')
         if float(res) != float(current):
             print(f'Error in Setting Current! sent {current}, recv {res}')
 
-    def set_output_voltage(self, voltage: float, channel: int = 1):
+    def set_output_voltage(self, voltage: float, channel: int = 1, verify: bool = None):
         """
         Sets the output voltage.
 
@@ -150,9 +182,19 @@ class U3606B(Instrument):
         :type       voltage:  float
         :param      channel:  The channel
         :type       channel:  int
+        :param      verify:   measure the output afterwards, costs a round
+                              trip. None verifies unless an error policy is set
+        :type       verify:   bool
+
+        :returns:   measured output voltage, None if not verified
+        :rtype:     float
         """
         del channel
         self.write(f'volt {voltage}')
+        if verify is None:
+            verify = self.error_policy is None
+        if not verify:
+            return None
         return self.measure_source_voltage()
 
     def enable_source(self, channel: int = 1) -> bool:
@@ -20,7 +20,7 @@
 multimeter interfaces
 """
 from instruments.instrument import Instrument
-from instruments.multi_function import U3606B
+from instruments.registry import get_model_class
 from pyvisa import (VisaIOError, VisaIOWarning, InvalidSession)
 
 def connect_to_multimeter(model: str, meter_serial: str = None, tcpip: bool = False) -> object:
@@ -35,13 +35,8 @@ def connect_to_multimeter(model: str, meter_serial: str = None, tcpip: bool = Fa
     :returns:   multimeter object if model is valid, None if not
     :rtype:     object
     """
-    mutlimeter_models = {
-        'U3606B': U3606B,
-        '34465A': KS34465A,
-        'DM3058E': DM3058E,
-    }
     meter_obj = None
-    multimeter = mutlimeter_models.get(model, None)
+    multimeter = get_model_class(model, kind='multimeter')
     if multimeter:
         try:
             meter_obj = multimeter(
@@ -58,21 +53,53 @@ class KS34465A(Instrument):
     """
     This class describes a Keysight 34465A Bench Meter.
     """
+    # one function at a time, meas:curr? after meas:volt? would reconfigure
+    # the meter between readings of the same sample
+    PRIMITIVES = {
+        'volts': ('meas:volt:dc?', 0),
+    }
+    LEARN = True
+    # function is a SENSe subsystem, e.g. 'volt:dc', 'curr:dc', 'res'
+    PLAN_TEMPLATES = {
+        'function': 'conf:{function}',
+        'nplc': 'sens:{function}:nplc {value}',
+        'range': 'sens:{function}:rang {value}',
+        'autorange': 'sens:{function}:rang:auto {value}',
+        'autozero': 'sens:{function}:zero:auto {value}',
+        'samples': 'samp:coun {value}',
+        'trigger_source': 'trig:sour {value}',
+        'trigger_count': 'trig:coun {value}',
+        'trigger_delay': 'trig:del {value}',
+        'initiate': 'init',
+        'read': 'read?',
+        'fetch': 'fetc?',
+        'measure': 'meas:{function}?',
+    }
+
     def __init__(self, **kwargs):
         serial_number = kwargs.get('serial_number', None)
         tcpip = kwargs.get('include_tcpip', True)
+        resource = kwargs.pop('resource', None)
+        watcher = kwargs.pop('watcher', None)
         try:
             kwargs.pop('serial_number')
             kwargs.pop('include_tcpip')
         except KeyError:
             pass
         super().__init__(**kwargs)
-        if serial_number:
+        if resource:
+            self.attach(resource)
+            if watcher is not None:
+                watcher.watch(self)
+        elif serial_number:
             self.debug(f'Attempting Connect to {serial_number}', enable=True)
             self.connect(
                 serial_number=serial_number,
-                include_tcpip=tcpip
+                include_tcpip=tcpip,
+                watcher=watcher
             )
+        elif watcher is not None and self.attach_watched(watcher, model='34465A'):
+            self.debug('No Serial Given, attached first 34465A of the watcher', enable=True)
         else:
             # connect to the first 34465A
             self.debug('No Serial Given, connecting to first 34465A', enable=True)
@@ -81,10 +108,7 @@ class KS34465A(Instrument):
             for device in devices:
                 if device.get('model') == '34465A':
                     self.debug(f'Attempt connect to KS34465A - {device.get("serial_number")}')
-                    self.connect(
-                        serial_number=device.get('serial_number'),
-                        include_tcpip=kwargs.get('include_tcpip', True)
-                    )
+                    self.attach(device)
                     connected = True
                     break
             if connected is False:
@@ -134,21 +158,36 @@ class DM3058E(Instrument):
     """
     This class describes a DM3058E Bench Meter.
     """
+    # one function at a time, meas:curr? after meas:volt? would reconfigure
+    # the meter between readings of the same sample
+    PRIMITIVES = {
+        'volts': ('meas:volt:dc?', 0),
+    }
+
     def __init__(self, **kwargs):
         serial_number = kwargs.get('serial_number', None)
         tcpip = kwargs.get('include_tcpip', True)
+        resource = kwargs.pop('resource', None)
+        watcher = kwargs.pop('watcher', None)
         try:
             kwargs.pop('serial_number')
             kwargs.pop('include_tcpip')
         except KeyError:
             pass
         super().__init__(**kwargs)
-        if serial_number:
+        if resource:
+            self.attach(resource)
+            if watcher is not None:
+                watcher.watch(self)
+        elif serial_number:
             self.debug(f'Attempting Connect to {serial_number}', enable=True)
             self.connect(
                 serial_number=serial_number,
-                include_tcpip=tcpip
+                include_tcpip=tcpip,
+                watcher=watcher
             )
+        elif watcher is not None and self.attach_watched(watcher, model='DM3058E'):
+            self.debug('No Serial Given, attached first DM3058E of the watcher', enable=True)
         else:
             # connect to the first DM3058E
             self.debug('No Serial Given, connecting to first DM3058E', enable=True)
@@ -156,10 +195,7 @@ class DM3058E(Instrument):
             connected = False
             for device in devices:
                 if device.get('model') == 'DM3058E':
-                    self.connect(
-                        serial_number=device.get('serial_number'),
-                        include_tcpip=kwargs.get('include_tcpip', True)
-                    )
+                    self.attach(device)
                     connected = True
                     break
             if connected is False:
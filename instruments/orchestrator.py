@@ -0,0 +1,289 @@
+#!/usr/bin/env python
+# python 3
+##    @file:    orchestrator.py
+#     @name:    Luke Gary
+#  @company:    RyeEffectsResearch
+#     @date:    2026/10/19
+################################################################################
+# @copyright
+#   Copyright 2020 RyeEffectsResearch as an  unpublished work.
+#   All Rights Reserved.
+#
+# @license The information contained herein is confidential
+#   property of RyeEffectsResearch. The user, copying, transfer or
+#   disclosure of such information is prohibited except
+#   by express written agreement with RyeEffectsResearch.
+################################################################################
+
+"""
+multi-station test orchestration
+
+every station (DUT fixture) runs its sequence of steps on its own worker.
+instruments shared between fixtures, e.g. a KS34465A behind relays, are
+SharedResources: a step declares the resources it needs and holds a lease on
+them for its duration. leases are granted first come first served, so no
+station starves, and steps that need nothing shared never wait.
+"""
+
+import threading
+import time
+import traceback
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+
+class SharedResource:
+    """
+    This class describes an instrument shared between stations, leased FIFO.
+    """
+    def __init__(self, name: str, instrument=None, capacity: int = 1):
+        """
+        constructor
+
+        :param      name:        resource name steps refer to
+        :type       name:        str
+        :param      instrument:  the shared instrument, handed to steps
+        :param      capacity:    concurrent leases, 1 for an instrument
+        :type       capacity:    int
+        """
+        self.name = name
+        self.instrument = instrument
+        self.capacity = capacity
+        self._condition = threading.Condition()
+        self._queue = deque()
+        self._in_use = 0
+        self._busy_since = None
+        self.busy_time = 0.0
+        self.leases = 0
+        self.wait_time = {}
+
+    def acquire(self, owner: str) -> float:
+        """
+        wait for a lease, in arrival order
+
+        :param      owner:  station name, for the wait statistics
+        :type       owner:  str
+
+        :returns:   seconds waited
+        :rtype:     float
+        """
+        start = time.perf_counter()
+        ticket = object()
+        with self._condition:
+            self._queue.append(ticket)
+            while self._queue[0] is not ticket or self._in_use >= self.capacity:
+                self._condition.wait()
+            self._queue.popleft()
+            if self._in_use == 0:
+                self._busy_since = time.perf_counter()
+            self._in_use += 1
+            self.leases += 1
+            waited = time.perf_counter() - start
+            self.wait_time[owner] = self.wait_time.get(owner, 0.0) + waited
+            # the next in line may fit too if capacity > 1
+            self._condition.notify_all()
+        return waited
+
+    def release(self):
+        """
+        return a lease
+        """
+        with self._condition:
+            self._in_use -= 1
+            if self._in_use == 0:
+                self.busy_time += time.perf_counter() - self._busy_since
+            self._condition.notify_all()
+
+    @contextmanager
+    def lease(self, owner: str):
+        """
+        with resource.lease('fixture3') as instrument: ...
+
+        :param      owner:  station name
+        :type       owner:  str
+        """
+        self.acquire(owner)
+        try:
+            yield self.instrument
+        finally:
+            self.release()
+
+
+class Step:
+    """
+    This class describes one step of a station sequence.
+    """
+    __slots__ = ('name', 'action', 'resources')
+
+    def __init__(self, name: str, action, resources=()):
+        """
+        constructor
+
+        :param      name:       step name
+        :type       name:       str
+        :param      action:     callable(context), context is the station
+                                context plus the leased instruments by name
+        :type       action:     callable
+        :param      resources:  names of shared resources the step needs
+        :type       resources:  iterable of str
+        """
+        self.name = name
+        self.action = action
+        self.resources = tuple(sorted(resources))
+
+
+class StationReport:
+    """
+    This class describes how one station spent its time.
+    """
+    __slots__ = ('station', 'elapsed', 'busy', 'waiting', 'steps', 'results', 'errors')
+
+    def __init__(self, station: str):
+        self.station = station
+        self.elapsed = 0.0
+        self.busy = 0.0
+        self.waiting = {}
+        self.steps = 0
+        self.results = {}
+        self.errors = []
+
+    @property
+    def utilization(self) -> float:
+        """ fraction of the run spent executing steps """
+        return self.busy / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def ok(self) -> bool:
+        """ no step raised """
+        return not self.errors
+
+    def __repr__(self):
+        waiting = ', '.join(f'{name}={seconds:0.3f}s' for name, seconds in self.waiting.items())
+        return (
+            f'StationReport({self.station}: elapsed={self.elapsed:0.3f}s, '
+            f'utilization={self.utilization:0.1%}, steps={self.steps}, '
+            f'errors={len(self.errors)}, waiting=[{waiting}])'
+        )
+
+
+class Orchestrator:
+    """
+    This class describes concurrent station sequences over shared instruments.
+    """
+    def __init__(self, resources=None, workers: int = None, continue_on_error: bool = False):
+        """
+        constructor
+
+        :param      resources:          shared instruments by name, or
+                                        SharedResource objects
+        :type       resources:          dict
+        :param      workers:            worker threads, one per station if None
+        :type       workers:            int
+        :param      continue_on_error:  keep running a station's sequence after
+                                        a step raised
+        :type       continue_on_error:  bool
+        """
+        self.resources = {}
+        for name, resource in (resources or {}).items():
+            self.add_resource(name, resource)
+        self.workers = workers
+        self.continue_on_error = continue_on_error
+        self._stations = {}
+
+    def add_resource(self, name: str, resource, capacity: int = 1) -> SharedResource:
+        """
+        add a shared instrument
+
+        :param      name:      resource name
+        :type       name:      str
+        :param      resource:  instrument or SharedResource
+        :param      capacity:  concurrent leases
+        :type       capacity:  int
+
+        :returns:   the shared resource
+        :rtype:     SharedResource
+        """
+        if not isinstance(resource, SharedResource):
+            resource = SharedResource(name, resource, capacity)
+        self.resources[name] = resource
+        return resource
+
+    def add_station(self, name: str, steps, context: dict = None):
+        """
+        add a station and its sequence
+
+        :param      name:     station name
+        :type       name:     str
+        :param      steps:    Step objects, or (name, action[, resources]) tuples
+        :type       steps:    iterable
+        :param      context:  station specific values passed to every step,
+                              e.g. its own supply
+        :type       context:  dict
+        """
+        sequence = []
+        for step in steps:
+            if not isinstance(step, Step):
+                step = Step(*step)
+            for resource in step.resources:
+                if resource not in self.resources:
+                    raise AttributeError(f'step {step.name} needs unknown resource {resource}')
+            sequence.append(step)
+        self._stations[name] = (sequence, dict(context or {}))
+
+    def _run_station(self, name: str) -> StationReport:
+        sequence, context = self._stations[name]
+        report = StationReport(name)
+        start = time.perf_counter()
+        for step in sequence:
+            leased = []
+            try:
+                step_context = {**context, 'station': name}
+                for resource_name in step.resources:
+                    resource = self.resources[resource_name]
+                    waited = resource.acquire(name)
+                    leased.append(resource)
+                    report.waiting[resource_name] = report.waiting.get(resource_name, 0.0) + waited
+                    step_context[resource_name] = resource.instrument
+                step_start = time.perf_counter()
+                try:
+                    report.results[step.name] = step.action(step_context)
+                except Exception as _e:  # pylint: disable=broad-except
+                    report.errors.append((step.name, _e, traceback.format_exc()))
+                report.busy += time.perf_counter() - step_start
+                report.steps += 1
+            finally:
+                for resource in reversed(leased):
+                    resource.release()
+            if report.errors and not self.continue_on_error:
+                break
+        report.elapsed = time.perf_counter() - start
+        return report
+
+    def run(self) -> dict:
+        """
+        run every station's sequence concurrently
+
+        :returns:   StationReport by station name
+        :rtype:     dict
+        """
+        workers = self.workers or max(len(self._stations), 1)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='station') as pool:
+            futures = {name: pool.submit(self._run_station, name) for name in self._stations}
+            return {name: future.result() for name, future in futures.items()}
+
+    def resource_report(self) -> dict:
+        """
+        utilization of the shared resources so far
+
+        :returns:   per resource busy time, leases and wait time per station
+        :rtype:     dict
+        """
+        return {
+            name: {
+                'busy_s': resource.busy_time,
+                'leases': resource.leases,
+                'wait_s': dict(resource.wait_time),
+            }
+            for name, resource in self.resources.items()
+        }
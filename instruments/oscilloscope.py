@@ -20,15 +20,243 @@
 oscilloscopes
 """
 
+import time
+
 from instruments.instrument import Instrument
+from pyvisa import (InvalidSession)
 
 
 class DS1074Z(Instrument):
     """
     This class describes a Rigol ds1074z scope.
     """
+    # horizontal divisions on screen
+    DIVISIONS = 12
+    SETTINGS = (
+        ('tim:main:scal', 'tim:main:scal?', ':tim:main:scal {value}'),
+        ('tim:main:offs', 'tim:main:offs?', ':tim:main:offs {value}'),
+    ) + tuple(
+        (f'chan{channel}:{name}', f'chan{channel}:{name}?', f':chan{channel}:{name} {{value}}')
+        for channel in (1, 2, 3, 4) for name in ('disp', 'scal', 'offs', 'coup', 'prob')
+    ) + (
+        ('trig:edg:sour', 'trig:edg:sour?', ':trig:edg:sour {value}'),
+        ('trig:edg:lev', 'trig:edg:lev?', ':trig:edg:lev {value}'),
+    )
 
     def __init__(self, **kwargs):
-        super().__init__()
-        pass
+        serial_number = kwargs.get('serial_number', None)
+        tcpip = kwargs.get('include_tcpip', True)
+        resource = kwargs.pop('resource', None)
+        watcher = kwargs.pop('watcher', None)
+        try:
+            kwargs.pop('serial_number')
+            kwargs.pop('include_tcpip')
+        except KeyError:
+            pass
+        super().__init__(**kwargs)
+        # 0, 1, 2 ... as float, grown to the longest waveform fetched
+        self._sample_index = ()
+        if resource:
+            self.attach(resource)
+            if watcher is not None:
+                watcher.watch(self)
+        elif serial_number:
+            self.debug(f'Attempting Connect to {serial_number}', enable=True)
+            self.connect(
+                serial_number=serial_number,
+                include_tcpip=tcpip,
+                watcher=watcher
+            )
+        elif watcher is not None and self.attach_watched(watcher, model='DS1074Z'):
+            self.debug('No Serial Given, attached first DS1074Z of the watcher', enable=True)
+        else:
+            # connect to the first DS1074Z
+            self.debug('No Serial Given, connecting to first DS1074Z', enable=True)
+            devices = self.list_devices()
+            connected = False
+            for device in devices:
+                if device.get('model') == 'DS1074Z':
+                    self.attach(device)
+                    connected = True
+                    break
+            if connected is False:
+                raise InvalidSession(f'Could not connect to {serial_number}')
+
+    @staticmethod
+    def check_channel(channel: int):
+        """
+        make sure channel is ok for ds1074z
+
+        :param      channel:  The channel
+        :type       channel:  int
+        """
+        if 0 < channel < 5:
+            return True
+        raise AttributeError(
+            f'channel must be [1,4] not {channel}'
+        )
+
+    def run(self):
+        """
+        start continuous acquisition
+        """
+        self.write(':run')
+
+    def stop(self):
+        """
+        stop acquisition
+        """
+        self.write(':stop')
+
+    def single(self) -> bool:
+        """
+        arm a single acquisition. *OPC? holds the reply until :sing is
+        processed, so a following wait_for_stop() can't see the STOP of the
+        previous acquisition
+
+        :returns:   True if armed, False on error
+        :rtype:     bool
+        """
+        return self.query(self.compound([':sing', '*opc?'])) is not None
+
+    def trigger_status(self) -> str:
+        """
+        trigger state, one of TD, WAIT, RUN, AUTO or STOP
+
+        :returns:   trigger status
+        :rtype:     str
+        """
+        return self.query(':trig:stat?')
+
+    def wait_for_stop(self, timeout: float = 10.0, poll: float = 0.01) -> bool:
+        """
+        wait for a single acquisition to complete
+
+        :param      timeout:  seconds
+        :type       timeout:  float
+        :param      poll:     seconds between status queries
+        :type       poll:     float
+
+        :returns:   True if stopped, False on timeout
+        :rtype:     bool
+        """
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            status = self.trigger_status()
+            if status is None:
+                return False
+            if 'STOP' in status:
+                return True
+            time.sleep(poll)
+        return False
+
+    def set_timebase(self, scale: float):
+        """
+        Sets the main timebase.
+
+        :param      scale:  seconds per division
+        :type       scale:  float
+        """
+        self.write(f':tim:main:scal {scale:.6e}')
+
+    def set_channel_scale(self, scale: float, channel: int = 1):
+        """
+        Sets the vertical scale of a channel.
+
+        :param      scale:    volts per division
+        :type       scale:    float
+        :param      channel:  The channel
+        :type       channel:  int
+        """
+        self.check_channel(channel)
+        self.write(f':chan{channel}:scal {scale:.6e}')
+
+    def enable_channel(self, channel: int = 1):
+        """
+        show a channel
+
+        :param      channel:  The channel
+        :type       channel:  int
+        """
+        self.check_channel(channel)
+        self.write(f':chan{channel}:disp on')
+
+    def waveform_preamble(self) -> dict:
+        """
+        preamble of the current waveform source
+
+        :returns:   preamble, None on error
+        :rtype:     dict
+        """
+        res = self.query(':wav:pre?')
+        if res is None:
+            return None
+        res = res.split(',')
+        return {
+            'format': int(res[0]),
+            'type': int(res[1]),
+            'points': int(res[2]),
+            'count': int(res[3]),
+            'xincrement': float(res[4]),
+            'xorigin': float(res[5]),
+            'xreference': float(res[6]),
+            'yincrement': float(res[7]),
+            'yorigin': float(res[8]),
+            'yreference': float(res[9]),
+        }
+
+    def fetch_waveform(self, channel: int = 1, pool=None, out: tuple = None) -> tuple:
+        """
+        fetch the on-screen waveform of a channel as byte data
+
+        with a pool and out, a monitor fetching waveforms in a loop allocates
+        nothing per fetch once the pool is warm
+
+        :param      channel:  The channel
+        :type       channel:  int
+        :param      pool:     read the raw bytes into a buffer leased from
+                              this pool instead of a new array per fetch
+        :type       pool:     instruments.buffers.BufferPool
+        :param      out:      (time, volts) float arrays to scale into,
+                              at least as long as the waveform, new arrays
+                              if None
+        :type       out:      tuple
+
+        :returns:   (time, volts) numpy arrays, views of out if given,
+                    None on error
+        :rtype:     tuple
+        """
+        import numpy as np  # pylint: disable=import-outside-toplevel
+        self.check_channel(channel)
+        self.write(f':wav:sour chan{channel}')
+        self.write(':wav:mode norm')
+        self.write(':wav:form byte')
+        preamble = self.waveform_preamble()
+        if preamble is None:
+            return None
+        if pool is None:
+            raw = self.query_binary(':wav:data?', datatype='B', container=np.array)
+        else:
+            raw = self.readinto(':wav:data?', pool)
+        if raw is None:
+            return None
+        points = len(raw)
+        if out is None:
+            seconds, volts = np.empty(points), np.empty(points)
+        elif min(len(out[0]), len(out[1])) < points:
+            if pool is not None:
+                pool.release(raw)
+            raise AttributeError(f'out arrays hold {min(len(out[0]), len(out[1]))} points, need {points}')
+        else:
+            seconds, volts = out[0][:points], out[1][:points]
+        np.subtract(raw, preamble['yorigin'] + preamble['yreference'], out=volts)
+        np.multiply(volts, preamble['yincrement'], out=volts)
+        if len(self._sample_index) < points:
+            self._sample_index = np.arange(points, dtype='f8')
+        np.subtract(self._sample_index[:points], preamble['xreference'], out=seconds)
+        np.multiply(seconds, preamble['xincrement'], out=seconds)
+        np.add(seconds, preamble['xorigin'], out=seconds)
+        if pool is not None:
+            pool.release(raw)
+        return seconds, volts
 
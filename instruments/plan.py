@@ -0,0 +1,211 @@
+#!/usr/bin/env python
+# python 3
+##    @file:    plan.py
+#     @name:    Luke Gary
+#  @company:    RyeEffectsResearch
+#     @date:    2026/10/19
+################################################################################
+# @copyright
+#   Copyright 2020 RyeEffectsResearch as an  unpublished work.
+#   All Rights Reserved.
+#
+# @license The information contained herein is confidential
+#   property of RyeEffectsResearch. The user, copying, transfer or
+#   disclosure of such information is prohibited except
+#   by express written agreement with RyeEffectsResearch.
+################################################################################
+
+"""
+measurement plans compiled to SCPI programs
+
+a plan is a sequence of steps, each an operation of the model's
+PLAN_TEMPLATES with its parameters, e.g. for a KS34465A
+
+    plan = (
+        ('function', {'function': 'curr:dc'}),
+        ('nplc', {'function': 'curr:dc', 'value': 10}),
+        ('samples', {'value': 100}),
+        'read',
+    )
+
+compile_plan() turns it into a Program once per model and plan: a setting
+written again right after itself, with nothing but queries in between, is
+dropped if the value is the same, and a setting written twice in a row
+before anything reads it is sent once with the last value. any other write
+in between keeps both, settings interact (autorange on drops a fixed range,
+output on applies the present voltage) so their order matters. every run
+of writes is compounded with the queries that follow it, so each query
+group costs one round trip. the order of writes and queries is kept, a
+query never moves ahead of a write it could depend on.
+"""
+
+import hashlib
+from functools import lru_cache
+
+
+class Program:
+    """
+    This class describes a compiled measurement plan.
+
+    messages holds (program message, queries in it) pairs, sent in order.
+    """
+    __slots__ = ('model', 'messages', 'commands', 'queries')
+
+    def __init__(self, model: str, messages: tuple, commands: int, queries: int):
+        self.model = model
+        self.messages = messages
+        self.commands = commands
+        self.queries = queries
+
+    def __len__(self):
+        return len(self.messages)
+
+    def __repr__(self):
+        return (
+            f'Program({self.model}: {self.commands} commands, {self.queries} queries, '
+            f'{len(self.messages)} messages)'
+        )
+
+    def run(self, instrument) -> list:
+        """
+        send the program
+
+        :param      instrument:  instrument of the program's model
+        :type       instrument:  Instrument
+
+        :returns:   query responses in plan order, None on error
+        :rtype:     list
+        """
+        responses = []
+        for message, queries in self.messages:
+            if not queries:
+                if instrument.write(message) is None:
+                    return None
+                continue
+            response = instrument.query(message)
+            if response is None:
+                return None
+            parts = instrument.split_response(response)
+            if len(parts) != queries:
+                instrument.debug(f'PLAN Error: {queries} queries, resp( {response} )')
+                return None
+            responses += parts
+        return responses
+
+
+def _normalize(plan) -> tuple:
+    steps = []
+    for step in plan:
+        if isinstance(step, str):
+            operation, params = step, {}
+        else:
+            operation, params = step[0], (step[1] if len(step) > 1 else {})
+        steps.append((operation, tuple(sorted(params.items()))))
+    return tuple(steps)
+
+
+def plan_hash(model: str, plan) -> str:
+    """
+    stable digest of a plan, e.g. to name stored results after it
+
+    :param      model:  The model
+    :type       model:  str
+    :param      plan:   The plan
+    :type       plan:   iterable
+
+    :returns:   sha1 hex digest
+    :rtype:     str
+    """
+    return hashlib.sha1(repr((model, _normalize(plan))).encode()).hexdigest()
+
+
+def _is_query(command: str) -> bool:
+    return command.split(None, 1)[0].endswith('?')
+
+
+@lru_cache(maxsize=256)
+def _compile(instrument_class, steps: tuple, max_commands: int) -> Program:
+    templates = instrument_class.PLAN_TEMPLATES
+    commands = []
+    for operation, params in steps:
+        try:
+            template = templates[operation]
+        except KeyError:
+            raise AttributeError(
+                f'{instrument_class.__name__} has no plan operation {operation!r}, '
+                f'has {sorted(templates)}'
+            ) from None
+        params = dict(params)
+        try:
+            command = template.format(**params)
+        except KeyError as _e:
+            raise AttributeError(f'plan operation {operation!r} needs {_e}') from None
+        if '{value}' in template:
+            # a setting, identified by the operation and its other parameters
+            key = (operation, tuple(item for item in sorted(params.items()) if item[0] != 'value'))
+        else:
+            key = None
+        commands.append((command, key))
+
+    segments = []
+    writes = []
+    queries = []
+    # the last setting written, until an action or another setting follows
+    last = None
+    for command, key in commands:
+        if _is_query(command):
+            queries.append(command)
+            continue
+        if queries:
+            segments.append((writes, queries))
+            writes, queries = [], []
+        if key is None:
+            # an action (conf, *rst, init) may change any setting
+            writes.append((command, None))
+            last = None
+            continue
+        if last == (command, key):
+            continue
+        last = (command, key)
+        if writes and writes[-1][1] == key:
+            # rewritten before anything read it or wrote anything else
+            writes[-1] = (command, key)
+        else:
+            writes.append((command, key))
+    if writes or queries:
+        segments.append((writes, queries))
+
+    messages = []
+    sent = 0
+    for writes, queries in segments:
+        batch = [command for command, _ in writes] + queries
+        first_query = len(batch) - len(queries)
+        for offset in range(0, len(batch), max_commands):
+            message = batch[offset:offset + max_commands]
+            queries_in = max(0, offset + len(message) - max(offset, first_query))
+            messages.append((instrument_class.compound(message), queries_in))
+            sent += len(message)
+    return Program(
+        instrument_class.__name__, tuple(messages), sent,
+        sum(queries for _, queries in messages)
+    )
+
+
+def compile_plan(instrument_class, plan, max_commands: int = 16) -> Program:
+    """
+    compile a plan for a model, cached per model and plan
+
+    :param      instrument_class:  model class, or an instance of it
+    :type       instrument_class:  type
+    :param      plan:              steps, each 'operation' or
+                                   ('operation', {parameters})
+    :type       plan:              iterable
+    :param      max_commands:      commands per program message
+    :type       max_commands:      int
+
+    :returns:   the program
+    :rtype:     Program
+    """
+    if not isinstance(instrument_class, type):
+        instrument_class = type(instrument_class)
+    return _compile(instrument_class, _normalize(plan), max_commands)
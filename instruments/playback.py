@@ -0,0 +1,197 @@
+#!/usr/bin/env python
+# python 3
+##    @file:    playback.py
+#     @name:    Luke Gary
+#  @company:    RyeEffectsResearch
+#     @date:    2026/10/19
+################################################################################
+# @copyright
+#   Copyright 2020 RyeEffectsResearch as an  unpublished work.
+#   All Rights Reserved.
+#
+# @license The information contained herein is confidential
+#   property of RyeEffectsResearch. The user, copying, transfer or
+#   disclosure of such information is prohibited except
+#   by express written agreement with RyeEffectsResearch.
+################################################################################
+
+"""
+voltage/current profile playback on power supplies
+
+steps are issued against absolute deadlines on the monotonic clock, so late
+steps never push the rest of the profile back. profiles that fit a supply's
+built-in timer (DP832) are handed to the instrument instead.
+"""
+
+import time
+
+
+class ProfileReport:
+    """
+    This class describes the timing of one profile playback.
+    """
+    __slots__ = (
+        'mode', 'steps', 'writes', 'skipped', 'dropped', 'lateness', 'duration'
+    )
+
+    def __init__(self, mode, steps, writes=0, skipped=0, dropped=0, lateness=None, duration=0.0):
+        self.mode = mode
+        self.steps = steps
+        self.writes = writes
+        self.skipped = skipped
+        self.dropped = dropped
+        self.lateness = lateness
+        self.duration = duration
+
+    def lateness_stats(self) -> dict:
+        """
+        per-write lateness in seconds, empty for instrument playback
+
+        :returns:   mean, std, p50, p95, p99, max
+        :rtype:     dict
+        """
+        import numpy as np  # pylint: disable=import-outside-toplevel
+        if self.lateness is None or len(self.lateness) == 0:
+            return {}
+        lateness = np.asarray(self.lateness)
+        p50, p95, p99 = np.percentile(lateness, [50, 95, 99])
+        return {
+            'mean': float(lateness.mean()),
+            'std': float(lateness.std()),
+            'p50': float(p50),
+            'p95': float(p95),
+            'p99': float(p99),
+            'max': float(lateness.max()),
+        }
+
+    def __repr__(self):
+        stats = self.lateness_stats()
+        late = f', p95_late={stats["p95"] * 1e3:0.3f}ms, max_late={stats["max"] * 1e3:0.3f}ms' \
+            if stats else ''
+        return (
+            f'ProfileReport(mode={self.mode}, steps={self.steps}, writes={self.writes}, '
+            f'skipped={self.skipped}, dropped={self.dropped}, '
+            f'duration={self.duration:0.3f}s{late})'
+        )
+
+
+def _wait_until(deadline: float, spin: float):
+    remaining = deadline - time.monotonic()
+    if remaining > spin:
+        time.sleep(remaining - spin)
+    while time.monotonic() < deadline:
+        pass
+
+
+def play_profile(supply, profile, channel: int = 1, **kwargs) -> ProfileReport:
+    """
+    Play a time indexed setpoint profile on a supply channel.
+
+    :param      supply:     power supply, e.g. DP832 or U3606B
+    :param      profile:    (N, 2) array of [seconds from start, setpoint],
+                            or a (times, setpoints) pair
+    :param      channel:    supply channel
+    :type       channel:    int
+    :param      quantity:   'voltage' (default) or 'current'
+    :param      tolerance:  skip writes within this of the last written value
+    :param      spin:       busy-wait this many seconds before each deadline
+                            instead of sleeping, default 2 ms
+    :param      catch_up:   drop a step if the next one is already due,
+                            default True
+    :param      offload:    use the supply's built-in timer if the profile
+                            fits, default True
+    :param      current:    current limit for timer playback of a voltage
+                            profile, read from the supply if None
+    :param      hold:       seconds the last step lasts, defaults to the
+                            previous step's dwell
+    :param      wait:       block until the profile has played to its end,
+                            last step's hold included, default True
+
+    :returns:   playback report
+    :rtype:     ProfileReport
+    """
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    quantity = kwargs.get('quantity', 'voltage')
+    tolerance = kwargs.get('tolerance', 0.0)
+    spin = kwargs.get('spin', 0.002)
+    catch_up = kwargs.get('catch_up', True)
+
+    if isinstance(profile, tuple):
+        times = np.asarray(profile[0], dtype=float)
+        setpoints = np.asarray(profile[1], dtype=float)
+    else:
+        profile = np.asarray(profile, dtype=float)
+        times = profile[:, 0]
+        setpoints = profile[:, 1]
+    if len(times) != len(setpoints):
+        raise AttributeError('profile times and setpoints differ in length')
+    if len(times) > 1 and np.any(np.diff(times) < 0):
+        raise AttributeError('profile times must be non-decreasing')
+
+    if kwargs.get('offload', True) and quantity == 'voltage' and len(times) > 1:
+        report = _play_on_instrument(supply, times, setpoints, channel, kwargs)
+        if report is not None:
+            return report
+
+    setter = getattr(supply, f'set_output_{quantity}')
+    lateness = np.empty(len(times))
+    writes = 0
+    skipped = 0
+    dropped = 0
+    last = None
+    start = time.monotonic()
+    deadlines = start + (times - times[0])
+    for index, (deadline, value) in enumerate(zip(deadlines.tolist(), setpoints.tolist())):
+        if last is not None and abs(value - last) <= tolerance:
+            skipped += 1
+            continue
+        if catch_up and index + 1 < len(deadlines) and time.monotonic() >= deadlines[index + 1]:
+            dropped += 1
+            continue
+        _wait_until(deadline, spin)
+        lateness[writes] = time.monotonic() - deadline
+        setter(value, channel=channel, verify=False)
+        writes += 1
+        last = value
+    if kwargs.get('wait', True):
+        # finished like timer playback is, once the last step's hold is over
+        _wait_until(deadlines[-1] + _hold(times, kwargs), spin)
+
+    return ProfileReport(
+        'host', len(times), writes, skipped, dropped,
+        lateness[:writes], time.monotonic() - start
+    )
+
+
+def _hold(times, kwargs) -> float:
+    if 'hold' in kwargs:
+        return float(kwargs['hold'])
+    return float(times[-1] - times[-2]) if len(times) > 1 else 0.0
+
+
+def _play_on_instrument(supply, times, setpoints, channel, kwargs) -> ProfileReport:
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    if not hasattr(supply, 'load_timer_sequence'):
+        return None
+    dwell = np.append(np.diff(times), _hold(times, kwargs))
+    if not supply.timer_sequence_fits(dwell.tolist()):
+        return None
+
+    current = kwargs.get('current', None)
+    if current is None:
+        current = supply.query(f'SOUR{channel}:CURR?')
+        if current is None:
+            return None
+        current = float(current)
+    start = time.monotonic()
+    if not supply.load_timer_sequence(
+            setpoints.tolist(), [current] * len(setpoints), dwell.tolist(), channel=channel):
+        return None
+    supply.start_timer(channel=channel)
+    if kwargs.get('wait', True):
+        _wait_until(time.monotonic() + float(dwell.sum()), 0.0)
+    return ProfileReport(
+        'instrument', len(times), len(times), duration=time.monotonic() - start
+    )
@@ -19,8 +19,11 @@
 """
 power supply interfaces
 """
+import time
+
 from instruments.instrument import Instrument
-from instruments.multi_function import U3606B
+from instruments.records import PowerReading
+from instruments.registry import get_model_class
 from pyvisa import (VisaIOError, VisaIOWarning, InvalidSession)
 
 def connect_to_power_supply(model: str, supply_serial: str = None, tcpip: bool = False) -> object:
@@ -35,13 +38,8 @@ def connect_to_power_supply(model: str, supply_serial: str = None, tcpip: bool =
     :returns:   power supply object if model is valid, None if not
     :rtype:     object
     """
-    power_supply_models = {
-        'U3606B': U3606B,
-        'DP832': DP832,
-    }
-
     power_supply_obj = None
-    power_supply = power_supply_models.get(model, None)
+    power_supply = get_model_class(model, kind='power_supply')
     if power_supply:
         try:
             power_supply_obj = power_supply(
@@ -58,21 +56,60 @@ class DP832(Instrument):
     """
     This class describes a rigol dp832.
     """
+    # on-instrument timer limits, see the DP800 programming guide :TIMEr
+    TIMER_MAX_GROUPS = 2048
+    TIMER_MIN_DWELL = 1
+    TIMER_MAX_DWELL = 99999
+    # on-instrument recorder limits, see :RECorder
+    RECORDER_MIN_PERIOD = 1
+    RECORDER_MAX_PERIOD = 99999
+    # outputs last, so setpoints are restored before a channel turns on
+    SETTINGS = tuple(
+        (f'ch{channel}:{name}', f'sour{channel}:{name}?', f'sour{channel}:{name} {{value}}')
+        for channel in (1, 2, 3) for name in ('volt', 'curr', 'volt:prot', 'curr:prot')
+    ) + tuple(
+        (f'ch{channel}:outp', f'outp? ch{channel}', f'outp ch{channel},{{value}}')
+        for channel in (1, 2, 3)
+    )
+    PLAN_TEMPLATES = {
+        'volt': 'sour{channel}:volt {value}',
+        'curr': 'sour{channel}:curr {value}',
+        'output': 'outp ch{channel},{value}',
+        'measure_volts': 'meas? ch{channel}',
+        'measure_amps': 'meas:curr? ch{channel}',
+        'measure_watts': 'meas:powe? ch{channel}',
+        'measure_all': 'meas:all:dc? ch{channel}',
+    }
+    # one meas:all reads all three at the same instant
+    PRIMITIVES = {
+        'volts': ('meas:all:dc? ch{channel}', 0),
+        'amps': ('meas:all:dc? ch{channel}', 1),
+        'watts': ('meas:all:dc? ch{channel}', 2),
+    }
     def __init__(self, **kwargs):
         serial_number = kwargs.get('serial_number', None)
         tcpip = kwargs.get('include_tcpip', True)
+        resource = kwargs.pop('resource', None)
+        watcher = kwargs.pop('watcher', None)
         try:
             kwargs.pop('serial_number')
             kwargs.pop('include_tcpip')
         except KeyError:
             pass
         super().__init__(**kwargs)
-        if serial_number:
+        if resource:
+            self.attach(resource)
+            if watcher is not None:
+                watcher.watch(self)
+        elif serial_number:
             self.debug(f'Attempting Connect to {serial_number}', enable=True)
             self.connect(
                 serial_number=serial_number,
-                include_tcpip=tcpip
+                include_tcpip=tcpip,
+                watcher=watcher
             )
+        elif watcher is not None and self.attach_watched(watcher, model='DP832'):
+            self.debug('No Serial Given, attached first DP832 of the watcher', enable=True)
         else:
             # connect to the first DP832
             self.debug('No Serial Given, connecting to first DP832', enable=True)
@@ -81,10 +118,7 @@ class DP832(Instrument):
             self.debug(devices)
             for device in devices:
                 if device.get('model') == 'DP832':
-                    self.connect(
-                        serial_number=device.get('serial_number'),
-                        include_tcpip=kwargs.get('include_tcpip', True)
-                    )
+                    self.attach(device)
                     connected = True
                     break
             if connected is False:
@@ -104,28 +138,22 @@ class DP832(Instrument):
             f'channel must be [1,3] not {channel}'
         )
 
-    def measure_all(self, channel: int = 1) -> dict:
+    def measure_all(self, channel: int = 1) -> PowerReading:
         """
         measure P,I,V from channel
 
         :param      channel:   cahnnel number
         :type       channel:   int
 
-        :returns:   measurement dict
-        :rtype:     dict
+        :returns:   measurement record, reading['volts'] etc. still works
+        :rtype:     PowerReading
         """
         ret = None
         if self.check_channel(channel):
             res = self.query(f'meas:all:dc? ch{channel}')
             if res is None:
                 return ret
-
-            res = res.replace('\n', '')
-            res = res.split(',')
-            ret = {}
-            ret['volts'] = res[0]
-            ret['amps'] = res[1]
-            ret['watts'] = res[2]
+            ret = PowerReading.parse(res, channel, time.time())
         return ret
 
     def measure_source_current(self, channel: int = 1) -> float:
@@ -176,7 +204,7 @@ class DP832(Instrument):
         self.debug(f'Measurement Error')
         return res
 
-    def set_output_current(self, current: float, channel: int = 1):
+    def set_output_current(self, current: float, channel: int = 1, verify: bool = None):
         """
         Sets the output current.
 
@@ -184,13 +212,20 @@ class DP832(Instrument):
         :type       current:  float
         :param      channel:  The channel
         :type       channel:  int
+        :param      verify:   read the setpoint back, costs a round trip. None
+                              verifies unless an error policy is set
+        :type       verify:   bool
         """
         self.write(f'SOUR{channel}:CURR {current}')
+        if verify is None:
+            verify = self.error_policy is None
+        if not verify:
+            return
         res = self.query(f'SOUR{channel}:CURR?')
         if float(res) != float(current):
             print(f'Error in Setting Current! sent {current}, recv {res}')
 
-    def set_output_voltage(self, voltage: float, channel: int = 1):
+    def set_output_voltage(self, voltage: float, channel: int = 1, verify: bool = None):
         """
         Sets the output voltage.
 
@@ -198,8 +233,15 @@ class DP832(Instrument):
         :type       voltage:  float
         :param      channel:  The channel
         :type       channel:  int
+        :param      verify:   read the setpoint back, costs a round trip. None
+                              verifies unless an error policy is set
+        :type       verify:   bool
         """
         self.write(f'SOUR{channel}:VOLT {voltage}')
+        if verify is None:
+            verify = self.error_policy is None
+        if not verify:
+            return
         res = self.query(f'SOUR{channel}:VOLT?')
         if float(res) != float(voltage):
             print(f'Error in Setting Voltage! sent {voltage}, recv {res}')
@@ -235,3 +277,138 @@ class DP832(Instrument):
         if 'OFF' in res:
             return True
         return False
+
+    def timer_sequence_fits(self, dwell_times) -> bool:
+        """
+        check if a sequence can run on the built-in timer, which takes whole
+        second dwell times
+
+        :param      dwell_times:  seconds per step
+        :type       dwell_times:  iterable of float
+
+        :returns:   True if the timer can play it
+        :rtype:     bool
+        """
+        dwell_times = list(dwell_times)
+        if not 0 < len(dwell_times) <= self.TIMER_MAX_GROUPS:
+            return False
+        for dwell in dwell_times:
+            if dwell != round(dwell):
+                return False
+            if not self.TIMER_MIN_DWELL <= dwell <= self.TIMER_MAX_DWELL:
+                return False
+        return True
+
+    def load_timer_sequence(self, voltages, currents, dwell_times, channel: int = 1,
+                            cycles: int = 1, end_state: str = 'LAST') -> bool:
+        """
+        program the built-in timer of a channel
+
+        :param      voltages:     voltage per step
+        :type       voltages:     iterable of float
+        :param      currents:     current limit per step
+        :type       currents:     iterable of float
+        :param      dwell_times:  seconds per step, whole seconds
+        :type       dwell_times:  iterable of float
+        :param      channel:      The channel
+        :type       channel:      int
+        :param      cycles:       repetitions, 0 repeats forever
+        :type       cycles:       int
+        :param      end_state:    'LAST' holds the last step, 'OFF' disables
+        :type       end_state:    str
+
+        :returns:   True if loaded, False if the sequence does not fit
+        :rtype:     bool
+        """
+        self.check_channel(channel)
+        voltages = list(voltages)
+        currents = list(currents)
+        dwell_times = list(dwell_times)
+        if not len(voltages) == len(currents) == len(dwell_times):
+            raise AttributeError('voltages, currents and dwell_times differ in length')
+        if not self.timer_sequence_fits(dwell_times):
+            return False
+        self.write(f'inst:nsel {channel}')
+        self.write('tim off')
+        self.write(f'tim:grou {len(voltages)}')
+        for group, (volts, amps, dwell) in enumerate(zip(voltages, currents, dwell_times)):
+            self.write(f'tim:para {group},{volts:.3f},{amps:.3f},{int(dwell)}')
+        if cycles:
+            self.write(f'tim:cycl N,{cycles}')
+        else:
+            self.write('tim:cycl I')
+        self.write(f'tim:ends {end_state}')
+        return True
+
+    def start_timer(self, channel: int = 1):
+        """
+        start the built-in timer of a channel
+
+        :param      channel:  The channel
+        :type       channel:  int
+        """
+        self.check_channel(channel)
+        self.write(f'inst:nsel {channel}')
+        self.write('tim on')
+
+    def stop_timer(self, channel: int = 1):
+        """
+        stop the built-in timer of a channel
+
+        :param      channel:  The channel
+        :type       channel:  int
+        """
+        self.check_channel(channel)
+        self.write(f'inst:nsel {channel}')
+        self.write('tim off')
+
+    def configure_recorder(self, period: int, destination: str = None):
+        """
+        configure the built-in recorder, which logs V/I of all channels
+        without host polling. the records go to a file on the instrument or
+        a USB stick, SCPI can't read them back or set the record length
+
+        :param      period:       seconds between records, whole seconds
+        :type       period:       int
+        :param      destination:  record file on the instrument, e.g.
+                                  'C:\\REC1.ROF', the current one if None
+        :type       destination:  str
+        """
+        if period != round(period) or \
+                not self.RECORDER_MIN_PERIOD <= period <= self.RECORDER_MAX_PERIOD:
+            raise AttributeError(
+                f'period must be whole seconds in [{self.RECORDER_MIN_PERIOD},'
+                f'{self.RECORDER_MAX_PERIOD}] not {period}'
+            )
+        self.write('rec off')
+        self.write(f'rec:per {int(period)}')
+        if destination is not None:
+            self.write(f'rec:dest {destination}')
+
+    def start_recorder(self) -> float:
+        """
+        start the built-in recorder
+
+        :returns:   unix seconds of the start, first record's timestamp
+        :rtype:     float
+        """
+        self.write('rec on')
+        return time.time()
+
+    def stop_recorder(self):
+        """
+        stop the built-in recorder, the record file is closed
+        """
+        self.write('rec off')
+
+    def recorder_enabled(self) -> bool:
+        """
+        check if the built-in recorder is running
+
+        :returns:   True if recording, None on error
+        :rtype:     bool
+        """
+        res = self.query('rec?')
+        if res is None:
+            return None
+        return res.strip().upper() in ('ON', '1')
@@ -0,0 +1,452 @@
+#!/usr/bin/env python
+# python 3
+#pylint: disable=import-error
+##    @file:    recording.py
+#     @name:    Luke Gary
+#  @company:    RyeEffectsResearch
+#     @date:    2026/10/19
+################################################################################
+# @copyright
+#   Copyright 2020 RyeEffectsResearch as an  unpublished work.
+#   All Rights Reserved.
+#
+# @license The information contained herein is confidential
+#   property of RyeEffectsResearch. The user, copying, transfer or
+#   disclosure of such information is prohibited except
+#   by express written agreement with RyeEffectsResearch.
+################################################################################
+
+"""
+SCPI session record/replay
+
+RecordingSession wraps an open pyvisa resource and appends every transaction
+to a file. ReplaySession reads that file back and stands in for the resource,
+so a recorded workload can be re-run and profiled without the hardware.
+
+file layout, little endian:
+    b'SCPIREC' + version byte
+    records of <op:u8> <status:u8> <start:f64> <duration:f32>
+               <command length:u32> <payload length:u32> <command> <payload>
+
+start is seconds since the recording was opened. binary values are stored as
+IEEE 488.2 definite length blocks. reads of last_status are recorded too, a
+block read decides from it whether the message terminator is still pending,
+so the replay has to take the same path.
+"""
+
+import struct
+import time
+
+from pyvisa import (VisaIOError, InvalidSession)
+from pyvisa.constants import StatusCode
+from pyvisa.util import (from_ieee_block, to_ieee_block)
+
+MAGIC = b'SCPIREC\x01'
+
+_RECORD = struct.Struct('<BBdfII')
+
+# transaction types
+OP_META = 0
+OP_QUERY = 1
+OP_WRITE = 2
+OP_READ = 3
+OP_READ_RAW = 4
+OP_WRITE_RAW = 5
+OP_READ_BYTES = 6
+OP_QUERY_BINARY = 7
+OP_READ_BINARY = 8
+OP_STATUS = 9
+
+# record status
+STATUS_OK = 0
+STATUS_VISA_ERROR = 1
+STATUS_INVALID_SESSION = 2
+
+
+class ReplayMismatch(Exception):
+    """
+    replayed traffic diverged from the recording
+    """
+
+
+def _encode(value) -> bytes:
+    if isinstance(value, bytes):
+        return value
+    if value is None:
+        return b''
+    return str(value).encode('utf-8', 'surrogateescape')
+
+
+def read_records(path: str) -> list:
+    """
+    load every record of a recording
+
+    :param      path:  The path
+    :type       path:  str
+
+    :returns:   (op, status, start, duration, command, payload) tuples
+    :rtype:     list
+    """
+    with open(path, 'rb') as _file:
+        data = _file.read()
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError(f'{path} is not a SCPI recording')
+    records = []
+    offset = len(MAGIC)
+    size = _RECORD.size
+    while offset + size <= len(data):
+        op, status, start, duration, cmd_len, payload_len = _RECORD.unpack_from(data, offset)
+        offset += size
+        if offset + cmd_len + payload_len > len(data):
+            # truncated tail, e.g. the recording process was killed
+            break
+        command = data[offset:offset + cmd_len]
+        offset += cmd_len
+        payload = data[offset:offset + payload_len]
+        offset += payload_len
+        records.append((op, status, start, duration, command, payload))
+    return records
+
+
+class RecordingSession:
+    """
+    This class describes a pass-through pyvisa resource that records traffic.
+    """
+    def __init__(self, device, path: str, idn: dict = None):
+        """
+        constructor
+
+        :param      device:  open pyvisa resource
+        :param      path:    recording file, appended to if it exists
+        :type       path:    str
+        :param      idn:     idn dictionary stored as metadata for replay
+        :type       idn:     dict
+        """
+        self.device = device
+        self.path = path
+        self._file = open(path, 'ab')  # pylint: disable=consider-using-with
+        if self._file.tell() == 0:
+            self._file.write(MAGIC)
+        self._origin = time.perf_counter()
+        if idn:
+            fields = ('manufacturer', 'model', 'serial_number', 'version')
+            self._record(
+                OP_META, STATUS_OK, 0.0, 0.0, b'idn',
+                ','.join(str(idn.get(field, '')) for field in fields)
+            )
+
+    def __getattr__(self, name):
+        # attributes that are not recorded go straight to the resource
+        return getattr(self.device, name)
+
+    def _record(self, op, status, start, duration, command, payload):
+        command = _encode(command)
+        payload = _encode(payload)
+        self._file.write(
+            _RECORD.pack(
+                op, status, start - self._origin if op != OP_META else start,
+                duration, len(command), len(payload)
+            ) + command + payload
+        )
+        self._file.flush()
+
+    def _call(self, op, command, function, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = function(*args, **kwargs)
+        except VisaIOError as _e:
+            self._record(
+                op, STATUS_VISA_ERROR, start, time.perf_counter() - start,
+                command, str(_e.error_code)
+            )
+            raise
+        except InvalidSession:
+            self._record(
+                op, STATUS_INVALID_SESSION, start, time.perf_counter() - start,
+                command, b''
+            )
+            raise
+        return start, time.perf_counter() - start, response
+
+    def query(self, message: str, *args, **kwargs) -> str:
+        """ recorded query """
+        start, duration, response = self._call(
+            OP_QUERY, message, self.device.query, message, *args, **kwargs
+        )
+        self._record(OP_QUERY, STATUS_OK, start, duration, message, response)
+        return response
+
+    def write(self, message: str, *args, **kwargs) -> int:
+        """ recorded write """
+        start, duration, response = self._call(
+            OP_WRITE, message, self.device.write, message, *args, **kwargs
+        )
+        self._record(OP_WRITE, STATUS_OK, start, duration, message, response)
+        return response
+
+    def read(self, *args, **kwargs) -> str:
+        """ recorded read """
+        start, duration, response = self._call(
+            OP_READ, b'', self.device.read, *args, **kwargs
+        )
+        self._record(OP_READ, STATUS_OK, start, duration, b'', response)
+        return response
+
+    def read_raw(self, *args, **kwargs) -> bytes:
+        """ recorded raw read """
+        start, duration, response = self._call(
+            OP_READ_RAW, b'', self.device.read_raw, *args, **kwargs
+        )
+        self._record(OP_READ_RAW, STATUS_OK, start, duration, b'', response)
+        return response
+
+    def write_raw(self, message: bytes) -> int:
+        """ recorded raw write """
+        start, duration, response = self._call(
+            OP_WRITE_RAW, message, self.device.write_raw, message
+        )
+        self._record(OP_WRITE_RAW, STATUS_OK, start, duration, message, response)
+        return response
+
+    def read_bytes(self, count: int, *args, **kwargs) -> bytes:
+        """ recorded fixed length read """
+        start, duration, response = self._call(
+            OP_READ_BYTES, str(count), self.device.read_bytes, count, *args, **kwargs
+        )
+        self._record(OP_READ_BYTES, STATUS_OK, start, duration, str(count), response)
+        return response
+
+    @property
+    def last_status(self):
+        """ recorded status of the last operation, None if not reported """
+        start = time.perf_counter()
+        status = getattr(self.device, 'last_status', None)
+        self._record(
+            OP_STATUS, STATUS_OK, start, time.perf_counter() - start, b'',
+            b'' if status is None else str(int(status))
+        )
+        return status
+
+    def query_binary_values(self, message: str, datatype: str = 'f',
+                            is_big_endian: bool = False, **kwargs):
+        """ recorded binary block query, values are stored as an ieee block """
+        start, duration, response = self._call(
+            OP_QUERY_BINARY, message, self.device.query_binary_values, message,
+            datatype=datatype, is_big_endian=is_big_endian, **kwargs
+        )
+        self._record(
+            OP_QUERY_BINARY, STATUS_OK, start, duration, message,
+            to_ieee_block(response, datatype, is_big_endian)
+        )
+        return response
+
+    def read_binary_values(self, datatype: str = 'f', is_big_endian: bool = False, **kwargs):
+        """ recorded binary block read, values are stored as an ieee block """
+        start, duration, response = self._call(
+            OP_READ_BINARY, b'', self.device.read_binary_values,
+            datatype=datatype, is_big_endian=is_big_endian, **kwargs
+        )
+        self._record(
+            OP_READ_BINARY, STATUS_OK, start, duration, b'',
+            to_ieee_block(response, datatype, is_big_endian)
+        )
+        return response
+
+    def stop(self):
+        """
+        stop recording, the resource stays open
+        """
+        if not self._file.closed:
+            self._file.close()
+
+    def close(self):
+        """
+        close the resource and the recording
+        """
+        self.stop()
+        self.device.close()
+
+
+class ReplaySession:
+    """
+    This class describes a stand-in resource that serves a recording.
+    """
+    def __init__(self, path: str, speed: float = 0.0, strict: bool = True):
+        """
+        constructor
+
+        :param      path:    recording file
+        :type       path:    str
+        :param      speed:   1.0 replays at the recorded instrument latency,
+                             0.0 as fast as possible
+        :type       speed:   float
+        :param      strict:  raise ReplayMismatch if a command differs from
+                             the recording, otherwise only the type is checked
+        :type       strict:  bool
+        """
+        self.path = path
+        self.speed = speed
+        self.strict = strict
+        self.session = 0
+        self.timeout = None
+        self.read_termination = None
+        self.write_termination = None
+        self.idn = {}
+        self._records = []
+        for record in read_records(path):
+            if record[0] == OP_META:
+                if record[4] == b'idn':
+                    fields = record[5].decode('utf-8', 'surrogateescape').split(',')
+                    self.idn = dict(
+                        zip(('manufacturer', 'model', 'serial_number', 'version'), fields)
+                    )
+            else:
+                self._records.append(record)
+        self._cursor = 0
+        self._closed = False
+
+    def __str__(self):
+        return f'ReplaySession at REPLAY::{self.path}'
+
+    def __len__(self):
+        return len(self._records)
+
+    @property
+    def remaining(self) -> int:
+        """ number of transactions not replayed yet """
+        return len(self._records) - self._cursor
+
+    def rewind(self):
+        """
+        start over from the first transaction
+        """
+        self._cursor = 0
+
+    def resource(self) -> dict:
+        """
+        idn dictionary for Instrument.attach() / the model classes' resource=
+
+        :returns:   idn dictionary
+        :rtype:     dict
+        """
+        return {
+            **self.idn,
+            **{
+                'interface': 'REPLAY',
+                'device': self
+            }
+        }
+
+    def _next(self, op, command=None):
+        if self._closed:
+            raise InvalidSession()
+        if self._cursor >= len(self._records):
+            raise ReplayMismatch(f'recording exhausted, got op {op} {command!r}')
+        record = self._records[self._cursor]
+        if record[0] != op or (
+                self.strict and command is not None and record[4] != _encode(command)):
+            raise ReplayMismatch(
+                f'transaction {self._cursor}: expected op {record[0]} {record[4]!r}, '
+                f'got op {op} {command!r}'
+            )
+        self._cursor += 1
+        if self.speed > 0.0:
+            time.sleep(record[3] * self.speed)
+        if record[1] == STATUS_VISA_ERROR:
+            raise VisaIOError(int(record[5]))
+        if record[1] == STATUS_INVALID_SESSION:
+            raise InvalidSession()
+        return record[5]
+
+    @staticmethod
+    def _count(payload: bytes) -> int:
+        return int(payload) if payload else 0
+
+    def query(self, message: str, *args, **kwargs) -> str:
+        """ replayed query """
+        del args, kwargs
+        return self._next(OP_QUERY, message).decode('utf-8', 'surrogateescape')
+
+    def write(self, message: str, *args, **kwargs) -> int:
+        """ replayed write """
+        del args, kwargs
+        return self._count(self._next(OP_WRITE, message))
+
+    def read(self, *args, **kwargs) -> str:
+        """ replayed read """
+        del args, kwargs
+        return self._next(OP_READ).decode('utf-8', 'surrogateescape')
+
+    def read_raw(self, *args, **kwargs) -> bytes:
+        """ replayed raw read """
+        del args, kwargs
+        return self._next(OP_READ_RAW)
+
+    def write_raw(self, message: bytes) -> int:
+        """ replayed raw write """
+        return self._count(self._next(OP_WRITE_RAW, message))
+
+    def read_bytes(self, count: int, *args, **kwargs) -> bytes:
+        """ replayed fixed length read """
+        del args, kwargs
+        return self._next(OP_READ_BYTES, str(count))
+
+    @property
+    def last_status(self):
+        """ replayed status of the last operation """
+        payload = self._next(OP_STATUS)
+        if not payload:
+            return None
+        return StatusCode(int(payload))
+
+    def query_binary_values(self, message: str, datatype: str = 'f',
+                            is_big_endian: bool = False, container=list, **kwargs):
+        """ replayed binary block query """
+        del kwargs
+        return from_ieee_block(
+            self._next(OP_QUERY_BINARY, message), datatype, is_big_endian, container
+        )
+
+    def read_binary_values(self, datatype: str = 'f', is_big_endian: bool = False,
+                           container=list, **kwargs):
+        """ replayed binary block read """
+        del kwargs
+        return from_ieee_block(
+            self._next(OP_READ_BINARY), datatype, is_big_endian, container
+        )
+
+    def before_close(self):
+        """ pyvisa resource interface """
+
+    def close(self):
+        """ pyvisa resource interface """
+        self._closed = True
+
+
+def open_replay(path: str, speed: float = 0.0, strict: bool = True, debug: bool = False):
+    """
+    Build an instrument of the recorded model that is served by a recording.
+
+    :param      path:    recording file
+    :type       path:    str
+    :param      speed:   replay speed, see ReplaySession
+    :type       speed:   float
+    :param      strict:  check commands against the recording
+    :type       strict:  bool
+    :param      debug:   instrument debug flag
+    :type       debug:   bool
+
+    :returns:   instrument instance, a plain Instrument if the model is unknown
+    :rtype:     Instrument
+    """
+    # pylint: disable=import-outside-toplevel
+    from instruments.instrument import Instrument
+    from instruments.registry import get_model_class
+
+    session = ReplaySession(path, speed=speed, strict=strict)
+    instrument_class = get_model_class(session.idn.get('model', ''))
+    if instrument_class is None:
+        instrument = Instrument(debug=debug)
+        instrument.attach(session.resource())
+        return instrument
+    return instrument_class(resource=session.resource(), debug=debug)
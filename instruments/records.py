@@ -0,0 +1,248 @@
+#!/usr/bin/env python
+# python 3
+##    @file:    records.py
+#     @name:    Luke Gary
+#  @company:    RyeEffectsResearch
+#     @date:    2026/10/19
+################################################################################
+# @copyright
+#   Copyright 2020 RyeEffectsResearch as an  unpublished work.
+#   All Rights Reserved.
+#
+# @license The information contained herein is confidential
+#   property of RyeEffectsResearch. The user, copying, transfer or
+#   disclosure of such information is prohibited except
+#   by express written agreement with RyeEffectsResearch.
+################################################################################
+
+"""
+compact measurement and device records
+
+single readings are __slots__ classes, batches are numpy structured arrays
+(see ReadingBuffer). the records keep item access, so code written against
+the old dictionaries (reading['volts'], device.get('model')) still works.
+"""
+
+# numpy is only imported by the batch helpers, single records don't need it
+READING_FIELDS = (('time', 'f8'), ('value', 'f8'), ('channel', 'u1'))
+POWER_FIELDS = (
+    ('time', 'f8'), ('volts', 'f8'), ('amps', 'f8'), ('watts', 'f8'), ('channel', 'u1')
+)
+
+
+class _Record:
+    """
+    mapping style access to the slots of a record
+    """
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key, default=None):
+        """ dict.get() """
+        return getattr(self, key, default)
+
+    def keys(self) -> tuple:
+        """ field names """
+        return self.__slots__
+
+    def as_dict(self) -> dict:
+        """ plain dictionary copy """
+        return {key: getattr(self, key) for key in self.__slots__}
+
+    def __iter__(self):
+        return iter(self.__slots__)
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, key) == getattr(other, key) for key in self.__slots__)
+
+    def __repr__(self):
+        fields = ', '.join(f'{key}={getattr(self, key)!r}' for key in self.__slots__)
+        return f'{type(self).__name__}({fields})'
+
+
+class PowerReading(_Record):
+    """
+    This class describes one V/I/P reading of a source channel.
+    """
+    __slots__ = ('volts', 'amps', 'watts', 'channel', 'time')
+
+    def __init__(self, volts: float, amps: float, watts: float, channel: int = 1, time: float = 0.0):  # pylint: disable=too-many-arguments
+        self.volts = volts
+        self.amps = amps
+        self.watts = watts
+        self.channel = channel
+        self.time = time
+
+    @classmethod
+    def parse(cls, response: str, channel: int = 1, time: float = 0.0):
+        """
+        parse a 'volts,amps,watts' response
+
+        :param      response:  The response
+        :type       response:  str
+        :param      channel:   The channel
+        :type       channel:   int
+        :param      time:      unix seconds
+        :type       time:      float
+
+        :returns:   reading, None if the response is malformed
+        :rtype:     PowerReading
+        """
+        values = response.split(',')
+        if len(values) < 3:
+            return None
+        try:
+            return cls(float(values[0]), float(values[1]), float(values[2]), channel, time)
+        except ValueError:
+            return None
+
+    def as_tuple(self) -> tuple:
+        """ row in POWER_FIELDS order """
+        return (self.time, self.volts, self.amps, self.watts, self.channel)
+
+
+class DeviceInfo(_Record):
+    """
+    This class describes an identified VISA resource.
+
+    device is the open session when the resource was kept open by
+    list_devices(keep_open=True), None otherwise.
+    """
+    __slots__ = (
+        'manufacturer', 'model', 'serial_number', 'version',
+        'interface', 'resource_name', 'device'
+    )
+
+    def __init__(self, manufacturer: str = '', model: str = '', serial_number: str = '',  # pylint: disable=too-many-arguments
+                 version: str = '', interface: str = '', resource_name: str = '',
+                 device=None):
+        self.manufacturer = manufacturer
+        self.model = model
+        self.serial_number = serial_number
+        self.version = version
+        self.interface = interface
+        self.resource_name = resource_name
+        self.device = device
+
+
+class ReadingBuffer:
+    """
+    This class describes a growable numpy structured array of readings.
+
+    view() returns the filled part without copying, so bulk consumers can
+    work on the array directly.
+    """
+    def __init__(self, fields=READING_FIELDS, capacity: int = 1024):
+        """
+        constructor
+
+        :param      fields:    (name, dtype) pairs, e.g. POWER_FIELDS
+        :type       fields:    tuple
+        :param      capacity:  initial rows
+        :type       capacity:  int
+        """
+        import numpy as np  # pylint: disable=import-outside-toplevel
+        self.dtype = np.dtype(list(fields))
+        self._data = np.empty(max(capacity, 1), dtype=self.dtype)
+        self._length = 0
+
+    def __len__(self):
+        return self._length
+
+    def __array__(self, dtype=None, copy=None):
+        del copy
+        if dtype is None:
+            return self.view()
+        return self.view().astype(dtype)
+
+    @property
+    def capacity(self) -> int:
+        """ rows allocated """
+        return len(self._data)
+
+    def _reserve(self, rows: int):
+        import numpy as np  # pylint: disable=import-outside-toplevel
+        if self._length + rows <= len(self._data):
+            return
+        capacity = len(self._data)
+        while capacity < self._length + rows:
+            capacity *= 2
+        data = np.empty(capacity, dtype=self.dtype)
+        data[:self._length] = self._data[:self._length]
+        self._data = data
+
+    def append(self, *row):
+        """
+        append one row, fields in dtype order
+
+        :param      row:  field values
+        """
+        self._reserve(1)
+        self._data[self._length] = row
+        self._length += 1
+
+    def append_record(self, record):
+        """
+        append a record, e.g. a PowerReading into a POWER_FIELDS buffer
+
+        :param      record:  record with an attribute per field
+        """
+        if record is None:
+            return
+        self.append(*(getattr(record, name) for name in self.dtype.names))
+
+    def extend(self, rows):
+        """
+        append a structured array or sequence of rows
+
+        :param      rows:  rows
+        """
+        import numpy as np  # pylint: disable=import-outside-toplevel
+        rows = np.asarray(rows, dtype=self.dtype) if not isinstance(rows, np.ndarray) \
+            else rows.astype(self.dtype, copy=False)
+        self._reserve(len(rows))
+        self._data[self._length:self._length + len(rows)] = rows
+        self._length += len(rows)
+
+    def view(self):
+        """
+        filled rows, a view into the buffer. it stays valid until the buffer
+        grows or is cleared.
+
+        :returns:   structured array
+        :rtype:     numpy.ndarray
+        """
+        return self._data[:self._length]
+
+    def clear(self):
+        """
+        drop all rows, keeping the allocation
+        """
+        self._length = 0
+
+
+def to_array(records, fields=POWER_FIELDS):
+    """
+    pack records into a structured array
+
+    :param      records:  records with an attribute per field
+    :type       records:  iterable
+    :param      fields:   (name, dtype) pairs
+    :type       fields:   tuple
+
+    :returns:   structured array
+    :rtype:     numpy.ndarray
+    """
+    import numpy as np  # pylint: disable=import-outside-toplevel
+    dtype = np.dtype(list(fields))
+    return np.array(
+        [tuple(getattr(record, name) for name in dtype.names) for record in records if record is not None],
+        dtype=dtype
+    )
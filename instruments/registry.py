@@ -0,0 +1,191 @@
+#!/usr/bin/env python
+# python 3
+##    @file:    registry.py
+#     @name:    Luke Gary
+#  @company:    RyeEffectsResearch
+#     @date:    2026/10/19
+################################################################################
+# @copyright
+#   Copyright 2020 RyeEffectsResearch as an  unpublished work.
+#   All Rights Reserved.
+#
+# @license The information contained herein is confidential
+#   property of RyeEffectsResearch. The user, copying, transfer or
+#   disclosure of such information is prohibited except
+#   by express written agreement with RyeEffectsResearch.
+################################################################################
+
+"""
+instrument model registry
+
+maps IDN model strings to instrument classes without importing them. class
+modules (and pyvisa) are only imported the first time a model is resolved.
+third party packages can add models through the entry point groups below,
+e.g. in their setup.py:
+
+    entry_points={
+        'instruments.multimeter': ['34470A = my_pkg.meters:KS34470A'],
+    }
+"""
+
+import importlib
+
+# entry point group for every registered model, and the per-kind groups
+ENTRY_POINT_GROUP = 'instruments.models'
+KINDS = (
+    'function_generator',
+    'multimeter',
+    'oscilloscope',
+    'power_supply',
+)
+
+
+class ModelEntry:
+    """
+    This class describes a registered instrument model.
+    """
+    __slots__ = ('model', 'target', 'kinds', '_cls')
+
+    def __init__(self, model: str, target, kinds=()):
+        self.model = model
+        self.target = target
+        self.kinds = frozenset(kinds)
+        self._cls = None if isinstance(target, str) else target
+
+    def load(self) -> type:
+        """
+        import and return the instrument class
+
+        :returns:   instrument class
+        :rtype:     type
+        """
+        if self._cls is None:
+            module_name, _, class_name = self.target.partition(':')
+            module = importlib.import_module(module_name)
+            self._cls = getattr(module, class_name)
+        return self._cls
+
+    def __repr__(self):
+        return f'ModelEntry({self.model!r}, {self.target!r}, kinds={sorted(self.kinds)})'
+
+
+# typing is not imported here, it costs more than the rest of the package
+_models = {}
+_entry_points_loaded = False
+
+
+def register_model(model: str, target, kinds=()) -> ModelEntry:
+    """
+    Register an instrument class for a model string.
+
+    :param      model:   IDN model string, e.g. 'DP832'
+    :type       model:   str
+    :param      target:  class, or 'package.module:Class' to import lazily
+    :type       target:  type or str
+    :param      kinds:   instrument kinds the model provides
+    :type       kinds:   iterable of str
+
+    :returns:   the registry entry
+    :rtype:     ModelEntry
+    """
+    entry = _models.get(model)
+    if entry is not None and isinstance(target, str) and entry.target == target:
+        # re-registering the same target only adds kinds
+        entry.kinds = entry.kinds | frozenset(kinds)
+        return entry
+    entry = ModelEntry(model, target, kinds)
+    _models[model] = entry
+    return entry
+
+
+def load_entry_points():
+    """
+    register models advertised by installed packages. only reads package
+    metadata, plugin modules are not imported until their model is used.
+    """
+    global _entry_points_loaded  # pylint: disable=global-statement
+    if _entry_points_loaded:
+        return
+    _entry_points_loaded = True
+    try:
+        from importlib.metadata import entry_points  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return
+    groups = {ENTRY_POINT_GROUP: ()}
+    for kind in KINDS:
+        groups[f'instruments.{kind}'] = (kind,)
+    all_points = entry_points()
+    for group, kinds in groups.items():
+        if hasattr(all_points, 'select'):
+            points = all_points.select(group=group)
+        else:
+            points = all_points.get(group, [])
+        for point in points:
+            register_model(point.name, point.value, kinds)
+
+
+def get_entry(model: str) -> ModelEntry:
+    """
+    get the registry entry for a model, None if it is unknown
+
+    :param      model:  The model
+    :type       model:  str
+
+    :returns:   registry entry
+    :rtype:     ModelEntry
+    """
+    entry = _models.get(model)
+    if entry is None and not _entry_points_loaded:
+        load_entry_points()
+        entry = _models.get(model)
+    return entry
+
+
+def get_model_class(model: str, kind: str = None) -> type:
+    """
+    Resolve a model string to its instrument class, importing it on first use.
+
+    :param      model:  IDN model string
+    :type       model:  str
+    :param      kind:   only match models of this kind, e.g. 'multimeter'
+    :type       kind:   str
+
+    :returns:   instrument class, None if the model is not registered
+    :rtype:     type
+    """
+    entry = get_entry(model)
+    if entry is None:
+        return None
+    if kind is not None and kind not in entry.kinds:
+        return None
+    return entry.load()
+
+
+def supported_models(kind: str = None, plugins: bool = False) -> list:
+    """
+    list registered model strings, without importing any instrument module
+
+    :param      kind:     only list models of this kind
+    :type       kind:     str
+    :param      plugins:  also list models of installed packages. scanning
+                          the package metadata costs tens of ms, plugins
+                          still resolve through get_model_class() without it
+    :type       plugins:  bool
+
+    :returns:   sorted model strings
+    :rtype:     list
+    """
+    if plugins:
+        load_entry_points()
+    return sorted(
+        model for model, entry in _models.items()
+        if kind is None or kind in entry.kinds
+    )
+
+
+register_model('U3606B', 'instruments.multi_function:U3606B', ('multimeter', 'power_supply'))
+register_model('34465A', 'instruments.multimeter:KS34465A', ('multimeter',))
+register_model('DM3058E', 'instruments.multimeter:DM3058E', ('multimeter',))
+register_model('DP832', 'instruments.power_supply:DP832', ('power_supply',))
+register_model('DS1074Z', 'instruments.oscilloscope:DS1074Z', ('oscilloscope',))
+register_model('AG2062F', 'instruments.function_generator:AG2062F', ('function_generator',))
@@ -0,0 +1,188 @@
+#!/usr/bin/env python
+# python 3
+##    @file:    regulation.py
+#     @name:    Luke Gary
+#  @company:    RyeEffectsResearch
+#     @date:    2026/10/19
+################################################################################
+# @copyright
+#   Copyright 2020 RyeEffectsResearch as an  unpublished work.
+#   All Rights Reserved.
+#
+# @license The information contained herein is confidential
+#   property of RyeEffectsResearch. The user, copying, transfer or
+#   disclosure of such information is prohibited except
+#   by express written agreement with RyeEffectsResearch.
+################################################################################
+
+"""
+closed-loop setpoint regulation, a supply channel corrected by meter feedback
+
+the supply/DUT path is modelled as measured = gain * setpoint + offset. each
+iteration makes a Newton step with the current gain, and the gain is updated
+with the secant through the last two points. the model is kept between calls,
+so once learned the first guess usually lands within tolerance.
+"""
+
+import time
+
+
+class RegulationResult:
+    """
+    This class describes the outcome of one regulation.
+    """
+    __slots__ = (
+        'target', 'setpoint', 'measured', 'iterations', 'elapsed', 'converged', 'gain'
+    )
+
+    def __init__(self, target, setpoint, measured, iterations, elapsed, converged, gain):
+        self.target = target
+        self.setpoint = setpoint
+        self.measured = measured
+        self.iterations = iterations
+        self.elapsed = elapsed
+        self.converged = converged
+        self.gain = gain
+
+    @property
+    def error(self) -> float:
+        """ measured - target """
+        if self.measured is None:
+            return None
+        return self.measured - self.target
+
+    def __repr__(self):
+        return (
+            f'RegulationResult(target={self.target}, setpoint={self.setpoint}, '
+            f'measured={self.measured}, iterations={self.iterations}, '
+            f'elapsed={self.elapsed:0.4f}, converged={self.converged})'
+        )
+
+
+class Regulator:
+    """
+    This class describes a power supply channel regulated by a meter.
+    """
+    def __init__(self, supply, meter, channel: int = 1, **kwargs):
+        """
+        constructor
+
+        :param      supply:          power supply, e.g. DP832
+        :param      meter:           multimeter measuring at the DUT
+        :param      channel:         supply channel
+        :type       channel:         int
+        :param      quantity:        'voltage' or 'current'
+        :param      measure:         callable returning the feedback reading,
+                                     meter.measure_<quantity> by default
+        :param      tolerance:       absolute tolerance, default 1 mV
+        :param      max_iterations:  give up after this many setpoints
+        :param      limits:          (min, max) setpoint clamp
+        :param      resolution:      supply setpoint resolution, default 1 mV
+        :param      settle_time:     seconds between write and measurement
+        :param      gain:            initial plant gain, default 1.0
+        :param      gain_limits:     (min, max) accepted secant gain
+        """
+        self.supply = supply
+        self.meter = meter
+        self.channel = channel
+        self.quantity = kwargs.get('quantity', 'voltage')
+        self.measure = kwargs.get('measure', None)
+        if self.measure is None:
+            self.measure = getattr(meter, f'measure_{self.quantity}')
+        self._set = getattr(supply, f'set_output_{self.quantity}')
+        self.tolerance = kwargs.get('tolerance', 1e-3)
+        self.max_iterations = kwargs.get('max_iterations', 8)
+        self.limits = kwargs.get('limits', (0.0, None))
+        self.resolution = kwargs.get('resolution', 1e-3)
+        self.settle_time = kwargs.get('settle_time', 0.0)
+        self.gain_limits = kwargs.get('gain_limits', (0.5, 2.0))
+        self.gain = kwargs.get('gain', 1.0)
+        self.offset = 0.0
+
+    def reset_model(self, gain: float = 1.0):
+        """
+        forget the learned plant model
+
+        :param      gain:  The gain
+        :type       gain:  float
+        """
+        self.gain = gain
+        self.offset = 0.0
+
+    def _clamp(self, setpoint: float) -> float:
+        low, high = self.limits
+        if low is not None and setpoint < low:
+            setpoint = low
+        if high is not None and setpoint > high:
+            setpoint = high
+        if self.resolution:
+            setpoint = round(round(setpoint / self.resolution) * self.resolution, 9)
+        return setpoint
+
+    def _apply(self, setpoint: float) -> float:
+        self._set(setpoint, channel=self.channel, verify=False)
+        if self.settle_time:
+            time.sleep(self.settle_time)
+        return self.measure()
+
+    def regulate(self, target: float) -> RegulationResult:
+        """
+        drive the measured value to target
+
+        :param      target:  value wanted at the meter
+        :type       target:  float
+
+        :returns:   result with the final setpoint, iterations and time
+        :rtype:     RegulationResult
+        """
+        start = time.perf_counter()
+        setpoint = self._clamp((target - self.offset) / self.gain)
+        measured = self._apply(setpoint)
+        iterations = 1
+        converged = False
+        previous = None
+        while measured is not None:
+            if abs(measured - target) <= self.tolerance:
+                converged = True
+                break
+            if previous is not None:
+                delta = setpoint - previous[0]
+                if abs(delta) > 0.0:
+                    gain = (measured - previous[1]) / delta
+                    if self.gain_limits[0] <= gain <= self.gain_limits[1]:
+                        self.gain = gain
+            if iterations >= self.max_iterations:
+                break
+            step = self._clamp(setpoint + (target - measured) / self.gain)
+            if step == setpoint:
+                # clamped, or the correction is below the supply resolution
+                break
+            previous = (setpoint, measured)
+            setpoint = step
+            measured = self._apply(setpoint)
+            iterations += 1
+
+        if measured is not None:
+            self.offset = measured - self.gain * setpoint
+        return RegulationResult(
+            target, setpoint, measured, iterations,
+            time.perf_counter() - start, converged, self.gain
+        )
+
+
+def regulate(supply, meter, target: float, channel: int = 1, **kwargs) -> RegulationResult:
+    """
+    one-shot regulation, see Regulator. keep a Regulator around instead to
+    reuse the learned gain across setpoints.
+
+    :param      supply:   power supply
+    :param      meter:    multimeter
+    :param      target:   value wanted at the meter
+    :type       target:   float
+    :param      channel:  supply channel
+    :type       channel:  int
+
+    :returns:   regulation result
+    :rtype:     RegulationResult
+    """
+    return Regulator(supply, meter, channel=channel, **kwargs).regulate(target)
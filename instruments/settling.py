@@ -0,0 +1,217 @@
+#!/usr/bin/env python
+# python 3
+##    @file:    settling.py
+#     @name:    Luke Gary
+#  @company:    RyeEffectsResearch
+#     @date:    2026/10/19
+################################################################################
+# @copyright
+#   Copyright 2020 RyeEffectsResearch as an  unpublished work.
+#   All Rights Reserved.
+#
+# @license The information contained herein is confidential
+#   property of RyeEffectsResearch. The user, copying, transfer or
+#   disclosure of such information is prohibited except
+#   by express written agreement with RyeEffectsResearch.
+################################################################################
+
+"""
+measure-until-settled
+
+readings are taken back to back into a sliding window. the measurement
+stops as soon as the last `window` readings are stable, instead of sleeping
+a fixed time before reading.
+"""
+
+import math
+import time
+from collections import deque
+
+
+class SlidingWindow:
+    """
+    This class describes mean, stdev, span and least squares slope over the
+    last `size` (time, value) samples, kept up to date as samples enter and
+    leave so every reading costs O(1).
+
+    the running sums are taken relative to a sample of the window and rebuilt
+    from the window every `size` samples, so cancellation can't build up
+    once a reading has settled to a few ppm.
+    """
+    __slots__ = (
+        'size', 'mean', '_samples', '_origin', '_sums', '_added',
+        '_since_rebase', '_maxima', '_minima'
+    )
+
+    def __init__(self, size: int):
+        self.size = size
+        self.mean = None
+        self._samples = deque()
+        self._origin = None
+        # t, v, tt, vv, tv relative to _origin
+        self._sums = [0.0] * 5
+        self._added = 0
+        self._since_rebase = 0
+        # (index, value), values decreasing / increasing, for the span
+        self._maxima = deque()
+        self._minima = deque()
+
+    def _account(self, timestamp: float, value: float, sign: float):
+        sums = self._sums
+        stamp = timestamp - self._origin[0]
+        value = value - self._origin[1]
+        sums[0] += sign * stamp
+        sums[1] += sign * value
+        sums[2] += sign * stamp * stamp
+        sums[3] += sign * value * value
+        sums[4] += sign * stamp * value
+
+    def _rebase(self):
+        self._origin = self._samples[0]
+        self._sums = [0.0] * 5
+        for stamp, value in self._samples:
+            self._account(stamp, value, 1.0)
+        self._since_rebase = 0
+
+    def add(self, timestamp: float, value: float):
+        """ add a sample, dropping the oldest once full """
+        samples = self._samples
+        if self._origin is None:
+            self._origin = (timestamp, value)
+        if len(samples) >= self.size:
+            self._account(*samples.popleft(), -1.0)
+            self._since_rebase += 1
+        samples.append((timestamp, value))
+        self._account(timestamp, value, 1.0)
+        if self._since_rebase >= self.size:
+            self._rebase()
+
+        index = self._added
+        self._added += 1
+        first = index - len(samples) + 1
+        for extrema, keep in ((self._maxima, value.__lt__), (self._minima, value.__gt__)):
+            while extrema and not keep(extrema[-1][1]):
+                extrema.pop()
+            extrema.append((index, value))
+            while extrema[0][0] < first:
+                extrema.popleft()
+        self.mean = self._origin[1] + self._sums[1] / len(samples)
+
+    @property
+    def full(self) -> bool:
+        """ window holds `size` samples """
+        return len(self._samples) >= self.size
+
+    @property
+    def stdev(self) -> float:
+        """ window sample standard deviation """
+        count = len(self._samples)
+        if count < 2:
+            return 0.0
+        sums = self._sums
+        return math.sqrt(max(sums[3] - sums[1] * sums[1] / count, 0.0) / (count - 1))
+
+    @property
+    def span(self) -> float:
+        """ peak to peak of the window """
+        if not self._samples:
+            return 0.0
+        return self._maxima[0][1] - self._minima[0][1]
+
+    @property
+    def slope(self) -> float:
+        """ least squares slope, units per second """
+        count = len(self._samples)
+        if count < 2:
+            return 0.0
+        sums = self._sums
+        s_tt = sums[2] - sums[0] * sums[0] / count
+        if s_tt <= 0.0:
+            return 0.0
+        return (sums[4] - sums[0] * sums[1] / count) / s_tt
+
+
+class SettledReading:
+    """
+    This class describes the result of a measure-until-settled.
+    """
+    __slots__ = ('value', 'stdev', 'slope', 'samples', 'elapsed', 'settled')
+
+    def __init__(self, value, stdev, slope, samples, elapsed, settled):
+        self.value = value
+        self.stdev = stdev
+        self.slope = slope
+        self.samples = samples
+        self.elapsed = elapsed
+        self.settled = settled
+
+    def __float__(self):
+        return float(self.value)
+
+    def __repr__(self):
+        return (
+            f'SettledReading(value={self.value}, stdev={self.stdev}, slope={self.slope}, '
+            f'samples={self.samples}, elapsed={self.elapsed:0.3f}, settled={self.settled})'
+        )
+
+
+def measure_until_settled(measure, window: int = 5, **kwargs) -> SettledReading:
+    """
+    Call measure() until the readings settle or the timeout expires.
+
+    the window is settled once it is full and every given criterion holds.
+    with no criterion at all, tolerance defaults to 1e-3.
+
+    :param      measure:    callable returning a float, None on error
+    :param      window:     readings the criteria are evaluated over
+    :type       window:     int
+    :param      tolerance:  max peak to peak of the window
+    :param      stdev:      max standard deviation of the window
+    :param      slope:      max |slope| of the window, units per second
+    :param      timeout:    seconds before giving up, default 10
+    :param      interval:   minimum seconds between readings, default 0
+    :param      min_time:   don't stop earlier than this, default 0
+
+    :returns:   window mean (or last reading) and how long it took
+    :rtype:     SettledReading
+    """
+    tolerance = kwargs.get('tolerance', None)
+    max_stdev = kwargs.get('stdev', None)
+    max_slope = kwargs.get('slope', None)
+    if tolerance is None and max_stdev is None and max_slope is None:
+        tolerance = 1e-3
+    timeout = kwargs.get('timeout', 10.0)
+    interval = kwargs.get('interval', 0.0)
+    min_time = kwargs.get('min_time', 0.0)
+
+    samples = 0
+    recent = SlidingWindow(window)
+    start = time.monotonic()
+    now = start
+    settled = False
+    while True:
+        value = measure()
+        now = time.monotonic()
+        if value is not None:
+            samples += 1
+            recent.add(now, value)
+            if recent.full and now - start >= min_time:
+                settled = (
+                    (tolerance is None or recent.span <= tolerance) and
+                    (max_stdev is None or recent.stdev <= max_stdev) and
+                    (max_slope is None or abs(recent.slope) <= max_slope)
+                )
+                if settled:
+                    break
+        if now - start >= timeout:
+            break
+        if interval:
+            next_reading = now + interval
+            remaining = next_reading - time.monotonic()
+            if remaining > 0:
+                time.sleep(remaining)
+
+    return SettledReading(
+        recent.mean if settled else (value if value is not None else recent.mean),
+        recent.stdev, recent.slope, samples, now - start, settled
+    )
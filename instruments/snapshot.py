@@ -0,0 +1,221 @@
+#!/usr/bin/env python
+# python 3
+##    @file:    snapshot.py
+#     @name:    Luke Gary
+#  @company:    RyeEffectsResearch
+#     @date:    2026/10/19
+################################################################################
+# @copyright
+#   Copyright 2020 RyeEffectsResearch as an  unpublished work.
+#   All Rights Reserved.
+#
+# @license The information contained herein is confidential
+#   property of RyeEffectsResearch. The user, copying, transfer or
+#   disclosure of such information is prohibited except
+#   by express written agreement with RyeEffectsResearch.
+################################################################################
+
+"""
+instrument configuration snapshots
+
+capture() reads an instrument's settings in one query: *LRN? on instruments
+that support it (LEARN = True), otherwise the model's SETTINGS query set.
+restore() compares a snapshot with the instrument's current settings and
+sends only the commands that differ, compounded, instead of *rst and a full
+reconfiguration. outputs that turn off are sent first and outputs that turn
+on last, so a setpoint never reaches a live output on its way to the new
+state.
+"""
+
+import json
+import time
+
+_OFF = ('OFF', '0')
+_ON = ('ON', '1')
+
+
+def _output_change(name: str, command: str):
+    # 'ch1:outp' / 'outp' settings, by the value their command sets
+    if name.rsplit(':', 1)[-1].lower() not in ('outp', 'output'):
+        return None
+    value = command.replace(',', ' ').split()[-1].upper()
+    if value in _OFF:
+        return 'off'
+    if value in _ON:
+        return 'on'
+    return None
+
+
+class Snapshot:
+    """
+    This class describes the captured settings of one instrument.
+
+    commands maps each setting to the command that applies it, in the order
+    they have to be sent.
+    """
+    __slots__ = ('model', 'serial_number', 'commands', 'time')
+
+    def __init__(self, model: str, serial_number: str, commands: dict, time: float = 0.0):  # pylint: disable=redefined-outer-name
+        self.model = model
+        self.serial_number = serial_number
+        self.commands = commands
+        self.time = time
+
+    def __len__(self):
+        return len(self.commands)
+
+    def __eq__(self, other):
+        if not isinstance(other, Snapshot):
+            return NotImplemented
+        return self.model == other.model and self.commands == other.commands
+
+    def __repr__(self):
+        return f'Snapshot({self.model}:{self.serial_number}, settings={len(self.commands)})'
+
+    def diff(self, current) -> list:
+        """
+        commands that take an instrument from current to this snapshot
+
+        :param      current:  the instrument's current settings
+        :type       current:  Snapshot
+
+        :returns:   commands turning outputs off, then the other settings
+                    in snapshot order, then commands turning outputs on
+        :rtype:     list
+        """
+        known = current.commands if current is not None else {}
+        turn_off = []
+        settings = []
+        turn_on = []
+        for name, command in self.commands.items():
+            if known.get(name) == command:
+                continue
+            change = _output_change(name, command)
+            if change == 'off':
+                turn_off.append(command)
+            elif change == 'on':
+                turn_on.append(command)
+            else:
+                settings.append(command)
+        return turn_off + settings + turn_on
+
+    def save(self, path: str):
+        """
+        write the snapshot as json
+
+        :param      path:  The path
+        :type       path:  str
+        """
+        with open(path, 'w') as _file:
+            json.dump({
+                'model': self.model,
+                'serial_number': self.serial_number,
+                'time': self.time,
+                'commands': list(self.commands.items()),
+            }, _file, indent=1)
+
+    @classmethod
+    def load(cls, path: str):
+        """
+        read a snapshot written by save()
+
+        :param      path:  The path
+        :type       path:  str
+
+        :returns:   the snapshot
+        :rtype:     Snapshot
+        """
+        with open(path) as _file:
+            data = json.load(_file)
+        return cls(
+            data['model'], data['serial_number'],
+            {name: command for name, command in data['commands']},
+            data['time']
+        )
+
+
+def _parse_learn(instrument, response: str) -> dict:
+    # *LRN? answers with the program message that restores the state,
+    # keyed by header so a changed parameter shows up as a changed command
+    commands = {}
+    for command in instrument.split_response(response):
+        command = command.strip()
+        if not command:
+            continue
+        name = command.split(None, 1)[0].lstrip(':').upper()
+        if name in commands:
+            name = f'{name}#{len(commands)}'
+        commands[name] = command
+    return commands
+
+
+def capture(instrument) -> Snapshot:
+    """
+    read an instrument's settings in one query
+
+    :param      instrument:  instrument with LEARN or a SETTINGS query set
+    :type       instrument:  Instrument
+
+    :returns:   the snapshot, None on error
+    :rtype:     Snapshot
+    """
+    if instrument.LEARN:
+        response = instrument.query('*lrn?')
+        if response is None:
+            return None
+        commands = _parse_learn(instrument, response)
+    elif instrument.SETTINGS:
+        responses = instrument.query_pipelined(
+            [query for _, query, _ in instrument.SETTINGS]
+        )
+        if responses is None:
+            return None
+        commands = {
+            name: template.format(value=value.strip())
+            for (name, _, template), value in zip(instrument.SETTINGS, responses)
+        }
+    else:
+        raise AttributeError(
+            f'{type(instrument).__name__} supports neither *LRN? nor a SETTINGS query set'
+        )
+    snapshot = Snapshot(instrument.model, instrument.serial_number, commands, time.time())
+    instrument.known_settings = snapshot
+    return snapshot
+
+
+def restore(instrument, snapshot: Snapshot, refresh: bool = True, batch_size: int = 16) -> list:
+    """
+    apply a snapshot, sending only the settings that differ
+
+    :param      instrument:  The instrument
+    :type       instrument:  Instrument
+    :param      snapshot:    The snapshot
+    :type       snapshot:    Snapshot
+    :param      refresh:     read the current settings first, one query. with
+                             False the state of the last capture or restore
+                             is trusted, only right if nothing else wrote to
+                             the instrument since
+    :type       refresh:     bool
+    :param      batch_size:  commands per compound message
+    :type       batch_size:  int
+
+    :returns:   commands sent, None on error
+    :rtype:     list
+    """
+    if snapshot.model != instrument.model:
+        raise AttributeError(f'snapshot of a {snapshot.model} cannot restore a {instrument.model}')
+    current = instrument.known_settings
+    if refresh or current is None:
+        current = capture(instrument)
+        if current is None:
+            return None
+    commands = snapshot.diff(current)
+    for offset in range(0, len(commands), batch_size):
+        if instrument.write(instrument.compound(commands[offset:offset + batch_size])) is None:
+            instrument.known_settings = None
+            return None
+    instrument.known_settings = Snapshot(
+        snapshot.model, instrument.serial_number,
+        {**current.commands, **snapshot.commands}, time.time()
+    )
+    return commands
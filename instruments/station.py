@@ -0,0 +1,275 @@
+#!/usr/bin/env python
+# python 3
+#pylint: disable=import-error
+##    @file:    station.py
+#     @name:    Luke Gary
+#  @company:    RyeEffectsResearch
+#     @date:    2026/10/19
+################################################################################
+# @copyright
+#   Copyright 2020 RyeEffectsResearch as an  unpublished work.
+#   All Rights Reserved.
+#
+# @license The information contained herein is confidential
+#   property of RyeEffectsResearch. The user, copying, transfer or
+#   disclosure of such information is prohibited except
+#   by express written agreement with RyeEffectsResearch.
+################################################################################
+
+"""
+station builders, connect to every instrument on the bench at once
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable
+
+from instruments.instrument import Instrument
+from instruments.registry import get_model_class
+
+
+def open_all(
+        include_tcpip: bool = False,
+        models: Iterable[str] = None,
+        debug: bool = False,
+        backend=None
+    ) -> Dict[str, Dict[str, Instrument]]:
+    """
+    Enumerate connected instruments once and connect to every device whose
+    IDN model is in the model registry.
+
+    :param      include_tcpip:  include tcpip connected instruments
+    :type       include_tcpip:  bool
+    :param      models:         only connect to these models, all registered
+                                models if None
+    :type       models:         Iterable[str]
+    :param      debug:          debug flag passed to each instrument
+    :type       debug:          bool
+    :param      backend:        pyvisa backend
+
+    :returns:   connected instruments, indexed [model][serial_number]
+    :rtype:     Dict[str, Dict[str, Instrument]]
+    """
+    if models is not None:
+        models = set(models)
+
+    scanner = Instrument(debug=debug, backend=backend)
+    station = {}
+    for idn in scanner.list_devices(include_tcpip=include_tcpip, keep_open=True):
+        model = idn.get('model')
+        instrument_class = None
+        if models is None or model in models:
+            instrument_class = get_model_class(model)
+        if instrument_class is None:
+            # unrecognized, don't leave the session from the scan open
+            scanner.debug(f'Skipping {model}:{idn.get("serial_number")}')
+            idn.get('device').close()
+            continue
+        # every instance shares the scanner's manager, which owns the sessions
+        station.setdefault(model, {})[idn.get('serial_number')] = instrument_class(
+            resource=idn,
+            manager=scanner.manager,
+            debug=debug
+        )
+    return station
+
+
+class BringUpReport:
+    """
+    This class describes where the time of a station bring-up went.
+
+    phases holds the station wide steps (rm_init, enumerate, warm_up, total),
+    instruments the per instrument ones (open, idn, attach, configure).
+    """
+    def __init__(self):
+        self.phases = {}
+        self.instruments = {}
+        self.errors = {}
+
+    @property
+    def ok(self) -> bool:
+        """ every declared instrument came up """
+        return not self.errors
+
+    def as_dict(self) -> dict:
+        """ plain dictionary copy """
+        return {
+            'phases': dict(self.phases),
+            'instruments': {name: dict(times) for name, times in self.instruments.items()},
+            'errors': dict(self.errors),
+        }
+
+    def summary(self) -> str:
+        """
+        timing table, slowest instrument first
+
+        :returns:   report text
+        :rtype:     str
+        """
+        lines = [
+            ', '.join(f'{phase}={seconds * 1000:0.1f}ms' for phase, seconds in self.phases.items())
+        ]
+        columns = ('open', 'idn', 'attach', 'configure')
+        lines.append(f'{"instrument":<16}' + ''.join(f'{column:>12}' for column in columns))
+        ranked = sorted(
+            self.instruments.items(), key=lambda item: sum(item[1].values()), reverse=True
+        )
+        for name, times in ranked:
+            lines.append(f'{name:<16}' + ''.join(
+                f'{times[column] * 1000:>10.1f}ms' if column in times else f'{"-":>12}'
+                for column in columns
+            ))
+        for name, error in self.errors.items():
+            lines.append(f'{name}: {error}')
+        return '\n'.join(lines)
+
+    def __repr__(self):
+        return f'BringUpReport({self.phases}, errors={len(self.errors)})'
+
+
+def _check_spec(name: str, spec: dict):
+    # an empty declaration would match, and claim, whatever device comes first
+    if not any(spec.get(key) for key in ('model', 'serial_number', 'resource')):
+        raise ValueError(
+            f'instrument {name!r} declares none of model, serial_number or resource'
+        )
+
+
+def _matches(spec: dict, info) -> bool:
+    if spec.get('resource'):
+        return spec['resource'] == info.get('resource_name')
+    if spec.get('model') is not None and spec['model'] != info.get('model'):
+        return False
+    serial_number = spec.get('serial_number')
+    return serial_number is None or serial_number.lower() == info.get('serial_number').lower()
+
+
+def _specificity(item) -> int:
+    # exact declarations claim their device before model-only ones can take it
+    spec = item[1]
+    if spec.get('resource'):
+        return 0
+    return 1 if spec.get('serial_number') else 2
+
+
+def bring_up(  # pylint: disable=too-many-locals,too-many-arguments
+        instruments: Dict[str, dict],
+        include_tcpip: bool = False,
+        warm_up: Iterable = (),
+        workers: int = None,
+        debug: bool = False,
+        backend=None
+    ):
+    """
+    open, identify and configure the declared instruments concurrently,
+    then run the one-time warm up steps, timing every phase.
+
+    instruments maps a name to a declaration with the keys
+        model          IDN model, e.g. 'DP832'
+        serial_number  optional, the first unclaimed device of the model if None
+        resource       optional VISA resource name, skips the enumeration
+    declarations with a resource claim their device first, then those with
+    a serial number, then model-only ones take what is left, a declaration
+    with none of model, serial_number and resource raises ValueError
+        configure      optional callable(instrument) or list of them, e.g.
+                       applying a measurement profile or uploading a waveform
+
+    :param      instruments:    declarations by name
+    :type       instruments:    Dict[str, dict]
+    :param      include_tcpip:  include tcpip connected instruments
+    :type       include_tcpip:  bool
+    :param      warm_up:        callables(station) run once everything is up
+    :type       warm_up:        Iterable
+    :param      workers:        worker threads, one per resource if None
+    :type       workers:        int
+    :param      debug:          debug flag passed to each instrument
+    :type       debug:          bool
+    :param      backend:        pyvisa backend
+
+    :returns:   (station, report), station maps names to instruments
+    :rtype:     tuple
+    """
+    for name, spec in instruments.items():
+        _check_spec(name, spec)
+    report = BringUpReport()
+    bring_up_start = time.perf_counter()
+
+    start = time.perf_counter()
+    scanner = Instrument(debug=debug, backend=backend)
+    manager = scanner.manager
+    report.phases['rm_init'] = time.perf_counter() - start
+
+    resources = [spec['resource'] for spec in instruments.values() if spec.get('resource')]
+    if len(resources) < len(instruments):
+        start = time.perf_counter()
+        listed = list(manager.list_resources(query='USB?*'))
+        if include_tcpip:
+            listed += manager.list_resources(query='TCPIP?*')
+        resources += [name for name in listed if name not in resources]
+        report.phases['enumerate'] = time.perf_counter() - start
+    resources = list(dict.fromkeys(resources))
+
+    def _probe(resource_name):
+        timings = {}
+        info = Instrument(debug=debug, manager=manager).open_resource(resource_name, timings)
+        return info, timings
+
+    station = {}
+    with ThreadPoolExecutor(max_workers=workers or max(len(resources), 1)) as pool:
+        probed = list(pool.map(_probe, resources))
+
+        claimed = {}
+        taken = set()
+        for name, spec in sorted(instruments.items(), key=_specificity):
+            for index, (info, timings) in enumerate(probed):
+                if info is None or index in taken or not _matches(spec, info):
+                    continue
+                claimed[name] = index
+                taken.add(index)
+                report.instruments[name] = dict(timings)
+                break
+            else:
+                report.errors[name] = 'not found: ' + (
+                    spec.get('resource') or f'{spec.get("model")} {spec.get("serial_number") or ""}'
+                ).strip()
+        for index, (info, _) in enumerate(probed):
+            if info is not None and index not in taken:
+                # not declared, don't leave the session from the probe open
+                info.get('device').close()
+
+        def _configure(name):
+            info = probed[claimed[name]][0]
+            times = report.instruments[name]
+            start = time.perf_counter()
+            instrument_class = get_model_class(info.get('model'))
+            if instrument_class is None:
+                info.get('device').close()
+                raise AttributeError(f'no class registered for {info.get("model")}')
+            instrument = instrument_class(resource=info, manager=manager, debug=debug)
+            times['attach'] = time.perf_counter() - start
+            station[name] = instrument
+            configure = instruments[name].get('configure') or ()
+            if callable(configure):
+                configure = (configure,)
+            start = time.perf_counter()
+            for step in configure:
+                step(instrument)
+            times['configure'] = time.perf_counter() - start
+
+        futures = {name: pool.submit(_configure, name) for name in claimed}
+        for name, future in futures.items():
+            try:
+                future.result()
+            except Exception as _e:  # pylint: disable=broad-except
+                report.errors[name] = f'{type(_e).__name__}: {_e}'
+                scanner.debug(f'Bring-up of {name} failed: {_e}')
+
+    start = time.perf_counter()
+    for step in warm_up:
+        try:
+            step(station)
+        except Exception as _e:  # pylint: disable=broad-except
+            report.errors[getattr(step, '__name__', repr(step))] = f'{type(_e).__name__}: {_e}'
+    report.phases['warm_up'] = time.perf_counter() - start
+    report.phases['total'] = time.perf_counter() - bring_up_start
+    return station, report
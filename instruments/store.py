@@ -0,0 +1,383 @@
+#!/usr/bin/env python
+# python 3
+#pylint: disable=import-error
+##    @file:    store.py
+#     @name:    Luke Gary
+#  @company:    RyeEffectsResearch
+#     @date:    2026/10/19
+################################################################################
+# @copyright
+#   Copyright 2020 RyeEffectsResearch as an  unpublished work.
+#   All Rights Reserved.
+#
+# @license The information contained herein is confidential
+#   property of RyeEffectsResearch. The user, copying, transfer or
+#   disclosure of such information is prohibited except
+#   by express written agreement with RyeEffectsResearch.
+################################################################################
+
+"""
+columnar measurement store
+
+append-only archive of measurements, one directory per signal:
+
+    <root>/meta.json                     value dtype
+    <root>/serials.json                  serial number table
+    <root>/<signal>/index.json           chunk index
+    <root>/<signal>/<chunk>.<column>.npy one file per column per chunk
+
+columns are time (float64 unix seconds), value, serial (uint16 id into the
+serial table) and channel (uint8). chunks are sorted by time and the index
+keeps each chunk's time range, serials and channels, so a range query only
+memory-maps the chunks it can match.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from array import array
+
+import numpy as np
+
+COLUMNS = ('time', 'value', 'serial', 'channel')
+
+# serial ids are stored as uint16
+MAX_SERIALS = 1 << 16
+
+_SIGNAL_NAME = re.compile(r'^[A-Za-z0-9_.\-]+$')
+
+
+def _write_json(path: str, data):
+    # write then rename, a crash never leaves a half written index behind
+    temporary = f'{path}.tmp'
+    with open(temporary, 'w') as _file:
+        json.dump(data, _file)
+    os.replace(temporary, path)
+
+
+class MeasurementStore:
+    """
+    This class describes an append-only columnar measurement archive.
+    """
+    def __init__(self, root: str, chunk_rows: int = 65536, value_dtype: str = 'f8'):
+        """
+        constructor
+
+        :param      root:         archive directory, created if missing
+        :type       root:         str
+        :param      chunk_rows:   rows buffered per signal before a chunk is
+                                  written
+        :type       chunk_rows:   int
+        :param      value_dtype:  value column dtype, 'f4' halves the size.
+                                  fixed when the archive is created, opening
+                                  it with another dtype raises
+        :type       value_dtype:  str
+        """
+        self.root = root
+        self.chunk_rows = chunk_rows
+        self.dtype = np.dtype([
+            ('time', 'f8'),
+            ('value', value_dtype),
+            ('serial', 'u2'),
+            ('channel', 'u1'),
+        ])
+        self._lock = threading.Lock()
+        self._buffers = {}
+        self._indexes = {}
+        os.makedirs(root, exist_ok=True)
+        meta_path = os.path.join(root, 'meta.json')
+        if os.path.exists(meta_path):
+            with open(meta_path) as _file:
+                stored = np.dtype(json.load(_file)['value_dtype'])
+            if stored != self.dtype['value']:
+                raise AttributeError(
+                    f'archive {root!r} stores {stored.str} values, opened with {value_dtype!r}'
+                )
+        else:
+            _write_json(meta_path, {'value_dtype': self.dtype['value'].str})
+        self._serials_path = os.path.join(root, 'serials.json')
+        self._serials = []
+        if os.path.exists(self._serials_path):
+            with open(self._serials_path) as _file:
+                self._serials = json.load(_file)
+        self._serial_ids = {serial: index for index, serial in enumerate(self._serials)}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def serial_id(self, serial: str) -> int:
+        """
+        id of a serial number in the serial table, added if new. the table
+        holds MAX_SERIALS serials, ids are stored as uint16
+
+        :param      serial:  The serial
+        :type       serial:  str
+
+        :returns:   serial id
+        :rtype:     int
+        """
+        serial = serial or ''
+        index = self._serial_ids.get(serial)
+        if index is None:
+            index = len(self._serials)
+            if index >= MAX_SERIALS:
+                raise AttributeError(
+                    f'serial table of {self.root!r} is full, {MAX_SERIALS} serials'
+                )
+            self._serials.append(serial)
+            self._serial_ids[serial] = index
+            _write_json(self._serials_path, self._serials)
+        return index
+
+    def serial_name(self, index: int) -> str:
+        """
+        serial number for a serial id
+
+        :param      index:  The serial id
+        :type       index:  int
+
+        :returns:   serial number
+        :rtype:     str
+        """
+        return self._serials[index]
+
+    def signals(self) -> list:
+        """
+        signals in the archive
+
+        :returns:   signal names
+        :rtype:     list
+        """
+        with self._lock:
+            names = set(self._buffers)
+        for name in os.listdir(self.root):
+            if os.path.exists(os.path.join(self.root, name, 'index.json')):
+                names.add(name)
+        return sorted(names)
+
+    def _index(self, signal: str) -> list:
+        index = self._indexes.get(signal)
+        if index is None:
+            path = os.path.join(self.root, signal, 'index.json')
+            index = []
+            if os.path.exists(path):
+                with open(path) as _file:
+                    index = json.load(_file)
+            self._indexes[signal] = index
+        return index
+
+    def _buffer(self, signal: str) -> tuple:
+        buffer = self._buffers.get(signal)
+        if buffer is None:
+            if not _SIGNAL_NAME.match(signal):
+                raise AttributeError(f'invalid signal name {signal!r}')
+            value_code = 'f' if self.dtype['value'].itemsize == 4 else 'd'
+            buffer = (array('d'), array(value_code), array('H'), array('B'))
+            self._buffers[signal] = buffer
+        return buffer
+
+    def append(self, signal: str, value: float, timestamp: float = None,
+               serial: str = '', channel: int = 0):
+        """
+        Append one measurement.
+
+        :param      signal:     signal name, e.g. 'rail2_current'
+        :type       signal:     str
+        :param      value:      The value
+        :type       value:      float
+        :param      timestamp:  unix seconds, now if None
+        :type       timestamp:  float
+        :param      serial:     instrument serial number
+        :type       serial:     str
+        :param      channel:    instrument channel
+        :type       channel:    int
+        """
+        if value is None:
+            return
+        if timestamp is None:
+            timestamp = time.time()
+        with self._lock:
+            buffer = self._buffer(signal)
+            serial_id = self.serial_id(serial)
+            buffer[0].append(timestamp)
+            buffer[1].append(value)
+            buffer[2].append(serial_id)
+            buffer[3].append(channel)
+            if len(buffer[0]) >= self.chunk_rows:
+                self._flush_signal(signal)
+
+    def append_many(self, signal: str, timestamps, values, serial: str = '', channel: int = 0):
+        """
+        Append a batch of measurements from one instrument channel.
+
+        :param      signal:      signal name
+        :type       signal:      str
+        :param      timestamps:  unix seconds
+        :type       timestamps:  numpy.ndarray
+        :param      values:      values
+        :type       values:      numpy.ndarray
+        :param      serial:      instrument serial number
+        :type       serial:      str
+        :param      channel:     instrument channel
+        :type       channel:     int
+        """
+        timestamps = np.asarray(timestamps, dtype='f8')
+        values = np.asarray(values, dtype=self.dtype['value'])
+        with self._lock:
+            buffer = self._buffer(signal)
+            serial_id = self.serial_id(serial)
+            buffer[0].frombytes(timestamps.tobytes())
+            buffer[1].frombytes(values.tobytes())
+            buffer[2].extend([serial_id] * len(timestamps))
+            buffer[3].extend([channel] * len(timestamps))
+            if len(buffer[0]) >= self.chunk_rows:
+                self._flush_signal(signal)
+
+    def record(self, signal: str, instrument, value: float, channel: int = 0):
+        """
+        Append a measurement taken now from an instrument, e.g.
+        store.record('rail2_current', dp832, dp832.measure_source_current(2), 2)
+
+        :param      signal:      signal name
+        :type       signal:      str
+        :param      instrument:  the instrument, for its serial number
+        :type       instrument:  Instrument
+        :param      value:       The value
+        :type       value:       float
+        :param      channel:     instrument channel
+        :type       channel:     int
+        """
+        self.append(signal, value, serial=instrument.serial_number, channel=channel)
+
+    def _flush_signal(self, signal: str):
+        buffer = self._buffers.get(signal)
+        if buffer is None or not buffer[0]:
+            return
+        columns = {
+            'time': np.frombuffer(buffer[0], dtype='f8'),
+            'value': np.frombuffer(buffer[1], dtype=self.dtype['value']),
+            'serial': np.frombuffer(buffer[2], dtype='u2'),
+            'channel': np.frombuffer(buffer[3], dtype='u1'),
+        }
+        order = np.argsort(columns['time'], kind='stable')
+        directory = os.path.join(self.root, signal)
+        os.makedirs(directory, exist_ok=True)
+        index = self._index(signal)
+        chunk = index[-1]['chunk'] + 1 if index else 0
+        for offset in range(0, len(order), self.chunk_rows):
+            rows = order[offset:offset + self.chunk_rows]
+            for name, column in columns.items():
+                np.save(os.path.join(directory, f'{chunk:06d}.{name}.npy'), column[rows])
+            index.append({
+                'chunk': chunk,
+                'rows': len(rows),
+                't_min': float(columns['time'][rows[0]]),
+                't_max': float(columns['time'][rows[-1]]),
+                'serials': sorted(int(value) for value in np.unique(columns['serial'][rows])),
+                'channels': sorted(int(value) for value in np.unique(columns['channel'][rows])),
+            })
+            chunk += 1
+        _write_json(os.path.join(directory, 'index.json'), index)
+        del self._buffers[signal]
+
+    def flush(self):
+        """
+        write all buffered rows as new chunks
+        """
+        with self._lock:
+            for signal in list(self._buffers):
+                self._flush_signal(signal)
+
+    def close(self):
+        """
+        flush, the store can still be queried afterwards
+        """
+        self.flush()
+
+    def query(self, signal: str, start: float = None, stop: float = None,
+              serial: str = None, channel: int = None):
+        """
+        Measurements of a signal in [start, stop), optionally of one serial
+        and/or channel. buffered rows that are not flushed yet are included.
+
+        :param      signal:   signal name
+        :type       signal:   str
+        :param      start:    unix seconds, open ended if None
+        :type       start:    float
+        :param      stop:     unix seconds, open ended if None
+        :type       stop:     float
+        :param      serial:   instrument serial number
+        :type       serial:   str
+        :param      channel:  instrument channel
+        :type       channel:  int
+
+        :returns:   time sorted structured array of the store's dtype
+        :rtype:     numpy.ndarray
+        """
+        serial_id = None
+        if serial is not None:
+            serial_id = self._serial_ids.get(serial)
+            if serial_id is None:
+                return np.empty(0, dtype=self.dtype)
+        with self._lock:
+            index = list(self._index(signal))
+            buffer = self._buffers.get(signal)
+            pending = None
+            if buffer is not None and buffer[0]:
+                pending = [np.array(column) for column in buffer]
+
+        parts = []
+        directory = os.path.join(self.root, signal)
+        for entry in index:
+            if start is not None and entry['t_max'] < start:
+                continue
+            if stop is not None and entry['t_min'] >= stop:
+                continue
+            if serial_id is not None and serial_id not in entry['serials']:
+                continue
+            if channel is not None and channel not in entry['channels']:
+                continue
+            path = os.path.join(directory, f'{entry["chunk"]:06d}')
+            times = np.load(f'{path}.time.npy', mmap_mode='r')
+            low = 0 if start is None else int(np.searchsorted(times, start, 'left'))
+            high = len(times) if stop is None else int(np.searchsorted(times, stop, 'left'))
+            if low >= high:
+                continue
+            columns = {'time': times[low:high]}
+            for name in COLUMNS[1:]:
+                columns[name] = np.load(f'{path}.{name}.npy', mmap_mode='r')[low:high]
+            parts.append(self._select(columns, None, None, serial_id, channel))
+        if pending is not None:
+            columns = dict(zip(COLUMNS, pending))
+            parts.append(self._select(columns, start, stop, serial_id, channel))
+
+        if not parts:
+            return np.empty(0, dtype=self.dtype)
+        if len(parts) == 1:
+            return parts[0]
+        result = np.concatenate(parts)
+        # every flush writes a new sorted run, runs may overlap in time
+        times = result['time']
+        if np.any(times[1:] < times[:-1]):
+            result = result[np.argsort(times, kind='stable')]
+        return result
+
+    def _select(self, columns, start, stop, serial_id, channel):
+        mask = np.ones(len(columns['time']), dtype=bool)
+        if start is not None:
+            mask &= columns['time'] >= start
+        if stop is not None:
+            mask &= columns['time'] < stop
+        if serial_id is not None:
+            mask &= columns['serial'] == serial_id
+        if channel is not None:
+            mask &= columns['channel'] == channel
+        result = np.empty(int(mask.sum()), dtype=self.dtype)
+        for name in COLUMNS:
+            result[name] = columns[name][mask]
+        return result
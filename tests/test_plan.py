@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# python 3
+##    @file:    test_plan.py
+#     @name:    Luke Gary
+#  @company:    RyeEffectsResearch
+#     @date:    2026/10/19
+################################################################################
+# @copyright
+#   Copyright 2020 RyeEffectsResearch as an  unpublished work.
+#   All Rights Reserved.
+#
+# @license The information contained herein is confidential
+#   property of RyeEffectsResearch. The user, copying, transfer or
+#   disclosure of such information is prohibited except
+#   by express written agreement with RyeEffectsResearch.
+################################################################################
+
+"""
+measurement plan compiler, no hardware needed
+"""
+
+import pytest
+
+from instruments.multimeter import KS34465A
+from instruments.plan import compile_plan
+from instruments.power_supply import DP832
+
+
+def _messages(instrument_class, plan) -> list:
+    return [message for message, _ in compile_plan(instrument_class, plan).messages]
+
+
+def _volt(value, channel=1):
+    return ('volt', {'channel': channel, 'value': value})
+
+
+def _output(value, channel=1):
+    return ('output', {'channel': channel, 'value': value})
+
+
+def _range(value):
+    return ('range', {'function': 'volt:dc', 'value': value})
+
+
+def _autorange(value):
+    return ('autorange', {'function': 'volt:dc', 'value': value})
+
+
+def test_output_between_voltages_is_a_barrier():
+    plan = (_output('OFF'), _volt(12), _output('ON'), _volt(3.3))
+    assert _messages(DP832, plan) == [
+        ':outp ch1,OFF;:sour1:volt 12;:outp ch1,ON;:sour1:volt 3.3'
+    ]
+
+
+def test_autorange_between_ranges_is_a_barrier():
+    plan = (_range(10), _autorange('ON'), _range(1))
+    assert _messages(KS34465A, plan) == [
+        ':sens:volt:dc:rang 10;:sens:volt:dc:rang:auto ON;:sens:volt:dc:rang 1'
+    ]
+
+
+def test_same_value_after_another_setting_is_sent_again():
+    plan = (_range(10), _autorange('ON'), _range(10))
+    assert _messages(KS34465A, plan) == [
+        ':sens:volt:dc:rang 10;:sens:volt:dc:rang:auto ON;:sens:volt:dc:rang 10'
+    ]
+
+
+def test_back_to_back_writes_merge():
+    assert _messages(DP832, (_volt(5), _volt(6), _volt(7))) == [':sour1:volt 7']
+
+
+def test_repeated_value_after_a_query_is_dropped():
+    plan = (_volt(5), ('measure_volts', {'channel': 1}), _volt(5), ('measure_amps', {'channel': 1}))
+    assert _messages(DP832, plan) == [':sour1:volt 5;:meas? ch1', ':meas:curr? ch1']
+
+
+def test_write_read_by_a_query_is_not_merged():
+    plan = (_volt(5), ('measure_volts', {'channel': 1}), _volt(6))
+    assert _messages(DP832, plan) == [':sour1:volt 5;:meas? ch1', ':sour1:volt 6']
+
+
+def test_action_is_a_barrier():
+    function = {'function': 'volt:dc'}
+    plan = (_range(10), ('function', function), _range(10), 'read')
+    assert _messages(KS34465A, plan) == [
+        ':sens:volt:dc:rang 10;:conf:volt:dc;:sens:volt:dc:rang 10;:read?'
+    ]
+
+
+def test_unknown_operation():
+    with pytest.raises(AttributeError):
+        compile_plan(DP832, ('bogus',))
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# python 3
+#pylint: disable=import-error
+##    @file:    test_recording.py
+#     @name:    Luke Gary
+#  @company:    RyeEffectsResearch
+#     @date:    2026/10/19
+################################################################################
+# @copyright
+#   Copyright 2020 RyeEffectsResearch as an  unpublished work.
+#   All Rights Reserved.
+#
+# @license The information contained herein is confidential
+#   property of RyeEffectsResearch. The user, copying, transfer or
+#   disclosure of such information is prohibited except
+#   by express written agreement with RyeEffectsResearch.
+################################################################################
+
+"""
+record a session against a stand-in resource, then replay it
+"""
+
+import numpy as np
+from pyvisa.constants import StatusCode
+
+from instruments.instrument import Instrument
+from instruments.recording import RecordingSession, ReplaySession
+
+
+class _BlockDevice:
+    """
+    serves a float32 block followed by the newline terminator, like a
+    pyvisa resource on a backend without a ctypes viRead
+    """
+    chunk_size = 7
+
+    def __init__(self):
+        self.stream = bytearray()
+
+    def write(self, message):
+        if message == ':wav:data?':
+            payload = np.arange(10, dtype='<f4').tobytes()
+            self.stream = bytearray(b'#2%02d' % len(payload) + payload + b'\n')
+        return len(message)
+
+    def read_bytes(self, count):
+        data = bytes(self.stream[:count])
+        del self.stream[:count]
+        return data
+
+    def query(self, message):
+        assert not self.stream, 'block terminator left on the bus'
+        return '1.5\n' if message == 'meas?' else '0\n'
+
+    @property
+    def last_status(self):
+        return StatusCode.success_max_count_read if self.stream else StatusCode.success
+
+
+def _run(device) -> tuple:
+    instrument = Instrument()
+    instrument.device = device
+    values = instrument.readinto(':wav:data?', np.empty(16, dtype='<f4'), '<f4')
+    return list(values), instrument.query('meas?')
+
+
+def test_block_read_replays(tmp_path):
+    path = str(tmp_path / 'block.rec')
+    recording = RecordingSession(_BlockDevice(), path)
+    recorded = _run(recording)
+    recording.stop()
+
+    replay = ReplaySession(path)
+    assert _run(replay) == recorded == ([float(value) for value in range(10)], '1.5')
+    assert replay.remaining == 0
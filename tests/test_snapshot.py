@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# python 3
+##    @file:    test_snapshot.py
+#     @name:    Luke Gary
+#  @company:    RyeEffectsResearch
+#     @date:    2026/10/19
+################################################################################
+# @copyright
+#   Copyright 2020 RyeEffectsResearch as an  unpublished work.
+#   All Rights Reserved.
+#
+# @license The information contained herein is confidential
+#   property of RyeEffectsResearch. The user, copying, transfer or
+#   disclosure of such information is prohibited except
+#   by express written agreement with RyeEffectsResearch.
+################################################################################
+
+"""
+snapshot diff and restore, against a DP832 stand-in
+"""
+
+from instruments.power_supply import DP832
+from instruments.snapshot import Snapshot, capture, restore
+
+
+class _Supply:
+    """
+    answers the DP832 SETTINGS queries from a dict, records every write
+    """
+    model = 'DP832'
+    serial_number = 'DP8TEST'
+    LEARN = False
+    SETTINGS = DP832.SETTINGS
+    compound = staticmethod(DP832.compound)
+
+    def __init__(self, **values):
+        self.values = {name: '0' for name, _, _ in self.SETTINGS}
+        self.values.update({name.replace('_', ':'): value for name, value in values.items()})
+        self.known_settings = None
+        self.written = []
+
+    def query_pipelined(self, queries):
+        by_query = {query: name for name, query, _ in self.SETTINGS}
+        return [self.values[by_query[query]] for query in queries]
+
+    def write(self, message):
+        self.written.append(message)
+        return len(message)
+
+
+def _commands(**values):
+    supply = _Supply(**values)
+    return capture(supply).commands
+
+
+def test_output_off_goes_before_setpoints():
+    live = Snapshot('DP832', '', _commands(ch1_volt='3.3', ch1_outp='ON'))
+    target = Snapshot('DP832', '', _commands(ch1_volt='12', ch1_outp='OFF'))
+    assert target.diff(live) == ['outp ch1,OFF', 'sour1:volt 12']
+
+
+def test_output_on_goes_after_setpoints():
+    idle = Snapshot('DP832', '', _commands(ch1_volt='12', ch1_outp='OFF'))
+    target = Snapshot('DP832', '', _commands(ch1_volt='3.3', ch1_curr='0.5', ch1_outp='ON'))
+    assert target.diff(idle) == ['sour1:volt 3.3', 'sour1:curr 0.5', 'outp ch1,ON']
+
+
+def test_mixed_channels_keep_off_then_setpoints_then_on():
+    current = Snapshot('DP832', '', _commands(ch1_outp='ON', ch2_outp='OFF'))
+    target = Snapshot('DP832', '', _commands(
+        ch1_volt='5', ch1_outp='OFF', ch2_volt='1.8', ch2_outp='ON'
+    ))
+    assert target.diff(current) == [
+        'outp ch1,OFF', 'sour1:volt 5', 'sour2:volt 1.8', 'outp ch2,ON'
+    ]
+
+
+def test_restore_sends_only_changes_in_safe_order():
+    supply = _Supply(ch1_volt='3.3', ch1_outp='ON')
+    target = Snapshot('DP832', supply.serial_number, _commands(ch1_volt='12', ch1_outp='OFF'))
+    sent = restore(supply, target)
+    assert sent == ['outp ch1,OFF', 'sour1:volt 12']
+    assert supply.written == [':outp ch1,OFF;:sour1:volt 12']
+    assert supply.known_settings == target